@@ -1,30 +1,163 @@
-from sqlmodel import SQLModel
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
+import os
+import re
+import time
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import delete, event, insert, inspect, select
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.exc import DBAPIError, OperationalError, TimeoutError as PoolTimeoutError
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from app.core.config import settings
+from app.core.query_budget import instrument_engine as instrument_queries
+from app.models.app_meta import AppMeta
 
-_is_postgres = settings.DATABASE_URL.startswith("postgresql")
-
-# NullPool: don't maintain a SQLAlchemy connection pool.
-# Supabase's Transaction Pooler (pgBouncer) handles pooling externally.
-# This avoids DuplicatePreparedStatementError caused by long-lived connections.
-# ssl=require: Supabase mandates SSL.
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-    poolclass=NullPool if _is_postgres else None,
-    connect_args={"ssl": "require", "statement_cache_size": 0} if _is_postgres else {},
-)
+if TYPE_CHECKING:
+    from alembic.config import Config
+
+
+def _is_sqlite_file(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
+
+def _sqlite_pragmas(read_only: bool):
+    """Connect hook applying the tuned SQLite settings to every new connection."""
+    pragmas = [
+        # WAL: readers do not block the writer and see every commit; the
+        # mode is stored in the file, so whichever connection comes first sets it
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+
+    def on_connect(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return on_connect
+
+
+def _create_engine(url: str, read_only: bool = False) -> AsyncEngine:
+    is_postgres = url.startswith("postgresql")
+    tuned_sqlite = settings.SQLITE_TUNED and _is_sqlite_file(url)
+    pool_options: dict = {}
+    if tuned_sqlite:
+        # SQLite allows one writer at a time. A single pooled writer
+        # connection queues writes in the pool instead of letting them
+        # collide on the file lock; reads get their own pool.
+        pool_options = {
+            "pool_size": settings.SQLITE_READ_POOL_SIZE if read_only else 1,
+            "max_overflow": 0,
+        }
+        if not read_only:
+            pool_options["pool_timeout"] = settings.SQLITE_WRITE_WAIT_SECONDS
+    # NullPool: don't maintain a SQLAlchemy connection pool.
+    # Supabase's Transaction Pooler (pgBouncer) handles pooling externally.
+    # This avoids DuplicatePreparedStatementError caused by long-lived connections.
+    # ssl=require: Supabase mandates SSL.
+    engine = create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        future=True,
+        poolclass=NullPool if is_postgres else AsyncAdaptedQueuePool if tuned_sqlite else None,
+        connect_args={"ssl": "require", "statement_cache_size": 0} if is_postgres else {},
+        **pool_options,
+    )
+    if tuned_sqlite:
+        event.listen(engine.sync_engine, "connect", _sqlite_pragmas(read_only))
+    instrument_queries(engine)
+    return engine
+
+
+engine = _create_engine(settings.DATABASE_URL)
+
+# Optional read replica for read-only routes. A tuned SQLite file gets a
+# query-only reader pool on the same file; otherwise reads use the primary.
+_sqlite_readers = not settings.DATABASE_READ_URL and settings.SQLITE_TUNED and _is_sqlite_file(settings.DATABASE_URL)
+if settings.DATABASE_READ_URL:
+    read_engine = _create_engine(settings.DATABASE_READ_URL)
+elif _sqlite_readers:
+    read_engine = _create_engine(settings.DATABASE_URL, read_only=True)
+else:
+    read_engine = engine
+
+# Only a replica can lag behind the primary; WAL readers see every commit
+_read_may_lag = bool(settings.DATABASE_READ_URL)
 
-# Create async session factory
+
+class SQLiteWriterSession(Session):
+    """
+    Session on a tuned SQLite file: reads use the reader pool until the
+    session writes, so the single writer connection is only held from the
+    first flush or DML statement until commit, not across the request's
+    earlier reads and awaits. Once it has written, the rest of the
+    transaction stays on the writer and sees its own changes.
+    """
+
+    _writing = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._writing or self._flushing or (clause is not None and clause.is_dml):
+            self._writing = True
+            return engine.sync_engine
+        return read_engine.sync_engine
+
+
+@event.listens_for(SQLiteWriterSession, "after_transaction_end")
+def _writer_released(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session._writing = False
+
+
+# Create async session factories
 async_session = sessionmaker(
     engine, 
     class_=AsyncSession, 
+    expire_on_commit=False,
+    **({"sync_session_class": SQLiteWriterSession} if _sqlite_readers else {}),
+)
+
+async_read_session = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
     expire_on_commit=False
 )
 
+# Read-your-writes: slugs written by this process recently, mapped to the
+# monotonic time until which their reads should stay on the primary.
+_recent_writes: dict[str, float] = {}
+READ_PRIMARY_HEADER = "X-Read-Consistency"
+
+
+def mark_written(slug: str) -> None:
+    """Pin reads for `slug` to the primary while the replica catches up."""
+    if not _read_may_lag:
+        return
+    now = time.monotonic()
+    if len(_recent_writes) > 1024:
+        for key, until in list(_recent_writes.items()):
+            if until <= now:
+                del _recent_writes[key]
+    _recent_writes[slug] = now + settings.READ_AFTER_WRITE_SECONDS
+
+
+def _wants_primary(request: Request) -> bool:
+    if request.headers.get(READ_PRIMARY_HEADER, "").lower() == "primary":
+        return True
+    slug = request.path_params.get("slug")
+    return slug is not None and _recent_writes.get(slug, 0.0) > time.monotonic()
+
 
 async def get_session() -> AsyncSession:
     """Dependency for getting async database sessions."""
@@ -32,7 +165,105 @@ async def get_session() -> AsyncSession:
         yield session
 
 
+def read_session_factory(request: Request) -> sessionmaker:
+    """
+    Session factory for a read-only request: the read replica if one is
+    configured. Falls back to the primary when the client asks for it with
+    `X-Read-Consistency: primary`, or when this process wrote to the same
+    event slug within READ_AFTER_WRITE_SECONDS.
+    """
+    return async_session if _wants_primary(request) else async_read_session
+
+
+async def get_read_session(request: Request) -> AsyncSession:
+    """Dependency for read-only routes (see read_session_factory)."""
+    async with read_session_factory(request)() as session:
+        yield session
+
+
+async def database_busy_handler(request: Request, exc: Exception) -> JSONResponse:
+    """
+    503 + Retry-After when a write could not get the database in time: the
+    pool checkout timed out (the tuned SQLite writer is busy) or SQLite's
+    busy_timeout ran out on another process's write lock. Other database
+    errors are re-raised.
+    """
+    if isinstance(exc, OperationalError) and "database is locked" not in str(exc.orig):
+        raise exc
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "The database is busy; retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+BUSY_DATABASE_ERRORS = (PoolTimeoutError, OperationalError)
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+ALEMBIC_INI = os.path.join(ROOT_DIR, "alembic.ini")
+VERSIONS_DIR = os.path.join(ROOT_DIR, "migrations", "versions")
+BOOT_STAMP_KEY = "boot_stamp"
+
+
+def _alembic_config(connection: Connection) -> "Config":
+    # Alembic is imported only when migrations actually run (slow boot path)
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    config.attributes["connection"] = connection
+    return config
+
+
+def _run_migrations(connection: Connection) -> None:
+    from alembic import command
+
+    config = _alembic_config(connection)
+    tables = set(inspect(connection).get_table_names())
+    if "events" in tables and "alembic_version" not in tables:
+        # Database predates migrations (built by create_all): it matches 0001.
+        command.stamp(config, "0001")
+    command.upgrade(config, "head")
+
+
 async def init_db():
-    """Create all database tables."""
+    """Bring the database schema up to the latest Alembic revision."""
+    async with engine.begin() as conn:
+        await conn.run_sync(_run_migrations)
+
+
+_REVISION_RE = re.compile(r"""^(down_revision|revision)\s*=\s*['"]([^'"]+)['"]""", re.MULTILINE)
+
+
+def schema_head() -> str:
+    """
+    Head revision id, read straight from migrations/versions (no Alembic
+    import). Revisions are a single linear chain.
+    """
+    revisions, parents = set(), set()
+    for name in os.listdir(VERSIONS_DIR):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(VERSIONS_DIR, name)) as f:
+            for key, value in _REVISION_RE.findall(f.read()):
+                (revisions if key == "revision" else parents).add(value)
+    heads = revisions - parents
+    if len(heads) != 1:
+        raise RuntimeError(f"Expected one migration head, found {sorted(heads)}")
+    return heads.pop()
+
+
+async def read_boot_stamp() -> Optional[str]:
+    """The stored boot stamp, or None if there is none (or no app_meta table yet)."""
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(select(AppMeta.value).where(AppMeta.key == BOOT_STAMP_KEY))
+            return result.scalar_one_or_none()
+    except DBAPIError:
+        return None
+
+
+async def write_boot_stamp(value: str) -> None:
     async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.execute(delete(AppMeta).where(AppMeta.key == BOOT_STAMP_KEY))
+        await conn.execute(insert(AppMeta).values(key=BOOT_STAMP_KEY, value=value))
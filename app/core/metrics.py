@@ -0,0 +1,216 @@
+"""
+Lightweight request instrumentation: Server-Timing headers and a
+Prometheus-format /metrics endpoint.
+
+- `MetricsMiddleware` (pure ASGI) opens a per-request timing context, adds a
+  `Server-Timing` header with every span recorded so far, and feeds request
+  latency histograms and counters.
+- `span(name)` times a block of code (algorithm, Places call, ...).
+- `instrument_engine(engine)` hooks SQLAlchemy cursor execution so all DB
+  time lands in a `db` span without touching the handlers.
+
+Everything is in-process and per worker; no external client library is used.
+Overhead is a few perf_counter() calls and dict updates per span.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Per-request span totals: name -> [seconds, count]
+_request_spans: ContextVar[Optional[dict[str, list]]] = ContextVar("request_spans", default=None)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    """Monotonic counter with a fixed label set."""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{{{_format_labels(self.labelnames, labels)}}} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed label set."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, count) in self._series.items():
+            base = _format_labels(self.labelnames, labels)
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{base}}} {total}")
+            lines.append(f"{self.name}_count{{{base}}} {count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+
+
+REQUESTS = Counter(
+    "midway_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status")
+)
+REQUEST_LATENCY = Histogram(
+    "midway_http_request_duration_seconds", "Time to response start by route.", ("method", "route")
+)
+SPAN_LATENCY = Histogram(
+    "midway_span_duration_seconds", "Time spent per instrumented span.", ("span",)
+)
+COALESCED = Counter(
+    "midway_coalesced_calls_total", "Calls that joined an in-flight computation.", ("flight",)
+)
+
+METRICS = [REQUESTS, REQUEST_LATENCY, SPAN_LATENCY, COALESCED]
+
+
+def render_metrics() -> str:
+    """Prometheus text exposition of every registered metric."""
+    lines: list[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def record_span(name: str, seconds: float) -> None:
+    """Add `seconds` to the current request's span and to the span histogram."""
+    spans = _request_spans.get()
+    if spans is not None:
+        entry = spans.get(name)
+        if entry is None:
+            spans[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+    SPAN_LATENCY.observe(seconds, name)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as span `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - start)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    record_span("db", time.perf_counter() - conn.info["query_start"].pop())
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Record every cursor execution on `engine` in the `db` span (hooks added once per engine)."""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _server_timing(spans: dict[str, list], total: float) -> bytes:
+    parts = [f"{name};dur={seconds * 1000:.2f}" for name, (seconds, _) in spans.items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts).encode("latin-1")
+
+
+# Handler -> route path template, filled on first use
+_route_paths: dict = {}
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the route that handled `scope` ("/api/events/{slug}"),
+    used as a label instead of the raw path to bound cardinality.
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint not in _route_paths:
+        for route in scope["app"].routes:
+            if hasattr(route, "path"):
+                _route_paths.setdefault(getattr(route, "endpoint", None), route.path)
+        _route_paths.setdefault(endpoint, "unmatched")
+    return _route_paths[endpoint]
+
+
+class MetricsMiddleware:
+    """Times each HTTP request and exposes its spans via Server-Timing."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans: dict[str, list] = {}
+        token = _request_spans.set(spans)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = time.perf_counter() - start
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", _server_timing(spans, elapsed))
+                ]
+                REQUEST_LATENCY.observe(elapsed, scope["method"], route_template(scope))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS.inc(scope["method"], route_template(scope), str(status_code))
+            _request_spans.reset(token)
@@ -0,0 +1,212 @@
+"""
+Sampling profiler for live requests, armed and disarmed at runtime.
+
+The middleware is always installed but does nothing until the process-wide
+`profiler` is armed: at startup with PROFILER_ENABLED, or through the
+admin-only POST /api/debug/profile/arm (optionally for a limited time, with
+its own sample rate and routes). Each worker is armed separately.
+
+While armed, `ProfilerMiddleware` picks one in `sample_every` requests
+whose path matches one of the route templates and marks it profiled in a
+context variable. Tasks the request starts copy its context, so work it
+hands off (e.g. a SingleFlight computation, or a body streamed by
+BaseHTTPMiddleware) is profiled too. While at least one such request is in
+flight, a SIGPROF interval timer interrupts the event loop every
+PROFILER_INTERVAL_MS of CPU time; the handler keeps the interrupted stack
+only if the code running at that moment sees the mark. Samples are folded into
+"frame;frame;frame count" lines (flamegraph.pl / speedscope format).
+
+A thread sampling sys._current_frames() would almost never catch a task
+mid-step (the loop only drops the GIL between steps), hence the signal.
+Signals are delivered to the main thread, which is where uvicorn runs the
+loop; elsewhere (e.g. TestClient's portal thread) nothing is profiled.
+
+Hard caps:
+- at most PROFILER_MAX_CONCURRENT requests are profiled at once;
+- the timer is re-armed with a longer interval whenever that keeps the
+  handler's own cost under PROFILER_MAX_OVERHEAD of CPU time;
+- at most PROFILER_MAX_STACKS distinct stacks are kept (further new stacks
+  are counted as dropped), each at most PROFILER_MAX_DEPTH frames deep.
+
+Only CPU time the loop spends running the request's Python code is seen;
+time waiting on the database or network is not a sample.
+"""
+import contextvars
+import itertools
+import os
+import re
+import signal
+import threading
+import time
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+
+_profiled: contextvars.ContextVar[bool] = contextvars.ContextVar("profiled", default=False)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Aggregates folded stacks of the event loop for profiled requests."""
+
+    def __init__(
+        self,
+        interval: float,
+        max_overhead: float,
+        max_stacks: int,
+        max_depth: int,
+        max_concurrent: int,
+    ) -> None:
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self.max_concurrent = max_concurrent
+        self.samples = 0
+        self.dropped = 0
+        self._stacks: dict[str, int] = {}
+        self._active = 0  # profiled requests in flight
+        self._installed = False
+        self.sample_every = settings.PROFILER_SAMPLE_EVERY
+        self.routes = list(settings.PROFILER_ROUTES)
+        self.patterns = [_route_pattern(template) for template in self.routes]
+        self._armed_until: Optional[float] = None  # monotonic; inf = until disarmed
+        if settings.PROFILER_ENABLED:
+            self.arm()
+
+    @property
+    def armed(self) -> bool:
+        if self._armed_until is None:
+            return False
+        if time.monotonic() >= self._armed_until:
+            self._armed_until = None
+            return False
+        return True
+
+    def arm(
+        self,
+        sample_every: Optional[int] = None,
+        routes: Optional[list[str]] = None,
+        seconds: Optional[float] = None,
+    ) -> None:
+        """Start selecting requests (settings defaults for what is not given), for `seconds` or until disarmed."""
+        self.sample_every = sample_every or settings.PROFILER_SAMPLE_EVERY
+        self.routes = routes or list(settings.PROFILER_ROUTES)
+        self.patterns = [_route_pattern(template) for template in self.routes]
+        self._armed_until = time.monotonic() + seconds if seconds else float("inf")
+
+    def disarm(self) -> None:
+        """Stop selecting new requests; those already profiled finish normally."""
+        self._armed_until = None
+
+    def status(self) -> dict:
+        remaining = None
+        if self.armed and self._armed_until != float("inf"):
+            remaining = round(self._armed_until - time.monotonic(), 1)
+        return {
+            "armed": self.armed,
+            "sample_every": self.sample_every,
+            "routes": self.routes,
+            "seconds_left": remaining,
+            "samples": self.samples,
+            "dropped": self.dropped,
+        }
+
+    def begin(self) -> bool:
+        """Profile the current context; False if it can't be (cap reached, not main thread)."""
+        if self._active >= self.max_concurrent:
+            return False
+        if threading.current_thread() is not threading.main_thread():
+            return False
+        if not self._installed:
+            signal.signal(signal.SIGPROF, self._on_signal)
+            self._installed = True
+        if not self._active:
+            signal.setitimer(signal.ITIMER_PROF, self.interval)
+        self._active += 1
+        _profiled.set(True)
+        return True
+
+    def end(self) -> None:
+        _profiled.set(False)
+        self._active -= 1
+        if not self._active:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+
+    def folded(self) -> str:
+        # list() snapshots the dict without yielding to the signal handler
+        return "".join(f"{stack} {count}\n" for stack, count in list(self._stacks.items()))
+
+    def reset(self) -> None:
+        self._stacks = {}
+        self.samples = 0
+        self.dropped = 0
+
+    def _on_signal(self, signum, frame) -> None:
+        start = time.perf_counter()
+        # The handler runs in the context of whatever it interrupted
+        if _profiled.get():
+            self._record(frame)
+        if self._active:
+            # One-shot timer: stretch the next interval so the handler stays
+            # under max_overhead of CPU time.
+            cost = time.perf_counter() - start
+            signal.setitimer(signal.ITIMER_PROF, max(self.interval, cost / self.max_overhead))
+
+    def _record(self, frame) -> None:
+        labels = []
+        while frame is not None and len(labels) < self.max_depth:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        stack = ";".join(reversed(labels))
+        self.samples += 1
+        if stack in self._stacks:
+            self._stacks[stack] += 1
+        elif len(self._stacks) < self.max_stacks:
+            self._stacks[stack] = 1
+        else:
+            self.dropped += 1
+
+
+def _route_pattern(template: str) -> re.Pattern:
+    # "/api/events/{slug}/results" -> "^/api/events/[^/]+/results$"
+    parts = re.split(r"\{[^}]+\}", template)
+    return re.compile("^" + "[^/]+".join(re.escape(part) for part in parts) + "$")
+
+
+class ProfilerMiddleware:
+    """While the profiler is armed, hands one in N requests on its routes to it."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._counter = itertools.count()
+
+    def _selected(self, scope: Scope) -> bool:
+        if not profiler.armed or not any(pattern.match(scope["path"]) for pattern in profiler.patterns):
+            return False
+        return next(self._counter) % profiler.sample_every == 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._selected(scope) or not profiler.begin():
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.end()
+
+
+profiler = SamplingProfiler(
+    interval=settings.PROFILER_INTERVAL_MS / 1000,
+    max_overhead=settings.PROFILER_MAX_OVERHEAD,
+    max_stacks=settings.PROFILER_MAX_STACKS,
+    max_depth=settings.PROFILER_MAX_DEPTH,
+    max_concurrent=settings.PROFILER_MAX_CONCURRENT,
+)
@@ -0,0 +1,143 @@
+"""
+Per-request SQL query budgets.
+
+Every engine built by app.core.db gets cursor hooks that count statements
+and DB time into the innermost active `track_queries()` block.
+`QueryBudgetMiddleware` opens one block per HTTP request and logs a warning
+when the route goes over its query or DB-time budget, or runs the same
+statement QUERY_REPEAT_THRESHOLD times (the usual N+1 shape).
+
+For tests, `assert_max_queries(n)` fails a block that issues more than `n`
+statements, and app.testing provides pytest fixtures built on both.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Statements seen inside one tracking block (and reported to its parent)."""
+
+    def __init__(self, parent: Optional["QueryStats"] = None) -> None:
+        self.parent = parent
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: dict[str, int] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        stats: Optional[QueryStats] = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            stats.statements[statement] = stats.statements.get(statement, 0) + 1
+            stats = stats.parent
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Statements executed at least `threshold` times."""
+        return {sql: n for sql, n in self.statements.items() if n >= threshold}
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Violation lists registered by app.testing; each gets a copy of every report.
+_collectors: list[list[str]] = []
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count the statements executed (in this context) inside the block."""
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail with the executed statements if the block issues more than `limit`."""
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        listing = "\n".join(f"  {n}x {sql}" for sql, n in stats.statements.items())
+        raise AssertionError(f"Expected at most {limit} queries, got {stats.count}:\n{listing}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("budget_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is not None and conn.info.get("budget_start"):
+        stats.record(statement, time.perf_counter() - conn.info["budget_start"].pop())
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Report every cursor execution on `engine` to the active tracking block.
+
+    Idempotent: the hooks are module-level functions registered at most once
+    per engine, so instrumenting an engine twice (or a reader that is the
+    writer) does not count its statements twice.
+    """
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def query_budget(route: str) -> int:
+    """Allowed statements per request for `route` ("METHOD /path"); 0 = unlimited."""
+    return settings.QUERY_BUDGETS.get(route, settings.QUERY_BUDGET_DEFAULT)
+
+
+def budget_violations(route: str, stats: QueryStats) -> list[str]:
+    """Describe every way `stats` broke the budget for `route`."""
+    budget = query_budget(route)
+    if budget <= 0:
+        return []
+    problems = []
+    if stats.count > budget:
+        problems.append(f"{route}: {stats.count} queries (budget {budget})")
+    db_ms = stats.seconds * 1000
+    if settings.QUERY_TIME_BUDGET_MS and db_ms > settings.QUERY_TIME_BUDGET_MS:
+        problems.append(f"{route}: {db_ms:.1f} ms in the database (budget {settings.QUERY_TIME_BUDGET_MS:g} ms)")
+    for sql, n in stats.repeated(settings.QUERY_REPEAT_THRESHOLD).items():
+        problems.append(f"{route}: possible N+1, statement ran {n}x: {sql}")
+    return problems
+
+
+class QueryBudgetMiddleware:
+    """Tracks queries per HTTP request and logs routes that exceed their budget."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                route = f"{scope['method']} {route_template(scope)}"
+                for problem in budget_violations(route, stats):
+                    logger.warning("Query budget exceeded: %s", problem)
+                    for collector in _collectors:
+                        collector.append(problem)
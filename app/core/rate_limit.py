@@ -0,0 +1,187 @@
+"""
+Token-bucket admission control.
+
+Each key (a client address or an event slug) owns a bucket of `burst`
+tokens that refills at `per_second`. A request takes one token; when the
+bucket is empty the request is rejected with 429 and a Retry-After of the
+time until the next token.
+
+Backends:
+- InMemoryRateLimitBackend: per-process buckets (default). With N workers
+  the effective limit is up to N times the configured one.
+- PostgresRateLimitBackend: buckets shared by every worker, one atomic
+  upsert per check in an UNLOGGED table (created on start) on the
+  database clock.
+
+A failing backend admits the request: the limiter protects the database
+and Places quota, it must not become an outage of its own.
+"""
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBackend(ABC):
+    """Stores token buckets and takes tokens from them."""
+
+    async def start(self) -> None:
+        pass
+
+    @abstractmethod
+    async def acquire(self, key: str, burst: int, per_second: float) -> float:
+        """Take one token from `key`. Returns 0 if granted, else seconds until one is available."""
+
+    async def stop(self) -> None:
+        pass
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Process-local buckets."""
+
+    MAX_KEYS = 10000
+
+    def __init__(self) -> None:
+        # key -> [tokens, last update, time at which the bucket is full again]
+        self._buckets: dict[str, list[float]] = {}
+
+    def _prune(self, now: float) -> None:
+        for key, (_, _, full_at) in list(self._buckets.items()):
+            if full_at <= now:
+                del self._buckets[key]
+
+    async def acquire(self, key: str, burst: int, per_second: float) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_KEYS:
+                self._prune(now)
+            bucket = self._buckets[key] = [float(burst), now, now]
+        tokens = min(float(burst), bucket[0] + (now - bucket[1]) * per_second)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / per_second
+        bucket[0], bucket[1] = tokens, now
+        bucket[2] = now + (burst - tokens) / per_second
+        return wait
+
+
+# Refilled level of the stored bucket, clamped to the burst ($2 = burst,
+# $3 = per second); referenced several times by the upsert below.
+_LEVEL = "least($2::float8, b.tokens + (excluded.updated_at - b.updated_at) * $3::float8)"
+
+
+class PostgresRateLimitBackend(RateLimitBackend):
+    """Buckets shared across workers in a Postgres table."""
+
+    TABLE = "rate_limit_buckets"
+    IDLE_SECONDS = 3600  # rows untouched this long are deleted on start
+
+    def __init__(self, dsn: str) -> None:
+        # asyncpg wants a plain postgresql:// DSN
+        self._dsn = dsn.replace("postgresql+asyncpg://", "postgresql://", 1)
+        self._pool = None
+        self._acquire_sql = f"""
+            INSERT INTO {self.TABLE} AS b (key, tokens, updated_at, granted)
+            VALUES ($1, $2::float8 - 1, extract(epoch FROM clock_timestamp()), true)
+            ON CONFLICT (key) DO UPDATE SET
+                tokens = CASE WHEN {_LEVEL} >= 1 THEN {_LEVEL} - 1 ELSE {_LEVEL} END,
+                granted = {_LEVEL} >= 1,
+                updated_at = excluded.updated_at
+            RETURNING granted, tokens
+        """
+
+    async def start(self) -> None:
+        import asyncpg
+
+        self._pool = await asyncpg.create_pool(self._dsn, min_size=1, max_size=4)
+        async with self._pool.acquire() as conn:
+            await conn.execute(f"""
+                CREATE UNLOGGED TABLE IF NOT EXISTS {self.TABLE} (
+                    key text PRIMARY KEY,
+                    tokens double precision NOT NULL,
+                    updated_at double precision NOT NULL,
+                    granted boolean NOT NULL
+                )
+            """)
+            await conn.execute(
+                f"DELETE FROM {self.TABLE} WHERE updated_at < extract(epoch FROM clock_timestamp()) - $1::float8",
+                self.IDLE_SECONDS,
+            )
+
+    async def acquire(self, key: str, burst: int, per_second: float) -> float:
+        if self._pool is None:
+            raise RuntimeError("PostgresRateLimitBackend is not started")
+        granted, tokens = await self._pool.fetchrow(self._acquire_sql, key, float(burst), per_second)
+        return 0.0 if granted else (1 - tokens) / per_second
+
+    async def stop(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+def _create_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND_URL.startswith("postgresql"):
+        return PostgresRateLimitBackend(settings.RATE_LIMIT_BACKEND_URL)
+    return InMemoryRateLimitBackend()
+
+
+backend = _create_backend()
+
+
+def client_address(request: Request) -> str:
+    """
+    The caller's address. Behind RATE_LIMIT_TRUSTED_PROXY_HOPS proxies it is
+    the X-Forwarded-For entry the outermost of them appended, counted from
+    the right: entries further left come from the client and can be forged.
+    """
+    hops = settings.RATE_LIMIT_TRUSTED_PROXY_HOPS
+    if hops > 0:
+        forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",")]
+        if len(forwarded) >= hops and forwarded[-hops]:
+            return forwarded[-hops]
+    return request.client.host if request.client else "unknown"
+
+
+async def _take(key: str, burst: int, per_second: float) -> float:
+    try:
+        return await backend.acquire(key, burst, per_second)
+    except Exception:
+        logger.warning("Rate limit backend failed; admitting request", exc_info=True)
+        return 0.0
+
+
+def _too_many_requests(wait: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many requests for these results; retry shortly",
+        headers={"Retry-After": str(max(1, math.ceil(wait)))},
+    )
+
+
+async def limit_results(request: Request, slug: str) -> None:
+    """
+    Dependency for /events/{slug}/results: one token from the caller's
+    bucket, then one from the slug's. A caller already over its own limit
+    does not drain the shared slug bucket.
+    """
+    if not settings.RESULTS_RATE_LIMIT_ENABLED:
+        return
+    wait = await _take(
+        f"results:client:{client_address(request)}",
+        settings.RESULTS_CLIENT_BURST,
+        settings.RESULTS_CLIENT_PER_SECOND,
+    )
+    if not wait:
+        wait = await _take(f"results:slug:{slug}", settings.RESULTS_SLUG_BURST, settings.RESULTS_SLUG_PER_SECOND)
+    if wait:
+        raise _too_many_requests(wait)
@@ -0,0 +1,26 @@
+"""
+Fast JSON responses for already-trusted data.
+
+Returning a Response from a handler makes FastAPI skip its response_model
+pass (re-validate, dump to Python objects, then stdlib json.dumps). Handlers
+that build their payload from database rows serialize it with a pre-built
+pydantic TypeAdapter instead, straight to JSON bytes in pydantic-core. The
+route's `response_model` is kept for the OpenAPI schema.
+"""
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+# Serializes plain dicts/lists of trusted values (UUIDs, datetimes, models)
+# by inspecting runtime types; no validation happens.
+trusted_adapter: TypeAdapter = TypeAdapter(Any)
+
+
+def json_response(content: Any, adapter: TypeAdapter = trusted_adapter, status_code: int = 200) -> Response:
+    """Serialize `content` with `adapter` and wrap it in a JSON response."""
+    return Response(
+        content=adapter.dump_json(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -0,0 +1,42 @@
+"""
+Request coalescing ("single flight").
+
+Concurrent calls for the same key share one in-flight computation: the
+first caller starts it as its own task, later callers await that task, and
+the key is free again as soon as it finishes. Results are not cached
+beyond that.
+
+The task is shielded from its callers, so a client that disconnects does
+not cancel the work the others are waiting on. It runs in a copy of the
+first caller's context, so that request's query stats and spans include it.
+"""
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from app.core.metrics import COALESCED
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Deduplicates concurrent async computations by key."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name  # label on midway_coalesced_calls_total
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved, even if every caller went away
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            COALESCED.inc(self.name)
+        return await asyncio.shield(task)
@@ -0,0 +1,137 @@
+"""
+Application boot sequence, split so the app accepts requests as early as
+possible after an idle instance wakes up.
+
+Critical path (before serving): one query reads the boot stamp from
+app_meta. If it equals "<schema head>:<seed version>" nothing else runs;
+otherwise pending migrations are applied (the only time Alembic is
+imported), missing locations are seeded and the stamp is written, so a
+stale database is never served.
+
+Location reference data: a worker started by scripts/serve.py attaches the
+shared snapshot file named by LOCATION_SNAPSHOT_PATH (an mmap, no query).
+Otherwise the snapshot is built in memory as deferred work, and lookups go
+to the database until it is ready.
+
+Deferred (after serving starts): the live-stream broker and the rate-limit
+backend are started and, without an attached snapshot, the in-memory
+location snapshot is built. Each of these fails on its own (logged) without
+stopping the others.
+
+Every phase logs its duration with a "[startup]" prefix; the first /health
+response logs the time since the process started.
+"""
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.db import async_session, init_db, read_boot_stamp, schema_head, write_boot_stamp
+from app.models.location import Location
+from app.services import location_snapshot
+
+DATA_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "scripts", "locations_data.json"
+)
+
+
+def process_uptime() -> Optional[float]:
+    """Seconds since this process started (Linux /proc; None elsewhere)."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 (starttime, in clock ticks after boot); fields after
+            # the ")" that closes the command name start at field 3.
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            system_uptime = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return system_uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+
+
+def log_since_start(label: str) -> None:
+    uptime = process_uptime()
+    if uptime is not None:
+        print(f"[startup] {label} {uptime * 1000:.0f} ms after process start")
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        print(f"[startup] {name}: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+def seed_version() -> str:
+    """Short content hash of the bundled locations file."""
+    if not os.path.exists(DATA_FILE):
+        return "none"
+    with open(DATA_FILE, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def expected_boot_stamp() -> str:
+    return f"{schema_head()}:{seed_version()}"
+
+
+async def prepare_database() -> None:
+    """Critical startup work: migrate and seed, unless the boot stamp is current."""
+    with phase("boot stamp check"):
+        stamp = await read_boot_stamp()
+        expected = expected_boot_stamp()
+    if stamp == expected:
+        return
+
+    stored_schema = stamp.split(":", 1)[0] if stamp else None
+    if stored_schema != schema_head():
+        with phase("migrations"):
+            await init_db()
+    with phase("location seeding"):
+        await seed_locations()
+
+
+async def seed_locations() -> None:
+    """
+    Insert bundled locations that are not in the table yet (matched on city
+    + area name), then record the new boot stamp.
+    """
+    if os.path.exists(DATA_FILE):
+        with open(DATA_FILE) as f:
+            data = json.load(f)
+
+        async with async_session() as session:
+            result = await session.execute(select(Location.city, Location.area_name))
+            existing = {(city, area_name) for city, area_name in result.all()}
+            missing = [row for row in data if (row["city"], row["area_name"]) not in existing]
+            for row in missing:
+                session.add(Location(
+                    city=row["city"],
+                    area_name=row["area_name"],
+                    lat=row["lat"],
+                    lng=row["lng"],
+                ))
+            await session.commit()
+        if missing:
+            print(f"[startup] Seeded {len(missing)} locations.")
+
+    await write_boot_stamp(expected_boot_stamp())
+
+
+def attach_location_snapshot() -> bool:
+    """Attach the shared snapshot named by LOCATION_SNAPSHOT_PATH, if any."""
+    if not settings.LOCATION_SNAPSHOT_PATH:
+        return False
+    try:
+        with phase("location snapshot attach"):
+            location_snapshot.attach(settings.LOCATION_SNAPSHOT_PATH)
+    except location_snapshot.SnapshotError as exc:
+        print(f"[startup] {exc}; building the location snapshot in memory instead")
+        return False
+    return True
@@ -1,5 +1,8 @@
 from app.models.event import Event
 from app.models.participant import Participant
 from app.models.availability import Availability
+from app.models.availability_pattern import AvailabilityPattern
+from app.models.location import Location
+from app.models.app_meta import AppMeta
 
-__all__ = ["Event", "Participant", "Availability"]
+__all__ = ["Event", "Participant", "Availability", "AvailabilityPattern", "Location", "AppMeta"]
@@ -0,0 +1,10 @@
+from sqlmodel import SQLModel, Field
+
+
+class AppMeta(SQLModel, table=True):
+    """Key/value facts about the database itself, such as the boot stamp."""
+
+    __tablename__ = "app_meta"
+
+    key: str = Field(primary_key=True, max_length=50)
+    value: str = Field(max_length=200)
@@ -0,0 +1,22 @@
+from datetime import time
+from uuid import UUID, uuid4
+from sqlmodel import SQLModel, Field, Index
+
+
+class AvailabilityPattern(SQLModel, table=True):
+    """
+    Weekly recurring availability of a participant, stored compactly and
+    expanded over the event window only when results are computed.
+    """
+
+    __tablename__ = "availability_patterns"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    participant_id: UUID = Field(foreign_key="participants.id")
+    weekdays: int  # bit mask of start days, Monday = bit 0
+    start_time: time
+    duration_minutes: int  # may run past midnight and over several days
+
+    __table_args__ = (
+        Index("ix_availability_patterns_participant_id", "participant_id"),
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime
 from uuid import UUID, uuid4
-from sqlmodel import SQLModel, Field, Index
+from sqlmodel import SQLModel, Field
 from typing import Optional
 
 
@@ -16,7 +16,3 @@ class Event(SQLModel, table=True):
     window_end: datetime
     status: str = Field(default="PLANNING", max_length=50)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    __table_args__ = (
-        Index("ix_event_slug", "slug"),
-    )
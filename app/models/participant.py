@@ -1,5 +1,6 @@
+from datetime import datetime
 from uuid import UUID, uuid4
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Index
 from typing import Optional
 
 
@@ -9,10 +10,23 @@ class Participant(SQLModel, table=True):
     __tablename__ = "participants"
     
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    event_id: UUID = Field(foreign_key="events.id", index=True)
+    event_id: UUID = Field(foreign_key="events.id")
     name: str = Field(max_length=100)
     is_host: bool = Field(default=False)
     declined: bool = Field(default=False)
     location_name: str = Field(max_length=200, default="")
     lat: Optional[float] = Field(default=None)
     lng: Optional[float] = Field(default=None)
+    # Set on insert and on every update; fingerprints an event's
+    # participants for the what-if results cache (NULL on older rows)
+    updated_at: Optional[datetime] = Field(
+        default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow}
+    )
+
+    # Leading event_id column also serves plain "all participants of an event"
+    # lookups, so no separate single-column index is kept.
+    # (event_id, id) serves keyset pages of the event detail in id order.
+    __table_args__ = (
+        Index("ix_participants_event_id_declined", "event_id", "declined"),
+        Index("ix_participants_event_id_id", "event_id", "id"),
+    )
@@ -0,0 +1,58 @@
+import hmac
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiler import profiler
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+async def require_admin(x_admin_token: str = Header("", alias="X-Admin-Token")) -> None:
+    """Reject callers without the configured ADMIN_TOKEN (always, if none is set)."""
+    if not settings.ADMIN_TOKEN or not hmac.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
+
+
+@router.get("/profile", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def get_profile(
+    reset: bool = Query(False, description="Clear the collected stacks after reading them"),
+):
+    """
+    Folded stacks sampled from profiled requests, one `frame;frame;... count`
+    line per distinct stack (feed to flamegraph.pl or speedscope).
+    """
+    body = profiler.folded()
+    headers = {"X-Profile-Samples": str(profiler.samples), "X-Profile-Dropped": str(profiler.dropped)}
+    if reset:
+        profiler.reset()
+    return PlainTextResponse(body, headers=headers)
+
+
+@router.get("/profile/status", dependencies=[Depends(require_admin)])
+async def get_profile_status():
+    """Whether this worker's profiler is armed, with its settings and sample counts."""
+    return profiler.status()
+
+
+@router.post("/profile/arm", dependencies=[Depends(require_admin)])
+async def arm_profiler(
+    sample_every: Optional[int] = Query(None, ge=1, description="Profile 1 in N matching requests"),
+    routes: Optional[List[str]] = Query(None, description="Route templates, e.g. /api/events/{slug}/results"),
+    seconds: Optional[float] = Query(None, gt=0, description="Disarm automatically after this long"),
+):
+    """
+    Start profiling without a restart (PROFILER_* settings fill in what is
+    not given). Applies to the worker that serves this call only.
+    """
+    profiler.arm(sample_every, routes, seconds)
+    return profiler.status()
+
+
+@router.post("/profile/disarm", dependencies=[Depends(require_admin)])
+async def disarm_profiler():
+    """Stop selecting requests on this worker; collected stacks are kept."""
+    profiler.disarm()
+    return profiler.status()
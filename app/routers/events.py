@@ -1,23 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import json
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
-from uuid import uuid4
-from typing import List
+from uuid import UUID, uuid4
 
-from app.core.db import get_session
+from app.core.db import async_session, get_read_session, get_session, mark_written, read_session_factory
 from app.core.config import settings
+from app.core.rate_limit import limit_results
+from app.core.responses import json_response
+from app.core.single_flight import SingleFlight
 from app.models.event import Event
 from app.models.participant import Participant
 from app.models.availability import Availability
-from app.models.location import Location
-from app.schemas.event import EventCreate, EventResponse, EventDetailResponse, ParticipantBasic
+from app.models.availability_pattern import AvailabilityPattern
+from app.schemas.event import EventCreate, EventResponse, EventDetailResponse
 from app.schemas.participant import ParticipantCreate, ParticipantResponse, DeclineCreate
-from app.schemas.results import ResultsResponse, SuggestedTime, SuggestedLocation, VenueRecommendation
-from app.services.algorithm_service import calculate_centroid, find_overlap
-from app.services.places_service import fetch_venue_recommendations
+from app.schemas.results import MeetingObjective, ResultsResponse
+from app.services.bulk_import import BulkImportError, UploadStatusResponse, check_csv_header, import_participants
+from app.services import results_cache
+from app.services.event_service import (
+    ResultsBase, build_event_detail, compute_results, get_event_by_slug, results_from_base,
+    stream_event_detail,
+)
+from app.services.event_stream import StreamLimitExceeded, broker
+from app.services.location_resolver import locations_by_id, resolve_names
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+# Pre-built serializer for the results model (see app.core.responses)
+_results_adapter = TypeAdapter(ResultsResponse)
+
+# Concurrent /results requests for the same slug share one computation
+_results_flight = SingleFlight("results")
+
+
+def _event_not_found(slug: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Event with slug '{slug}' not found"
+    )
+
+
+async def _get_event_or_404(session: AsyncSession, slug: str) -> Event:
+    event = await get_event_by_slug(session, slug)
+    if not event:
+        raise _event_not_found(slug)
+    return event
+
 
 @router.post("/", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
 async def create_event(
@@ -44,9 +77,9 @@ async def create_event(
         window_end=window_end
     )
     
+    # Every column has a client-side default, so no refresh is needed
     session.add(event)
     await session.commit()
-    await session.refresh(event)
     
     return event
 
@@ -54,49 +87,30 @@ async def create_event(
 @router.get("/{slug}", response_model=EventDetailResponse)
 async def get_event(
     slug: str,
-    session: AsyncSession = Depends(get_session)
+    request: Request,
+    cursor: Optional[UUID] = Query(None, description="next_cursor of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.PARTICIPANTS_PAGE_MAX),
+    stream: bool = Query(False, description="Stream the JSON document as rows are read"),
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
-    Retrieve event details including all participants.
+    Retrieve event details with participants and their joined/declined summary.
+
+    Without `limit` all participants are returned; with it, one page in id
+    order after `cursor`, and `next_cursor` for the page after. `stream=true`
+    writes the same document out while reading participants from a
+    server-side cursor, so large events are never held in memory.
     """
-    # Find event by slug
-    result = await session.execute(
-        select(Event).where(Event.slug == slug)
-    )
-    event = result.scalar_one_or_none()
-    
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Event with slug '{slug}' not found"
+    # Find event
+    event = await _get_event_or_404(session, slug)
+
+    if stream:
+        # The request's session is closed before a streamed body is sent
+        return StreamingResponse(
+            stream_event_detail(read_session_factory(request), event, cursor, limit),
+            media_type="application/json",
         )
-    
-    # Get participants
-    participants_result = await session.execute(
-        select(Participant).where(Participant.event_id == event.id)
-    )
-    participants = participants_result.scalars().all()
-    
-    # Build response
-    return EventDetailResponse(
-        id=event.id,
-        slug=event.slug,
-        title=event.title,
-        window_start=event.window_start,
-        window_end=event.window_end,
-        status=event.status,
-        created_at=event.created_at,
-        participants=[
-            ParticipantBasic(
-                id=p.id,
-                name=p.name,
-                location_name=p.location_name,
-                is_host=p.is_host,
-                declined=p.declined
-            )
-            for p in participants
-        ]
-    )
+    return json_response(await build_event_detail(session, event, cursor, limit))
 
 
 @router.post("/{slug}/join", response_model=ParticipantResponse, status_code=status.HTTP_201_CREATED)
@@ -114,27 +128,19 @@ async def join_event(
     3. Saves their availability time slots
     """
     # Find event
-    result = await session.execute(
-        select(Event).where(Event.slug == slug)
-    )
-    event = result.scalar_one_or_none()
+    event = await _get_event_or_404(session, slug)
     
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Event with slug '{slug}' not found"
-        )
-    
-    # Resolve coordinates from Location table; fall back to Bengaluru centre
+    # Resolve coordinates: the chosen location_id, else the name; fall back
+    # to Bengaluru centre. Both are served from the location snapshot
+    # without a query once one is attached.
     DEFAULT_LAT, DEFAULT_LNG = 12.9716, 77.5946
-    location_result = await session.execute(
-        select(Location)
-        .where(Location.area_name.ilike(participant_data.location_name))  # type: ignore[attr-defined]
-        .limit(1)
-    )
-    loc = location_result.scalar_one_or_none()
-    lat = loc.lat if loc else DEFAULT_LAT
-    lng = loc.lng if loc else DEFAULT_LNG
+    loc = None
+    if participant_data.location_id is not None:
+        loc = (await locations_by_id(session, [participant_data.location_id])).get(participant_data.location_id)
+    if loc is None:
+        name = participant_data.location_name
+        loc = (await resolve_names(session, [name])).get(name)
+    lat, lng = (loc["lat"], loc["lng"]) if loc else (DEFAULT_LAT, DEFAULT_LNG)
     
     # Create participant
     participant = Participant(
@@ -147,10 +153,12 @@ async def join_event(
     )
     
     session.add(participant)
-    await session.commit()
-    await session.refresh(participant)
+    # INSERT the participant first: without an ORM relationship the unit of
+    # work does not order it before its availabilities. The id is generated
+    # client-side, so no refresh round trip is needed.
+    await session.flush()
     
-    # Create availability slots
+    # Create availability slots (committed with the participant)
     for availability_input in participant_data.availabilities:
         # Convert timezone-aware datetimes to naive UTC for database
         start_time = availability_input.start_time.replace(tzinfo=None) if availability_input.start_time.tzinfo else availability_input.start_time
@@ -162,12 +170,74 @@ async def join_event(
             end_time=end_time
         )
         session.add(availability)
+
+    # Recurring slots are stored as patterns, expanded only for results
+    for recurrence in participant_data.recurrences:
+        session.add(AvailabilityPattern(
+            participant_id=participant.id,
+            weekdays=recurrence.weekdays,
+            start_time=recurrence.start_time,
+            duration_minutes=recurrence.duration_minutes,
+        ))
     
     await session.commit()
+    mark_written(slug)
+    await broker.notify(slug)
     
     return participant
 
 
+@router.post("/{slug}/participants:bulk")
+async def bulk_import_participants(
+    slug: str,
+    request: Request,
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Import many participants at once from a streamed NDJSON or CSV upload.
+
+    NDJSON rows use the same shape as the join body. CSV needs a header with
+    `name`, `location_name`, optional `is_host`, and either `start_time` +
+    `end_time` or `availabilities` as `start/end` intervals joined by `;`.
+
+    Responds with an NDJSON stream: one status line per row
+    (`{"row": n, "status": "ok" | "error", ...}`) and a final `summary` line.
+    A CSV without that header is rejected with 400 before any row is read.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "csv" in content_type:
+        fmt = "csv"
+    elif "ndjson" in content_type or "jsonl" in content_type:
+        fmt = "ndjson"
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson"
+        )
+
+    # Find event
+    event = await _get_event_or_404(session, slug)
+    event_id = event.id
+
+    chunks = request.stream()
+    if fmt == "csv":
+        # A wrong header fails the whole upload: answer before streaming starts
+        try:
+            chunks = await check_csv_header(chunks)
+        except BulkImportError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    async def status_lines():
+        # The request-scoped session is closed once streaming starts
+        async with async_session() as import_session:
+            async for status_row in import_participants(import_session, event_id, chunks, fmt):
+                yield json.dumps(status_row) + "\n"
+        mark_written(slug)
+        await broker.notify(slug)
+
+    return UploadStatusResponse(status_lines(), media_type="application/x-ndjson")
+
+
 @router.post("/{slug}/decline", response_model=ParticipantResponse, status_code=status.HTTP_201_CREATED)
 async def decline_event(
     slug: str,
@@ -179,16 +249,7 @@ async def decline_event(
     Creates a Participant row with declined=True and no availability.
     """
     # Find event
-    result = await session.execute(
-        select(Event).where(Event.slug == slug)
-    )
-    event = result.scalar_one_or_none()
-
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Event with slug '{slug}' not found"
-        )
+    event = await _get_event_or_404(session, slug)
 
     participant = Participant(
         event_id=event.id,
@@ -200,125 +261,144 @@ async def decline_event(
 
     session.add(participant)
     await session.commit()
-    await session.refresh(participant)
+    mark_written(slug)
+    await broker.notify(slug)
 
     return participant
 
 
-@router.get("/{slug}/results", response_model=ResultsResponse)
+async def _render_results(slug: str, objective: str, session_factory) -> Optional[bytes]:
+    """Serialized results for `slug`; None if nobody has joined yet."""
+    async with session_factory() as session:
+        event = await _get_event_or_404(session, slug)
+        results = await compute_results(session, event, objective)
+    return None if results is None else _results_adapter.dump_json(results)
+
+
+def _match_participants(base: ResultsBase, refs: List[str]) -> set[UUID]:
+    """Ids of active participants named by id or (case-insensitive) name."""
+    ids: set[UUID] = set()
+    for ref in refs:
+        name = ref.strip().lower()
+        matched = [p.id for p in base.participants if str(p.id) == ref or p.name.lower() == name]
+        if not matched:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"No active participant matches '{ref}'"
+            )
+        ids.update(matched)
+    return ids
+
+
+async def _render_what_if(slug: str, objective: str, exclude: List[str], require: List[str]) -> Optional[bytes]:
+    """Serialized what-if results from the cached base; None if nobody is left."""
+    base = await results_cache.get_base(slug)
+    if base is None:
+        raise _event_not_found(slug)
+    excluded = _match_participants(base, exclude)
+    required = _match_participants(base, require)
+    if excluded & required:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A participant cannot be both excluded and required"
+        )
+    results = results_from_base(base, objective, excluded, required)
+    return None if results is None else _results_adapter.dump_json(results)
+
+
+@router.get(
+    "/{slug}/results",
+    response_model=ResultsResponse,
+    dependencies=[Depends(limit_results)],
+    responses={429: {"description": "Rate limited; see Retry-After"}},
+)
 async def get_results(
     slug: str,
-    session: AsyncSession = Depends(get_session)
+    request: Request,
+    objective: MeetingObjective = Query(
+        "total", description="Meeting area ranking: total distance, worst-off participant, or a blend"
+    ),
+    exclude: List[str] = Query([], description="What-if: participant ids or names to leave out"),
+    require: List[str] = Query([], description="What-if: participant ids or names who must be available"),
 ):
     """
     Calculate and return the "magic" results:
     - Best time window (maximum overlap)
     - Geographic centroid (fair meeting point)
+    - Ranked seeded meeting areas in the participants' city
     - Venue recommendations
+
+    `exclude` / `require` answer "what if Bob can't make it" / "what if
+    the host must come" from a cached per-event base instead of the
+    database (venue recommendations stay those of the full group).
+
+    Concurrent requests for the same event share one computation (in its
+    own session); callers over their per-client or per-event rate get 429.
     """
-    # Find event
-    result = await session.execute(
-        select(Event).where(Event.slug == slug)
-    )
-    event = result.scalar_one_or_none()
-    
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Event with slug '{slug}' not found"
+    if exclude or require:
+        body = await _results_flight.run(
+            (slug, objective, frozenset(exclude), frozenset(require)),
+            lambda: _render_what_if(slug, objective, exclude, require),
         )
-    
-    # Get all participants
-    participants_result = await session.execute(
-        select(Participant).where(Participant.event_id == event.id)
-    )
-    participants = list(participants_result.scalars().all())
+        if body is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No participants are left after the exclusions"
+            )
+        return Response(content=body, media_type="application/json")
 
-    # Separate active from declined participants
-    active_participants = [p for p in participants if not p.declined]
-    
-    if not active_participants:
+    session_factory = read_session_factory(request)
+    body = await _results_flight.run(
+        (slug, objective, session_factory), lambda: _render_results(slug, objective, session_factory)
+    )
+    if body is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No participants have joined this event yet"
         )
-    
-    # Get all availabilities (only for active participants)
-    participant_ids = [p.id for p in active_participants]
-    availabilities_result = await session.execute(
-        select(Availability).where(Availability.participant_id.in_(participant_ids))
-    )
-    availabilities = list(availabilities_result.scalars().all())
-    
-    # Calculate suggested time
-    suggested_time = None
-    if availabilities:
-        overlap = find_overlap(availabilities)
-        if overlap:
-            suggested_time = SuggestedTime(
-                start=overlap["start"],
-                end=overlap["end"],
-                participant_count=overlap["count"]
-            )
-    
-    # Calculate suggested location (geometric median)
-    suggested_location = None
-    centroid = calculate_centroid(active_participants)
-    if centroid:
-        # Label: find the participant whose location is closest to the median
-        def dist(p: Participant) -> float:
-            if p.lat is None or p.lng is None:
-                return float("inf")
-            return ((p.lat - centroid["lat"]) ** 2 + (p.lng - centroid["lng"]) ** 2) ** 0.5
-
-        closest = min(active_participants, key=dist)
-        neighborhood = closest.location_name
-        suggested_location = SuggestedLocation(
-            lat=centroid["lat"],
-            lng=centroid["lng"],
-            neighborhood=neighborhood
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/{slug}/stream")
+async def stream_event(
+    slug: str,
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Live event detail + results over Server-Sent Events.
+
+    Pushes an `update` event (JSON: `{"event": ..., "results": ...}`) on
+    connect and after every join/decline for this slug; `results` is null
+    until someone joins. Comment heartbeats keep idle proxies from closing
+    the connection.
+    """
+    # Find event (the session is released before streaming starts)
+    await _get_event_or_404(session, slug)
+
+    try:
+        queue = broker.subscribe(slug)
+    except StreamLimitExceeded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many live connections, fall back to polling",
+            headers={"Retry-After": "30"},
         )
-    
-    # Venue recommendations: use Google Places API if key is configured, else fall back to statics
-    venue_recommendations: list[VenueRecommendation] = []
-    if centroid and settings.GOOGLE_PLACES_API_KEY:
+
+    async def event_source():
         try:
-            venue_recommendations = await fetch_venue_recommendations(
-                lat=centroid["lat"],
-                lng=centroid["lng"],
-                api_key=settings.GOOGLE_PLACES_API_KEY,
-            )
-        except Exception:
-            # If the Places API call fails for any reason, degrade gracefully
-            venue_recommendations = []
-
-    if not venue_recommendations:
-        # Static fallback (no API key or Places API unavailable)
-        venue_recommendations = [
-            VenueRecommendation(
-                name="Toit Brewpub",
-                type="Brewery & Restaurant",
-                description="Popular microbrewery with craft beers and continental cuisine",
-                estimated_price="₹₹₹"
-            ),
-            VenueRecommendation(
-                name="Truffles",
-                type="Cafe & Restaurant",
-                description="Iconic burger joint known for its massive burgers and casual vibe",
-                estimated_price="₹₹"
-            ),
-            VenueRecommendation(
-                name="The Fatty Bao",
-                type="Asian Gastrobar",
-                description="Modern Asian restaurant with innovative small plates and cocktails",
-                estimated_price="₹₹₹"
-            )
-        ]
-    
-    return ResultsResponse(
-        event_title=event.title,
-        suggested_time=suggested_time,
-        suggested_location=suggested_location,
-        venue_recommendations=venue_recommendations,
-        total_participants=len(active_participants)
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: update\ndata: {payload}\n\n"
+        finally:
+            broker.unsubscribe(slug, queue)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
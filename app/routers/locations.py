@@ -3,26 +3,37 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from typing import List, Optional
 
-from app.core.db import get_session
+from app.core.db import get_read_session
+from app.core.responses import json_response
 from app.models.location import Location
+from app.schemas.location import LocationResolution, LocationResolveRequest, LocationResult
+from app.services import location_snapshot
+from app.services.location_resolver import resolve_names
 
 router = APIRouter(prefix="/locations", tags=["locations"])
 
 
-@router.get("/search", response_model=List[dict])
+@router.get("/search", response_model=List[LocationResult])
 async def search_locations(
     q: str = Query(..., min_length=2, description="Partial area name to search"),
     city: Optional[str] = Query(None, description="Filter by city name"),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Search for location areas by partial name.
 
     Returns up to 10 results, with starts-with matches ranked above contains.
-    Case-insensitive on Postgres via ILIKE.
+    Case-insensitive on Postgres via ILIKE. Served from the location
+    snapshot, without a query, once one is attached or built.
     """
-    # Build base query
-    stmt = select(Location).where(
+    snapshot = location_snapshot.current()
+    if snapshot is not None:
+        return json_response(snapshot.search(q, city))
+
+    # Build base query (plain column tuples: no ORM objects to build)
+    stmt = select(
+        Location.id, Location.city, Location.area_name, Location.lat, Location.lng
+    ).where(
         Location.area_name.ilike(f"%{q}%")  # type: ignore[attr-defined]
     )
 
@@ -32,22 +43,40 @@ async def search_locations(
     # Fetch up to 30 candidates, then re-rank in Python so starts-with comes first
     stmt = stmt.limit(30)
     result = await session.execute(stmt)
-    locations = result.scalars().all()
+    rows = result.all()
 
     q_lower = q.lower()
 
-    def rank(loc: Location) -> int:
-        return 0 if loc.area_name.lower().startswith(q_lower) else 1
+    def rank(row) -> int:
+        return 0 if row.area_name.lower().startswith(q_lower) else 1
 
-    ranked = sorted(locations, key=rank)[:10]
+    ranked = sorted(rows, key=rank)[:10]
 
-    return [
+    return json_response([
         {
-            "id": loc.id,
-            "city": loc.city,
-            "area_name": loc.area_name,
-            "lat": loc.lat,
-            "lng": loc.lng,
+            "id": row.id,
+            "city": row.city,
+            "area_name": row.area_name,
+            "lat": row.lat,
+            "lng": row.lng,
         }
-        for loc in ranked
-    ]
+        for row in ranked
+    ])
+
+
+@router.post("/resolve", response_model=List[LocationResolution])
+async def resolve_locations(
+    request: LocationResolveRequest,
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Resolve many location names at once, in request order.
+
+    Each name resolves like join_event resolves `location_name` (exact area
+    name, or "Area, City" as the combobox displays it), to the canonical
+    location with its id and coordinates; the id can be sent back as
+    `location_id` when joining. Served from the location snapshot without
+    a query when one is attached, else with a single query.
+    """
+    resolved = await resolve_names(session, request.names)
+    return json_response([{"name": name, "location": resolved.get(name)} for name in request.names])
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 
 
 class EventCreate(BaseModel):
@@ -37,8 +37,14 @@ class ParticipantBasic(BaseModel):
         from_attributes = True
 
 
+class ParticipantSummary(BaseModel):
+    """Participant counts of the whole event, whichever page is returned."""
+    joined: int
+    declined: int
+
+
 class EventDetailResponse(BaseModel):
-    """Extended event response with participants."""
+    """Extended event response with participants (all of them, or one page)."""
     id: UUID
     slug: str
     title: str
@@ -47,6 +53,8 @@ class EventDetailResponse(BaseModel):
     status: str
     created_at: datetime
     participants: List[ParticipantBasic] = []
+    summary: ParticipantSummary
+    next_cursor: Optional[UUID] = None  # id to pass as ?cursor= for the next page
     
     class Config:
         from_attributes = True
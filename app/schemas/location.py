@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class LocationResult(BaseModel):
+    """Schema for a location search result."""
+    id: int
+    city: str
+    area_name: str
+    lat: float
+    lng: float
+
+    class Config:
+        from_attributes = True
+
+
+class LocationResolveRequest(BaseModel):
+    """Schema for resolving several location names in one call."""
+    names: List[str] = Field(..., min_length=1, max_length=100)
+
+
+class LocationResolution(BaseModel):
+    """A requested name and the location it resolves to (None if unknown)."""
+    name: str
+    location: Optional[LocationResult] = None
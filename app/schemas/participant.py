@@ -1,7 +1,14 @@
-from datetime import datetime
+from datetime import datetime, time
 from uuid import UUID
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Literal, Optional
+
+# Single days, or a shorthand for several
+RecurrenceDay = Literal["mon", "tue", "wed", "thu", "fri", "sat", "sun", "weekdays", "weekends", "daily"]
+
+# Bit of each day in AvailabilityPattern.weekdays (Monday = bit 0, as datetime.weekday())
+WEEKDAY_BITS = {day: 1 << i for i, day in enumerate(("mon", "tue", "wed", "thu", "fri", "sat", "sun"))}
+WEEKDAY_BITS.update(weekdays=0b0011111, weekends=0b1100000, daily=0b1111111)
 
 
 class AvailabilityInput(BaseModel):
@@ -10,12 +17,66 @@ class AvailabilityInput(BaseModel):
     end_time: datetime
 
 
+class RecurrenceInput(BaseModel):
+    """
+    Schema for a weekly recurring slot, e.g. weekdays 18:00-22:00. It is
+    stored as one pattern and only expanded over the event window.
+    Times are wall-clock times in the event's frame, like the naive slot
+    datetimes; a UTC offset is rejected rather than silently dropped.
+    """
+    days: List[RecurrenceDay] = Field(..., min_length=1)
+    start_time: time
+    end_time: time
+    # Days after the start day on which the slot ends (multi-day slots).
+    # Defaults to 0, or 1 when end_time is not after start_time (overnight).
+    end_day_offset: Optional[int] = Field(None, ge=0, le=6)
+
+    @field_validator("start_time", "end_time")
+    @classmethod
+    def _check_naive(cls, value: time) -> time:
+        if value.tzinfo is not None:
+            raise ValueError("recurrence times take no UTC offset; give the local time, e.g. 18:00")
+        return value
+
+    @property
+    def weekdays(self) -> int:
+        mask = 0
+        for day in self.days:
+            mask |= WEEKDAY_BITS[day]
+        return mask
+
+    @property
+    def duration_minutes(self) -> int:
+        offset = self.end_day_offset
+        if offset is None:
+            offset = 0 if self.end_time > self.start_time else 1
+        start = self.start_time.hour * 60 + self.start_time.minute
+        end = self.end_time.hour * 60 + self.end_time.minute
+        return offset * 24 * 60 + end - start
+
+    @model_validator(mode="after")
+    def _check_duration(self) -> "RecurrenceInput":
+        if self.duration_minutes <= 0:
+            raise ValueError("end_time must be after start_time (set end_day_offset for slots ending on a later day)")
+        return self
+
+
 class ParticipantCreate(BaseModel):
     """Schema for adding a participant to an event."""
     name: str = Field(..., min_length=1, max_length=100)
     location_name: str = Field(..., min_length=1, max_length=200)
+    # Location.id chosen in the combobox (or from /locations/resolve): used
+    # instead of resolving location_name when it is known
+    location_id: Optional[int] = None
     is_host: bool = False
-    availabilities: List[AvailabilityInput] = Field(..., min_items=1)
+    availabilities: List[AvailabilityInput] = []
+    recurrences: List[RecurrenceInput] = []
+
+    @model_validator(mode="after")
+    def _check_slots(self) -> "ParticipantCreate":
+        if not self.availabilities and not self.recurrences:
+            raise ValueError("at least one availability or recurrence is required")
+        return self
 
 
 class DeclineCreate(BaseModel):
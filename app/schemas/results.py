@@ -1,6 +1,10 @@
 from datetime import datetime
+from uuid import UUID
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
+
+# Objective for ranking meeting areas (see rank_meeting_areas)
+MeetingObjective = Literal["total", "max", "blend"]
 
 
 class SuggestedTime(BaseModel):
@@ -17,6 +21,26 @@ class SuggestedLocation(BaseModel):
     neighborhood: str
 
 
+class MeetingArea(BaseModel):
+    """Schema for a seeded area ranked as a meeting point."""
+    id: int
+    city: str
+    area_name: str
+    lat: float
+    lng: float
+    total_km: float  # summed over active participants
+    max_km: float  # farthest participant
+
+
+class MeetingCluster(BaseModel):
+    """Schema for one meeting point of a geographically split group."""
+    lat: float
+    lng: float
+    neighborhood: str
+    participant_ids: List[UUID]
+    total_km: float  # members' summed travel to this point
+
+
 class VenueRecommendation(BaseModel):
     """Schema for venue recommendation."""
     name: str
@@ -35,3 +59,5 @@ class ResultsResponse(BaseModel):
     suggested_location: Optional[SuggestedLocation]
     venue_recommendations: List[VenueRecommendation]
     total_participants: int
+    meeting_areas: List[MeetingArea] = []
+    meeting_clusters: List[MeetingCluster] = []  # empty unless splitting the group pays off
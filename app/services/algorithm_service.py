@@ -1,8 +1,87 @@
-from datetime import datetime
-from typing import List, Dict, Optional
+from array import array
+from bisect import bisect_left
+from datetime import datetime, time, timedelta
+from typing import Hashable, Iterable, Iterator, List, Dict, Optional, Sequence, Tuple
 from app.models.participant import Participant
 from app.models.availability import Availability
+from app.models.availability_pattern import AvailabilityPattern
+import itertools
 import math
+import operator
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Share of the mean distance in the "blend" objective; the rest is the max
+BLEND_WEIGHT = 0.5
+
+
+def _distances_to(lats: List[float], lngs: List[float], center: Tuple[float, float]) -> List[float]:
+    """Planar distances from every point to `center`, one pass over C builtins."""
+    n = len(lats)
+    return list(map(
+        math.hypot,
+        map(operator.sub, lats, [center[0]] * n),
+        map(operator.sub, lngs, [center[1]] * n),
+    ))
+
+
+def weiszfeld(
+    points: Sequence[Tuple[float, float]],
+    weights: Optional[Sequence[float]] = None,
+    start: Optional[Tuple[float, float]] = None,
+    max_iterations: int = 300,
+    tolerance: float = 1e-7,
+) -> Tuple[float, float]:
+    """
+    Weighted 1-median of (lat, lng) points with the Weiszfeld algorithm.
+
+    Warm-starts from `start` when given (k-medians passes the previous
+    centre, so a few iterations per update are enough), else from the
+    weighted mean. Stops once a step moves less than `tolerance` degrees
+    (default ~1 cm).
+    """
+    if weights is None:
+        weights = [1.0] * len(points)
+    if len(points) == 1:
+        return points[0]
+
+    if start is None:
+        total = sum(weights)
+        est_lat = sum(w * lat for (lat, _), w in zip(points, weights)) / total
+        est_lng = sum(w * lng for (_, lng), w in zip(points, weights)) / total
+    else:
+        est_lat, est_lng = start
+
+    EPSILON = 1e-7  # points this close to the estimate get no weight
+
+    lats = [lat for lat, _ in points]
+    lngs = [lng for _, lng in points]
+    for _ in range(max_iterations):
+        # Whole-vector steps (map over C builtins) instead of a per-point loop
+        dists = _distances_to(lats, lngs, (est_lat, est_lng))
+        if min(dists) < EPSILON:
+            # Current estimate coincides with a point — give it no weight to avoid /0
+            w = [weight / dist if dist >= EPSILON else 0.0 for weight, dist in zip(weights, dists)]
+        else:
+            w = list(map(operator.truediv, weights, dists))
+        total_w = sum(w)
+        w_lat = sum(map(operator.mul, w, lats))
+        w_lng = sum(map(operator.mul, w, lngs))
+
+        if total_w == 0:
+            # All points coincide with the estimate — we're done
+            break
+
+        new_lat = w_lat / total_w
+        new_lng = w_lng / total_w
+
+        if math.sqrt((new_lat - est_lat) ** 2 + (new_lng - est_lng) ** 2) < tolerance:
+            est_lat, est_lng = new_lat, new_lng
+            break
+
+        est_lat, est_lng = new_lat, new_lng
+
+    return est_lat, est_lng
 
 
 def calculate_geometric_median(participants: List[Participant]) -> Optional[Dict[str, float]]:
@@ -28,135 +107,398 @@ def calculate_geometric_median(participants: List[Participant]) -> Optional[Dict
     if not coords:
         return None
 
-    if len(coords) == 1:
-        return {"lat": coords[0][0], "lng": coords[0][1]}
+    lat, lng = weiszfeld(coords)
+    return {"lat": lat, "lng": lng}
 
-    # Initialise with arithmetic mean
-    est_lat = sum(lat for lat, _ in coords) / len(coords)
-    est_lng = sum(lng for _, lng in coords) / len(coords)
 
-    MAX_ITERATIONS = 300
-    EPSILON = 1e-7  # ~1 cm precision at city scale
+# Keep the old name as an alias so callers can be updated gradually
+calculate_centroid = calculate_geometric_median
 
-    for _ in range(MAX_ITERATIONS):
-        weights, w_lat, w_lng = 0.0, 0.0, 0.0
 
-        for lat, lng in coords:
-            dist = math.sqrt((est_lat - lat) ** 2 + (est_lng - lng) ** 2)
-            if dist < EPSILON:
-                # Current estimate coincides with this point — skip to avoid /0
-                continue
-            w = 1.0 / dist
-            weights += w
-            w_lat += w * lat
-            w_lng += w * lng
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
 
-        if weights == 0:
-            # All points coincide with the estimate — we're done
-            break
 
-        new_lat = w_lat / weights
-        new_lng = w_lng / weights
+def distance_columns(
+    candidates: Sequence[Tuple[float, float]],
+    points: Sequence[Tuple[float, float]],
+) -> List[array]:
+    """
+    Haversine matrix stored by column: `columns[k][c]` is the distance from
+    candidate c to point k. A participant at point k adds a whole column to
+    the candidate scores at once.
+    """
+    return [
+        array("d", (haversine_km(c_lat, c_lng, p_lat, p_lng) for c_lat, c_lng in candidates))
+        for p_lat, p_lng in points
+    ]
 
-        if math.sqrt((new_lat - est_lat) ** 2 + (new_lng - est_lng) ** 2) < EPSILON:
-            est_lat, est_lng = new_lat, new_lng
+
+def rank_meeting_areas(
+    columns: Sequence[Sequence[float]],
+    counts: Dict[int, int],
+    objective: str = "total",
+    limit: int = 5,
+) -> List[Tuple[int, float, float]]:
+    """
+    Rank candidate meeting areas for participants at the given points.
+
+    Args:
+        columns: Distance columns from `distance_columns`
+        counts: Point index -> number of participants there
+        objective: "total" (sum of distances), "max" (worst-off
+            participant) or "blend" (BLEND_WEIGHT * mean + rest * max)
+        limit: Number of candidates to return
+
+    Returns:
+        (candidate index, total km, max km) for the best candidates, best first
+    """
+    if not columns or not counts:
+        return []
+    size = len(columns[0])
+    totals = [0.0] * size
+    maxima = [0.0] * size
+    for point, count in counts.items():
+        # Whole-column operations: map over C builtins, no per-candidate bytecode
+        column = columns[point]
+        weighted = column if count == 1 else list(map(operator.mul, column, [count] * size))
+        totals = list(map(operator.add, totals, weighted))
+        maxima = list(map(max, maxima, column))
+
+    if objective == "max":
+        # Ties on the worst distance go to the lower total
+        scores = list(zip(maxima, totals))
+    elif objective == "blend":
+        people = sum(counts.values())
+        scores = [BLEND_WEIGHT * total / people + (1 - BLEND_WEIGHT) * worst for total, worst in zip(totals, maxima)]
+    else:
+        scores = totals
+    best = sorted(range(size), key=scores.__getitem__)[:limit]
+    return [(c, totals[c], maxima[c]) for c in best]
+
+
+# Split detection: try up to SPLIT_MAX_CLUSTERS meeting points and keep a
+# split only if it cuts total travel by SPLIT_MIN_GAIN versus the best
+# smaller split, with at least SPLIT_MIN_MEMBERS people per point.
+SPLIT_MAX_CLUSTERS = 3
+SPLIT_MIN_GAIN = 0.5
+SPLIT_MIN_MEMBERS = 2
+# Weiszfeld convergence for split detection: ~1 m is plenty to compare
+# travel totals, and near a data point 1 cm can take hundreds of steps
+SPLIT_TOLERANCE = 1e-5
+
+
+def k_medians(
+    points: Sequence[Tuple[float, float]],
+    weights: Sequence[float],
+    k: int,
+    max_iterations: int = 20,
+    update_iterations: int = 10,
+    start: Optional[Sequence[Tuple[float, float]]] = None,
+) -> Tuple[List[Tuple[float, float]], List[int]]:
+    """
+    Weighted k-medians (Lloyd iterations with a Weiszfeld update per cluster).
+
+    Starts from the `start` centres if given (a previous solve for a
+    similar group), else seeds with farthest-first traversal from the
+    weighted mean, which is deterministic and puts one centre in each
+    well-separated group. Each
+    update runs `update_iterations` Weiszfeld steps warm-started from the
+    cluster's previous centre, and the centres are solved exactly only
+    once the assignment is stable.
+
+    Returns:
+        (centres, assignment) where assignment[i] is the cluster of points[i]
+    """
+    lats = [lat for lat, _ in points]
+    lngs = [lng for _, lng in points]
+    if start is not None:
+        centers = list(start)
+    else:
+        total = sum(weights)
+        mean = (
+            sum(map(operator.mul, weights, lats)) / total,
+            sum(map(operator.mul, weights, lngs)) / total,
+        )
+        nearest = _distances_to(lats, lngs, mean)
+        centers = []
+        for _ in range(k):
+            far = max(range(len(points)), key=nearest.__getitem__)
+            centers.append(points[far])
+            nearest = list(map(min, nearest, _distances_to(lats, lngs, points[far])))
+
+    assignment: List[int] = []
+    for _ in range(max_iterations):
+        columns = [_distances_to(lats, lngs, center) for center in centers]
+        new_assignment = [row.index(min(row)) for row in zip(*columns)]
+        if new_assignment == assignment:
             break
+        assignment = new_assignment
+        for c in range(k):
+            members = [i for i, a in enumerate(assignment) if a == c]
+            if members:
+                centers[c] = weiszfeld(
+                    [points[i] for i in members],
+                    [weights[i] for i in members],
+                    start=centers[c],
+                    max_iterations=update_iterations,
+                    tolerance=SPLIT_TOLERANCE,
+                )
+    # Assignment is stable: polish each centre to a converged median
+    for c in range(k):
+        members = [i for i, a in enumerate(assignment) if a == c]
+        if members:
+            centers[c] = weiszfeld(
+                [points[i] for i in members], [weights[i] for i in members], start=centers[c], tolerance=SPLIT_TOLERANCE
+            )
+    return centers, assignment
 
-        est_lat, est_lng = new_lat, new_lng
 
-    return {"lat": est_lat, "lng": est_lng}
+def _travel_km(
+    points: Sequence[Tuple[float, float]],
+    weights: Sequence[float],
+    centers: Sequence[Tuple[float, float]],
+    assignment: Sequence[int],
+) -> float:
+    return sum(
+        w * haversine_km(lat, lng, *centers[a]) for (lat, lng), w, a in zip(points, weights, assignment)
+    )
 
 
-# Keep the old name as an alias so callers can be updated gradually
-calculate_centroid = calculate_geometric_median
+def split_meeting_points(
+    participants: List[Participant],
+    max_clusters: int = SPLIT_MAX_CLUSTERS,
+    warm_start: Optional[Dict[int, List[Tuple[float, float]]]] = None,
+    solved: Optional[Dict[int, List[Tuple[float, float]]]] = None,
+) -> List[Dict]:
+    """
+    Detect a geographically split group and give each part its own meeting point.
+
+    Participants sharing coordinates are solved as one weighted point, so
+    the cost depends on distinct locations, not head count. `solved`, if
+    given, receives the centres found for each k (1 = single median);
+    passing those back as `warm_start` for a slightly different group (a
+    what-if) skips the cold seeding and converges in a few steps.
+
+    Returns:
+        [] when one meeting point is as good (within SPLIT_MIN_GAIN), else
+        one dict per cluster with 'lat', 'lng', 'members' (participants)
+        and 'total_km' (members' summed travel), largest cluster first
+    """
+    groups: Dict[Tuple[float, float], List[Participant]] = {}
+    for p in participants:
+        if p.lat is not None and p.lng is not None:
+            groups.setdefault((p.lat, p.lng), []).append(p)
+    points = list(groups)
+    weights = [float(len(groups[point])) for point in points]
+    if len(points) < 2:
+        return []
+
+    warm_start = warm_start or {}
+    if solved is None:
+        solved = {}
+    single = weiszfeld(points, weights, start=warm_start.get(1, [None])[0], tolerance=SPLIT_TOLERANCE)
+    solved[1] = [single]
+    best_cost = _travel_km(points, weights, [single], [0] * len(points))
+    best = None
+    for k in range(2, min(max_clusters, len(points)) + 1):
+        centers, assignment = k_medians(points, weights, k, start=warm_start.get(k))
+        solved[k] = centers
+        sizes = [0.0] * k
+        for a, w in zip(assignment, weights):
+            sizes[a] += w
+        if min(sizes) < SPLIT_MIN_MEMBERS:
+            continue
+        cost = _travel_km(points, weights, centers, assignment)
+        if cost <= best_cost * (1 - SPLIT_MIN_GAIN):
+            best, best_cost = (centers, assignment), cost
+
+    if best is None:
+        return []
+    centers, assignment = best
+    clusters = [
+        {"lat": lat, "lng": lng, "members": [], "total_km": 0.0}
+        for lat, lng in centers
+    ]
+    for point, a in zip(points, assignment):
+        cluster = clusters[a]
+        cluster["members"].extend(groups[point])
+        cluster["total_km"] += len(groups[point]) * haversine_km(*point, cluster["lat"], cluster["lng"])
+    return sorted(clusters, key=lambda cluster: -len(cluster["members"]))
+
+
+def expand_pattern(
+    weekdays: int,
+    start_time: time,
+    duration_minutes: int,
+    window_start: datetime,
+    window_end: datetime,
+) -> Iterator[Tuple[datetime, datetime]]:
+    """
+    Occurrences of a weekly pattern that intersect the window, clipped to
+    it, in start order. Generated one at a time: only days of the window
+    (plus the pattern's duration before it) are visited.
+    """
+    duration = timedelta(minutes=duration_minutes)
+    # An occurrence starting up to `duration` before the window still reaches into it
+    day = (window_start - duration).date()
+    while day <= window_end.date():
+        if weekdays >> day.weekday() & 1:
+            start = datetime.combine(day, start_time)
+            end = start + duration
+            if start < window_end and end > window_start:
+                yield max(start, window_start), min(end, window_end)
+        day += timedelta(days=1)
+
+
+def participant_slots(
+    slots: Iterable[Tuple[datetime, datetime]],
+    patterns: Iterable[Tuple[int, time, int]],
+    window_start: datetime,
+    window_end: datetime,
+) -> Iterator[Tuple[datetime, datetime]]:
+    """
+    One participant's explicit slots followed by the occurrences of their
+    (weekdays, start_time, duration_minutes) patterns, unordered:
+    OverlapSweep sorts each participant's slots as it merges them.
+    """
+    return itertools.chain(
+        slots,
+        *(expand_pattern(*pattern, window_start, window_end) for pattern in patterns),
+    )
+
+
+class OverlapSweep:
+    """
+    Availability of a group as a participant-count histogram over the
+    elementary time segments between consecutive slot boundaries.
+
+    Each participant's slots are merged first, so overlapping slots of one
+    person count once; slots may be any iterable, e.g. a lazy
+    `participant_slots` stream. The histogram is built with one sort and a prefix
+    sum; a what-if (some participants excluded, some required) only
+    touches the segments those participants cover.
+    """
+
+    def __init__(self, slots: Dict[Hashable, Iterable[Tuple[datetime, datetime]]]) -> None:
+        merged: Dict[Hashable, List[Tuple[datetime, datetime]]] = {}
+        for key, intervals in slots.items():
+            runs: List[List[datetime]] = []
+            for start, end in sorted(intervals):
+                if end <= start:
+                    continue
+                if runs and start <= runs[-1][1]:
+                    runs[-1][1] = max(runs[-1][1], end)
+                else:
+                    runs.append([start, end])
+            if runs:
+                merged[key] = [(start, end) for start, end in runs]
+
+        self.times: List[datetime] = sorted({t for runs in merged.values() for run in runs for t in run})
+        # Participant -> covered segment index ranges [i, j)
+        self.ranges: Dict[Hashable, List[Tuple[int, int]]] = {
+            key: [(bisect_left(self.times, start), bisect_left(self.times, end)) for start, end in runs]
+            for key, runs in merged.items()
+        }
+        self.counts: List[int] = self._coverage(self.ranges)
+
+    def _coverage(self, keys: Iterable[Hashable]) -> List[int]:
+        """Per-segment count of the given participants (difference array + prefix sum)."""
+        diff = [0] * len(self.times)
+        for key in keys:
+            for i, j in self.ranges.get(key, ()):
+                diff[i] += 1
+                diff[j] -= 1
+        return list(itertools.accumulate(diff))[:-1]
+
+    def best_window(self, exclude: Iterable[Hashable] = (), require: Iterable[Hashable] = ()) -> Optional[Dict]:
+        """
+        The longest run of segments with the highest count (earliest on a
+        tie), ignoring `exclude` and only where everyone in `require` is
+        available. None if there is no such time.
+        """
+        counts = self.counts
+        exclude = [key for key in exclude if key in self.ranges]
+        if exclude:
+            counts = list(map(operator.sub, counts, self._coverage(exclude)))
+        valid: Iterable[bool] = itertools.repeat(True)
+        require = set(require)
+        if require:
+            if not require <= self.ranges.keys():
+                return None
+            valid = [c == len(require) for c in self._coverage(require)]
 
+        candidates = list(itertools.compress(range(len(counts)), valid))
+        top = max((counts[k] for k in candidates), default=0)
+        if top == 0:
+            return None
 
-def find_overlap(availabilities: List[Availability]) -> Optional[Dict]:
+        # Maximal runs of adjacent top-count segments, as [first, end)
+        runs: List[List[int]] = []
+        for k in candidates:
+            if counts[k] != top:
+                continue
+            if runs and runs[-1][1] == k:
+                runs[-1][1] = k + 1
+            else:
+                runs.append([k, k + 1])
+        first, end = max(runs, key=lambda run: self.times[run[1]] - self.times[run[0]])
+        return {"start": self.times[first], "end": self.times[end], "count": top}
+
+
+def find_overlap(
+    availabilities: List[Availability],
+    patterns: Sequence[AvailabilityPattern] = (),
+    window: Optional[Tuple[datetime, datetime]] = None,
+) -> Optional[Dict]:
     """
     Find the time window where the maximum number of participants overlap.
-    
-    Algorithm:
-    1. Create a list of all time points (start and end times)
-    2. Sort them chronologically
-    3. Track how many people are available at each interval
-    4. Return the longest interval with the highest participant count
-    
+
+    Builds an OverlapSweep over the slots grouped by participant and
+    returns its longest highest-count window (earliest on a tie).
+
     Args:
         availabilities: List of availability time slots
-        
+        patterns: Recurring availability, expanded lazily over `window`
+        window: (start, end) of the event; required with patterns
+
     Returns:
         Dictionary with 'start', 'end' (datetime), and 'count' (int) of participants,
         or None if no availabilities exist
     """
-    if not availabilities:
+    if not availabilities and not patterns:
         return None
-    
-    # Create events for each time point (start = +1 person, end = -1 person)
-    events = []
+    if patterns and window is None:
+        raise ValueError("patterns need the event window to be expanded over")
+
+    slots: Dict[Hashable, List[Tuple[datetime, datetime]]] = {}
     for avail in availabilities:
-        events.append((avail.start_time, 1))  # Person becomes available
-        events.append((avail.end_time, -1))   # Person becomes unavailable
-    
-    # Sort events by time
-    events.sort(key=lambda x: x[0])
-    
-    # Track overlaps
-    current_count = 0
-    max_count = 0
-    best_start = None
-    best_end = None
-    interval_start = None
-    
-    for i, (time, delta) in enumerate(events):
-        # Update count
-        prev_count = current_count
-        current_count += delta
-        
-        # If we're entering a new interval with people
-        if prev_count == 0 and current_count > 0:
-            interval_start = time
-        
-        # If we're leaving an interval
-        if prev_count > 0 and current_count == 0:
-            if prev_count > max_count or (prev_count == max_count and interval_start and best_start and (time - interval_start) > (best_end - best_start)):
-                max_count = prev_count
-                best_start = interval_start
-                best_end = time
-        
-        # If count increased to a new maximum within an interval
-        if current_count > max_count and i + 1 < len(events):
-            max_count = current_count
-            best_start = time
-            # Find when this interval ends (when count drops below max)
-            for j in range(i + 1, len(events)):
-                future_time, future_delta = events[j]
-                temp_count = current_count
-                for k in range(i + 1, j + 1):
-                    temp_count += events[k][1]
-                if temp_count < max_count:
-                    best_end = events[j][0]
-                    break
-            else:
-                best_end = events[-1][0]
-    
-    # Handle case where we're still in an interval at the end
-    if current_count > 0 and not best_end:
-        if current_count >= max_count:
-            max_count = current_count
-            best_start = interval_start
-            best_end = events[-1][0]
-    
-    if best_start is None or best_end is None or max_count == 0:
-        # Fallback: return the first availability slot
+        slots.setdefault(avail.participant_id, []).append((avail.start_time, avail.end_time))
+    if patterns:
+        recurring: Dict[Hashable, List[Tuple[int, time, int]]] = {}
+        for pattern in patterns:
+            recurring.setdefault(pattern.participant_id, []).append(
+                (pattern.weekdays, pattern.start_time, pattern.duration_minutes)
+            )
+        slots = {
+            key: participant_slots(slots.get(key, ()), recurring.get(key, ()), *window)
+            for key in slots.keys() | recurring.keys()
+        }
+    best = OverlapSweep(slots).best_window()
+
+    if best is None:
+        if not availabilities:
+            return None
+        # Fallback (only zero-length slots): return the first availability slot
         first = availabilities[0]
         return {
             "start": first.start_time,
             "end": first.end_time,
             "count": 1
         }
-    
-    return {
-        "start": best_start,
-        "end": best_end,
-        "count": max_count
-    }
+    return best
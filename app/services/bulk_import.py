@@ -0,0 +1,266 @@
+"""
+Streaming bulk participant import (NDJSON or CSV).
+
+The request body is consumed chunk by chunk and split into rows; each row is
+validated as it arrives and valid rows are buffered into batches. A batch
+resolves all of its location ids and names (at most one query each, none
+with a location snapshot) and inserts participants, availabilities and
+patterns in one transaction. Memory is bounded by the batch size, not the
+upload size.
+
+CSV columns: name, location_name, is_host and location_id (optional), and either
+start_time + end_time (one slot) or availabilities as ISO 8601 intervals
+separated by ";" (e.g. "2026-01-17T19:00/2026-01-17T21:00;...").
+Recurring slots ("recurrences", as in ParticipantCreate) are NDJSON only.
+"""
+import csv
+import json
+from typing import AsyncIterator, Optional
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+from app.models.availability import Availability
+from app.models.availability_pattern import AvailabilityPattern
+from app.models.participant import Participant
+from app.schemas.participant import ParticipantCreate
+from app.services.location_resolver import locations_by_id, resolve_names
+
+# Same fallback as join_event: Bengaluru centre
+DEFAULT_LAT, DEFAULT_LNG = 12.9716, 77.5946
+
+MAX_LINE_BYTES = 64 * 1024
+
+
+class BulkImportError(Exception):
+    """Raised for problems with the upload as a whole (not a single row)."""
+
+
+class UploadStatusResponse(StreamingResponse):
+    """
+    StreamingResponse that streams while the request body is still being read.
+
+    The stock class listens for client disconnects on `receive`, which would
+    swallow the upload's body chunks; here the body reader owns `receive`.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without buffering the whole body."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8")
+        if len(buffer) > MAX_LINE_BYTES:
+            raise BulkImportError(f"Line exceeds {MAX_LINE_BYTES} bytes")
+    if buffer.strip():
+        yield buffer.rstrip(b"\r").decode("utf-8")
+
+
+def _csv_header(line: str) -> list[str]:
+    header = [h.strip().lower() for h in next(csv.reader([line]))]
+    if "name" not in header or "location_name" not in header:
+        raise BulkImportError("CSV header must include name and location_name")
+    return header
+
+
+async def check_csv_header(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Read up to the CSV header and validate it before any row is imported.
+
+    Returns the same byte stream, header included, for `import_participants`;
+    raises BulkImportError for a missing or wrong header.
+    """
+    iterator = chunks.__aiter__()
+    buffer = b""
+    while b"\n" not in buffer.lstrip():
+        try:
+            buffer += await iterator.__anext__()
+        except StopAsyncIteration:
+            break
+        if len(buffer) > MAX_LINE_BYTES:
+            raise BulkImportError(f"Line exceeds {MAX_LINE_BYTES} bytes")
+    line = buffer.lstrip().split(b"\n", 1)[0].rstrip(b"\r")
+    if not line:
+        raise BulkImportError("CSV upload is empty; expected a header line")
+    try:
+        _csv_header(line.decode("utf-8"))
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise BulkImportError(f"Unreadable CSV header: {exc}") from exc
+
+    async def replay() -> AsyncIterator[bytes]:
+        yield buffer
+        async for chunk in iterator:
+            yield chunk
+
+    return replay()
+
+
+def _format_errors(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}"
+        for err in exc.errors()
+    )
+
+
+def _csv_row_to_dict(header: list[str], values: list[str]) -> dict:
+    row = {key.strip(): value.strip() for key, value in zip(header, values)}
+    data: dict = {
+        "name": row.get("name", ""),
+        "location_name": row.get("location_name", ""),
+        "is_host": row.get("is_host", "").lower() in ("1", "true", "yes", "y"),
+    }
+    if row.get("location_id"):
+        data["location_id"] = row["location_id"]
+    if row.get("availabilities"):
+        data["availabilities"] = [
+            dict(zip(("start_time", "end_time"), interval.split("/", 1)))
+            for interval in row["availabilities"].split(";")
+            if interval.strip()
+        ]
+    elif row.get("start_time") or row.get("end_time"):
+        data["availabilities"] = [{"start_time": row.get("start_time"), "end_time": row.get("end_time")}]
+    return data
+
+
+async def iter_rows(lines: AsyncIterator[str], fmt: str) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (row_number, raw_dict, parse_error) for every non-blank data row."""
+    header: Optional[list[str]] = None
+    row_number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        if fmt == "csv":
+            if header is None:
+                header = _csv_header(line)
+                continue
+            row_number += 1
+            yield row_number, _csv_row_to_dict(header, next(csv.reader([line]))), None
+        else:
+            row_number += 1
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield row_number, None, f"invalid JSON: {exc.msg}"
+                continue
+            if not isinstance(data, dict):
+                yield row_number, None, "row must be a JSON object"
+                continue
+            yield row_number, data, None
+
+
+async def _insert_batch(
+    session: AsyncSession,
+    event_id: UUID,
+    batch: list[tuple[int, ParticipantCreate]],
+) -> list[dict]:
+    by_id = await locations_by_id(session, {p.location_id for _, p in batch if p.location_id is not None})
+    by_name = await resolve_names(session, {p.location_name for _, p in batch if p.location_id not in by_id})
+
+    participants, availabilities, patterns, statuses = [], [], [], []
+    for row_number, data in batch:
+        participant_id = uuid4()
+        loc = by_id.get(data.location_id) or by_name.get(data.location_name)
+        lat, lng = (loc["lat"], loc["lng"]) if loc else (DEFAULT_LAT, DEFAULT_LNG)
+        participants.append({
+            "id": participant_id,
+            "event_id": event_id,
+            "name": data.name,
+            "location_name": data.location_name,
+            "is_host": data.is_host,
+            "declined": False,
+            "lat": lat,
+            "lng": lng,
+        })
+        for slot in data.availabilities:
+            # Convert timezone-aware datetimes to naive UTC for database
+            availabilities.append({
+                "id": uuid4(),
+                "participant_id": participant_id,
+                "start_time": slot.start_time.replace(tzinfo=None) if slot.start_time.tzinfo else slot.start_time,
+                "end_time": slot.end_time.replace(tzinfo=None) if slot.end_time.tzinfo else slot.end_time,
+            })
+        for recurrence in data.recurrences:
+            patterns.append({
+                "id": uuid4(),
+                "participant_id": participant_id,
+                "weekdays": recurrence.weekdays,
+                "start_time": recurrence.start_time,
+                "duration_minutes": recurrence.duration_minutes,
+            })
+        statuses.append({"row": row_number, "status": "ok", "participant_id": str(participant_id)})
+
+    await session.execute(insert(Participant), participants)
+    if availabilities:
+        await session.execute(insert(Availability), availabilities)
+    if patterns:
+        await session.execute(insert(AvailabilityPattern), patterns)
+    await session.commit()
+    return statuses
+
+
+async def import_participants(
+    session: AsyncSession,
+    event_id: UUID,
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+) -> AsyncIterator[dict]:
+    """
+    Import participants from a streamed upload, yielding one status dict per row
+    and a final summary. Rows that fail validation are reported and skipped;
+    batches that fail to insert are reported row by row.
+    """
+    imported = failed = 0
+    batch: list[tuple[int, ParticipantCreate]] = []
+
+    async def flush() -> AsyncIterator[dict]:
+        nonlocal imported, failed
+        try:
+            statuses = await _insert_batch(session, event_id, batch)
+        except Exception as exc:
+            await session.rollback()
+            failed += len(batch)
+            for row_number, _ in batch:
+                yield {"row": row_number, "status": "error", "error": f"batch insert failed: {type(exc).__name__}"}
+        else:
+            imported += len(statuses)
+            for status in statuses:
+                yield status
+        batch.clear()
+
+    try:
+        async for row_number, raw, error in iter_rows(iter_lines(chunks), fmt):
+            if row_number > settings.BULK_IMPORT_MAX_ROWS:
+                yield {"error": f"Upload exceeds {settings.BULK_IMPORT_MAX_ROWS} rows; remaining rows ignored"}
+                break
+            if error is None:
+                try:
+                    batch.append((row_number, ParticipantCreate.model_validate(raw)))
+                except ValidationError as exc:
+                    error = _format_errors(exc)
+            if error is not None:
+                failed += 1
+                yield {"row": row_number, "status": "error", "error": error}
+            if len(batch) >= settings.BULK_IMPORT_BATCH_SIZE:
+                async for status in flush():
+                    yield status
+    except (BulkImportError, UnicodeDecodeError, csv.Error) as exc:
+        yield {"error": str(exc)}
+
+    if batch:
+        async for status in flush():
+            yield status
+
+    yield {"summary": {"imported": imported, "failed": failed}}
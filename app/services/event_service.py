@@ -0,0 +1,425 @@
+"""
+Read-side event logic shared by the HTTP handlers and the live results stream.
+"""
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Collection, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.metrics import span
+from app.core.responses import trusted_adapter
+from app.models.event import Event
+from app.models.participant import Participant
+from app.models.availability import Availability
+from app.models.availability_pattern import AvailabilityPattern
+from app.schemas.results import (
+    MeetingCluster, ResultsResponse, SuggestedTime, SuggestedLocation, VenueRecommendation,
+)
+from app.services.algorithm_service import (
+    OverlapSweep,
+    calculate_centroid,
+    participant_slots,
+    split_meeting_points,
+    weiszfeld,
+)
+from app.services.meeting_areas import rank_areas
+
+
+async def get_event_by_slug(session: AsyncSession, slug: str) -> Optional[Event]:
+    """Look up an event by its shareable slug."""
+    result = await session.execute(
+        select(Event).where(Event.slug == slug)
+    )
+    return result.scalar_one_or_none()
+
+
+# Columns of ParticipantBasic, read as plain tuples (no ORM identity map)
+PARTICIPANT_BASIC_COLUMNS = (
+    Participant.id,
+    Participant.name,
+    Participant.location_name,
+    Participant.is_host,
+    Participant.declined,
+)
+
+
+def _event_fields(event: Event) -> dict:
+    return {
+        "id": event.id,
+        "slug": event.slug,
+        "title": event.title,
+        "window_start": event.window_start,
+        "window_end": event.window_end,
+        "status": event.status,
+        "created_at": event.created_at,
+    }
+
+
+def _participant_dict(row: tuple) -> dict:
+    return {
+        "id": row[0],
+        "name": row[1],
+        "location_name": row[2],
+        "is_host": row[3],
+        "declined": row[4],
+    }
+
+
+def event_detail_dict(
+    event: Event,
+    participant_rows: Iterable[tuple],
+    summary: Optional[dict] = None,
+    next_cursor: Optional[UUID] = None,
+) -> dict:
+    """
+    Build a JSON-ready dict shaped like EventDetailResponse.
+
+    The values come straight from the database, so no model is built or
+    validated; `participant_rows` are tuples in PARTICIPANT_BASIC_COLUMNS order.
+    Without `summary` the rows are all of the event's and are counted here.
+    """
+    participants = [_participant_dict(row) for row in participant_rows]
+    if summary is None:
+        declined = sum(1 for p in participants if p["declined"])
+        summary = {"joined": len(participants) - declined, "declined": declined}
+    return {
+        **_event_fields(event),
+        "participants": participants,
+        "summary": summary,
+        "next_cursor": next_cursor,
+    }
+
+
+def _participants_after(event: Event, cursor: Optional[UUID], limit: Optional[int]):
+    """The event's participants in id order (keyset), after `cursor`; one extra row to detect a next page."""
+    statement = (
+        select(*PARTICIPANT_BASIC_COLUMNS)
+        .where(Participant.event_id == event.id)
+        .order_by(Participant.id)
+    )
+    if cursor is not None:
+        statement = statement.where(Participant.id > cursor)
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+    return statement
+
+
+async def participant_summary(session: AsyncSession, event: Event) -> dict:
+    """Joined and declined counts of the whole event, in one aggregate query."""
+    result = await session.execute(
+        select(Participant.declined, func.count())
+        .where(Participant.event_id == event.id)
+        .group_by(Participant.declined)
+    )
+    counts = dict(result.all())
+    return {"joined": counts.get(False, 0), "declined": counts.get(True, 0)}
+
+
+async def build_event_detail(
+    session: AsyncSession,
+    event: Event,
+    cursor: Optional[UUID] = None,
+    limit: Optional[int] = None,
+) -> dict:
+    """
+    Event details with its participants (joined and declined): all of them,
+    or with `limit` one page in id order after `cursor`, plus the cursor of
+    the next page.
+    """
+    if limit is None and cursor is None:
+        participants_result = await session.execute(
+            select(*PARTICIPANT_BASIC_COLUMNS).where(Participant.event_id == event.id)
+        )
+        return event_detail_dict(event, participants_result.all())
+
+    summary = await participant_summary(session, event)
+    rows = (await session.execute(_participants_after(event, cursor, limit))).all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1][0]
+    return event_detail_dict(event, rows, summary, next_cursor)
+
+
+async def stream_event_detail(
+    session_factory: Callable[[], AsyncSession],
+    event: Event,
+    cursor: Optional[UUID] = None,
+    limit: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    The same document as build_event_detail, serialized piece by piece.
+    Participants are read through a server-side cursor in batches of
+    EVENT_STREAM_BATCH_SIZE and written out as they arrive, so memory does
+    not grow with the event. A full stream counts the summary on the way;
+    otherwise it is queried first.
+    """
+    dump = trusted_adapter.dump_json
+    yield dump(_event_fields(event))[:-1] + b',"participants":['
+    async with session_factory() as session:
+        summary = None if limit is None and cursor is None else await participant_summary(session, event)
+        result = await session.stream(
+            _participants_after(event, cursor, limit)
+            .execution_options(yield_per=settings.EVENT_STREAM_BATCH_SIZE)
+        )
+        sent = declined = 0
+        last_id = next_cursor = None
+        async for rows in result.partitions():
+            # The extra row past `limit` only signals that a next page exists
+            more = limit is not None and sent + len(rows) > limit
+            if more:
+                rows = rows[:limit - sent]
+            if rows:
+                chunk = b",".join(dump(_participant_dict(row)) for row in rows)
+                yield chunk if not sent else b"," + chunk
+                sent += len(rows)
+                declined += sum(1 for row in rows if row[4])
+                last_id = rows[-1][0]
+            if more:
+                next_cursor = last_id
+                break
+        await result.close()
+    if summary is None:
+        summary = {"joined": sent - declined, "declined": declined}
+    yield b'],"summary":' + dump(summary) + b',"next_cursor":' + dump(next_cursor) + b"}"
+
+
+def static_venue_recommendations() -> list[VenueRecommendation]:
+    """Fallback venues used when the Places API is not configured or fails."""
+    return [
+        VenueRecommendation(
+            name="Toit Brewpub",
+            type="Brewery & Restaurant",
+            description="Popular microbrewery with craft beers and continental cuisine",
+            estimated_price="₹₹₹"
+        ),
+        VenueRecommendation(
+            name="Truffles",
+            type="Cafe & Restaurant",
+            description="Iconic burger joint known for its massive burgers and casual vibe",
+            estimated_price="₹₹"
+        ),
+        VenueRecommendation(
+            name="The Fatty Bao",
+            type="Asian Gastrobar",
+            description="Modern Asian restaurant with innovative small plates and cocktails",
+            estimated_price="₹₹₹"
+        )
+    ]
+
+
+def _closest_name(participants: list[Participant], lat: float, lng: float) -> str:
+    """Label a point with the location name of the participant closest to it."""
+    def dist(p: Participant) -> float:
+        if p.lat is None or p.lng is None:
+            return float("inf")
+        return ((p.lat - lat) ** 2 + (p.lng - lng) ** 2) ** 0.5
+
+    return min(participants, key=dist).location_name
+
+
+@dataclass
+class ResultsBase:
+    """
+    What the results pipeline derives from the database for one event:
+    active participants, their availability sweep, the geometric median,
+    the split into meeting clusters (with the centres solved per k, to
+    warm-start what-ifs) and the venues found near the median. What-if
+    results are computed from a cached base without touching the database
+    again (see results_cache).
+    """
+    event_title: str
+    participants: list[Participant]
+    sweep: OverlapSweep
+    median: Optional[tuple[float, float]]
+    meeting_clusters: list[MeetingCluster]
+    split_centers: dict
+    venue_recommendations: list[VenueRecommendation]
+
+
+def _meeting_clusters(
+    participants: list[Participant], warm_start: Optional[dict] = None, solved: Optional[dict] = None
+) -> list[MeetingCluster]:
+    with span("clusters"):
+        return [
+            MeetingCluster(
+                lat=cluster["lat"],
+                lng=cluster["lng"],
+                neighborhood=_closest_name(cluster["members"], cluster["lat"], cluster["lng"]),
+                participant_ids=[p.id for p in cluster["members"]],
+                total_km=round(cluster["total_km"], 2),
+            )
+            for cluster in split_meeting_points(participants, warm_start=warm_start, solved=solved)
+        ]
+
+
+async def load_results_base(
+    session: AsyncSession, event: Event, venues: Optional[list[VenueRecommendation]] = None
+) -> ResultsBase:
+    """
+    Query active participants, their slots and patterns, then run the
+    expensive steps once. Passing `venues` skips the Places lookup and uses
+    them instead.
+    """
+    # Get active participants (declined rows are filtered by the
+    # (event_id, declined) index rather than in Python)
+    participants_result = await session.execute(
+        select(Participant).where(
+            Participant.event_id == event.id,
+            Participant.declined == False,  # noqa: E712
+        )
+    )
+    active_participants = list(participants_result.scalars().all())
+    if not active_participants:
+        return ResultsBase(event.title, [], OverlapSweep({}), None, [], {}, [])
+
+    # Get all availabilities (only for active participants)
+    availabilities_result = await session.execute(
+        select(Availability.participant_id, Availability.start_time, Availability.end_time)
+        .where(Availability.participant_id.in_([p.id for p in active_participants]))
+    )
+    slots: dict = {}
+    for participant_id, start_time, end_time in availabilities_result.all():
+        slots.setdefault(participant_id, []).append((start_time, end_time))
+
+    # Recurring patterns stay compact until the sweep consumes them: each is
+    # expanded lazily, over the event window only, and merged in order with
+    # the participant's explicit slots
+    patterns_result = await session.execute(
+        select(
+            AvailabilityPattern.participant_id,
+            AvailabilityPattern.weekdays,
+            AvailabilityPattern.start_time,
+            AvailabilityPattern.duration_minutes,
+        )
+        .where(AvailabilityPattern.participant_id.in_([p.id for p in active_participants]))
+    )
+    recurring: dict = {}
+    for participant_id, *pattern in patterns_result.all():
+        recurring.setdefault(participant_id, []).append(pattern)
+    for participant_id, patterns in recurring.items():
+        slots[participant_id] = participant_slots(
+            slots.get(participant_id, ()), patterns, event.window_start, event.window_end
+        )
+
+    with span("overlap"):
+        sweep = OverlapSweep(slots)
+
+    # Suggested location (geometric median)
+    with span("median"):
+        centroid = calculate_centroid(active_participants)
+    median = (centroid["lat"], centroid["lng"]) if centroid else None
+
+    split_centers: dict = {}
+    meeting_clusters = _meeting_clusters(active_participants, solved=split_centers)
+
+    # Venue recommendations: use Google Places API if key is configured, else fall back to statics
+    venue_recommendations: list[VenueRecommendation] = list(venues or [])
+    if venues is None and median and settings.GOOGLE_PLACES_API_KEY:
+        # Imported on first use: httpx is slow to import and only needed here
+        from app.services.places_service import fetch_venue_recommendations
+
+        try:
+            with span("places"):
+                venue_recommendations = await fetch_venue_recommendations(
+                    lat=median[0],
+                    lng=median[1],
+                    api_key=settings.GOOGLE_PLACES_API_KEY,
+                )
+        except Exception:
+            # If the Places API call fails for any reason, degrade gracefully
+            venue_recommendations = []
+
+    if not venue_recommendations:
+        # Static fallback (no API key or Places API unavailable)
+        venue_recommendations = static_venue_recommendations()
+
+    return ResultsBase(
+        event.title, active_participants, sweep, median, meeting_clusters, split_centers, venue_recommendations
+    )
+
+
+def results_from_base(
+    base: ResultsBase,
+    objective: str = "total",
+    exclude: Collection[UUID] = frozenset(),
+    require: Collection[UUID] = frozenset(),
+) -> Optional[ResultsResponse]:
+    """
+    Results for the base's participants minus `exclude`, with the time
+    window restricted to when everyone in `require` is available.
+
+    Only cheap steps run here: the sweep subtracts the excluded
+    participants' segments, and the median and cluster centres are
+    warm-started from the base's. Venues are the base's (found near the
+    full group's median).
+    Returns None if no participant is left.
+    """
+    participants = [p for p in base.participants if p.id not in exclude]
+    if not participants:
+        return None
+
+    # Calculate suggested time
+    suggested_time = None
+    with span("overlap"):
+        overlap = base.sweep.best_window(exclude, require)
+    if overlap:
+        suggested_time = SuggestedTime(
+            start=overlap["start"],
+            end=overlap["end"],
+            participant_count=overlap["count"]
+        )
+
+    # Calculate suggested location (geometric median)
+    suggested_location = None
+    centroid = base.median
+    if exclude and centroid:
+        coords = [(p.lat, p.lng) for p in participants if p.lat is not None and p.lng is not None]
+        with span("median"):
+            centroid = weiszfeld(coords, start=centroid) if coords else None
+    if centroid:
+        suggested_location = SuggestedLocation(
+            lat=centroid[0],
+            lng=centroid[1],
+            neighborhood=_closest_name(participants, centroid[0], centroid[1])
+        )
+
+    meeting_clusters = base.meeting_clusters
+    if exclude:
+        meeting_clusters = _meeting_clusters(participants, warm_start=base.split_centers)
+
+    with span("meeting_areas"):
+        meeting_areas = rank_areas(participants, objective)
+
+    return ResultsResponse(
+        event_title=base.event_title,
+        suggested_time=suggested_time,
+        suggested_location=suggested_location,
+        venue_recommendations=base.venue_recommendations,
+        total_participants=len(participants),
+        meeting_areas=meeting_areas,
+        meeting_clusters=meeting_clusters,
+    )
+
+
+async def compute_results(
+    session: AsyncSession,
+    event: Event,
+    objective: str = "total",
+    venues: Optional[list[VenueRecommendation]] = None,
+) -> Optional[ResultsResponse]:
+    """
+    Calculate the "magic" results for an event:
+    - Best time window (maximum overlap)
+    - Geographic centroid (fair meeting point)
+    - Seeded meeting areas ranked under `objective` (total|max|blend)
+    - Separate meeting points when the group is geographically split
+    - Venue recommendations (`venues`, when given, instead of a Places lookup)
+
+    Returns None if no participant has joined (declines don't count).
+    """
+    return results_from_base(await load_results_base(session, event, venues), objective)
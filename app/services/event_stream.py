@@ -0,0 +1,273 @@
+"""
+Live event updates for Server-Sent Events subscribers.
+
+When a join or decline commits, the handler calls `broker.notify(slug)`.
+The notification goes through a pub/sub backend so every worker hears it;
+each worker then drops its cached what-if base (results_cache) and
+recomputes the event detail + results ONCE for that slug, fanning the
+serialized payload out to all of its local subscribers. Venues come from
+Places only for a slug's first push; later pushes reuse them, so a busy
+event costs one Places call per worker while it has subscribers, not one
+per join.
+
+Backends:
+- InMemoryBackend: single-process (default).
+- PostgresNotifyBackend: LISTEN/NOTIFY for multi-worker deployments. It
+  listens on a dedicated asyncpg connection and publishes through a small
+  pool, so concurrent joins never share one connection. A lost LISTEN
+  connection is re-established with exponential backoff; notifications sent
+  while it was down are gone, so the broker then drops every cached base
+  and recomputes every subscribed slug. Needs a session-mode connection
+  string (pgBouncer transaction pooling drops LISTEN registrations).
+"""
+import asyncio
+import contextvars
+import logging
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Optional
+
+from app.core.config import settings
+from app.core.db import async_session
+from app.core.responses import trusted_adapter
+from app.services import results_cache
+from app.services.event_service import build_event_detail, compute_results, get_event_by_slug
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[str], Awaitable[None]]
+ResyncHandler = Callable[[], Awaitable[None]]
+
+
+class PubSubBackend(ABC):
+    """Delivers slug notifications to every worker's broker."""
+
+    @abstractmethod
+    async def start(self, handler: MessageHandler, resync: Optional[ResyncHandler] = None) -> None:
+        """Deliver every slug published from now on to `handler`; `resync` runs after a gap in delivery."""
+
+    @abstractmethod
+    async def publish(self, slug: str) -> None:
+        ...
+
+    async def stop(self) -> None:
+        pass
+
+
+class InMemoryBackend(PubSubBackend):
+    """Process-local delivery; only correct with a single worker."""
+
+    def __init__(self) -> None:
+        self._handler: Optional[MessageHandler] = None
+
+    async def start(self, handler: MessageHandler, resync: Optional[ResyncHandler] = None) -> None:
+        self._handler = handler
+
+    async def publish(self, slug: str) -> None:
+        if self._handler is not None:
+            await self._handler(slug)
+
+
+class PostgresNotifyBackend(PubSubBackend):
+    """Cross-worker delivery via Postgres LISTEN/NOTIFY."""
+
+    CHANNEL = "midway_event_updates"
+    PUBLISH_POOL_SIZE = 4
+    RECONNECT_MIN_SECONDS = 0.5
+    RECONNECT_MAX_SECONDS = 30.0
+
+    def __init__(self, dsn: str) -> None:
+        # asyncpg wants a plain postgresql:// DSN
+        self._dsn = dsn.replace("postgresql+asyncpg://", "postgresql://", 1)
+        self._conn = None  # LISTEN only
+        self._pool = None  # NOTIFY: an asyncpg connection runs one operation at a time
+        self._handler: Optional[MessageHandler] = None
+        self._resync: Optional[ResyncHandler] = None
+        self._stopping = False
+        self._reconnecting: Optional[asyncio.Task] = None
+        # The loop only keeps weak references to tasks
+        self._tasks: set[asyncio.Task] = set()
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        if self._handler is not None:
+            task = asyncio.get_running_loop().create_task(self._handler(payload))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _on_terminate(self, connection) -> None:
+        if self._stopping or connection is not self._conn:
+            return
+        logger.warning("Stream LISTEN connection lost; reconnecting")
+        self._conn = None
+        if self._reconnecting is None or self._reconnecting.done():
+            self._reconnecting = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        conn = await asyncpg.connect(self._dsn)
+        try:
+            await conn.add_listener(self.CHANNEL, self._on_notify)
+        except BaseException:
+            await conn.close()
+            raise
+        conn.add_termination_listener(self._on_terminate)
+        self._conn = conn
+
+    async def _reconnect(self) -> None:
+        delay = self.RECONNECT_MIN_SECONDS
+        while not self._stopping:
+            try:
+                await self._listen()
+            except Exception as exc:
+                logger.warning("Stream LISTEN reconnect failed (%s); retrying in %.1f s", exc, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.RECONNECT_MAX_SECONDS)
+                continue
+            logger.info("Stream LISTEN connection re-established")
+            if self._resync is not None:
+                await self._resync()
+            return
+
+    async def start(self, handler: MessageHandler, resync: Optional[ResyncHandler] = None) -> None:
+        import asyncpg
+
+        self._handler = handler
+        self._resync = resync
+        self._stopping = False
+        await self._listen()
+        self._pool = await asyncpg.create_pool(self._dsn, min_size=1, max_size=self.PUBLISH_POOL_SIZE)
+
+    async def publish(self, slug: str) -> None:
+        if self._pool is None:
+            raise RuntimeError("PostgresNotifyBackend is not connected")
+        await self._pool.execute("SELECT pg_notify($1, $2)", self.CHANNEL, slug)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnecting is not None:
+            self._reconnecting.cancel()
+            self._reconnecting = None
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+class StreamLimitExceeded(Exception):
+    """Raised when a worker already holds SSE_MAX_CONNECTIONS streams."""
+
+
+class EventStreamBroker:
+    """Tracks per-slug subscriber queues and recomputes payloads on change."""
+
+    def __init__(self, backend: PubSubBackend) -> None:
+        self.backend = backend
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._latest: dict[str, str] = {}
+        self._venues: dict[str, list] = {}  # slug -> venues of its first push
+        # One in-flight computation per slug; a change arriving mid-compute
+        # sets the dirty flag and triggers exactly one more run.
+        self._computing: dict[str, asyncio.Task] = {}
+        self._dirty: set[str] = set()
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def start(self) -> None:
+        await self.backend.start(self._on_message, self._resync)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    async def notify(self, slug: str) -> None:
+        """Announce that `slug` changed. Never raises into the write path."""
+        try:
+            await self.backend.publish(slug)
+        except Exception:
+            logger.exception("Failed to publish update for event %s", slug)
+
+    def subscribe(self, slug: str) -> asyncio.Queue:
+        if self.connection_count >= settings.SSE_MAX_CONNECTIONS:
+            raise StreamLimitExceeded()
+        # Only the latest state matters, so a slow client just skips updates
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(slug, set()).add(queue)
+        if slug in self._latest:
+            queue.put_nowait(self._latest[slug])
+        elif slug not in self._computing:
+            # An in-flight computation will deliver to this queue as well
+            self._schedule(slug)
+        return queue
+
+    def unsubscribe(self, slug: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(slug)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[slug]
+            self._latest.pop(slug, None)
+            self._venues.pop(slug, None)
+
+    async def _resync(self) -> None:
+        # Changes announced while the backend was down were never heard
+        results_cache.invalidate_all()
+        for slug in list(self._subscribers):
+            self._schedule(slug)
+
+    async def _on_message(self, slug: str) -> None:
+        results_cache.invalidate(slug)
+        if slug in self._subscribers:
+            self._schedule(slug)
+
+    def _schedule(self, slug: str) -> None:
+        if slug in self._computing:
+            self._dirty.add(slug)
+            return
+        # Fresh context: the recompute must not count against the request
+        # (spans, query budget) that happened to trigger it.
+        self._computing[slug] = asyncio.get_running_loop().create_task(
+            self._recompute(slug), context=contextvars.Context()
+        )
+
+    async def _recompute(self, slug: str) -> None:
+        try:
+            while True:
+                self._dirty.discard(slug)
+                payload = await self._build_payload(slug)
+                if payload is not None and slug in self._subscribers:
+                    self._latest[slug] = payload
+                    for queue in self._subscribers[slug]:
+                        if queue.full():
+                            queue.get_nowait()
+                        queue.put_nowait(payload)
+                if slug not in self._dirty:
+                    break
+        except Exception:
+            logger.exception("Failed to recompute stream payload for event %s", slug)
+        finally:
+            self._computing.pop(slug, None)
+
+    async def _build_payload(self, slug: str) -> Optional[str]:
+        # Always read from the primary: we were just told about a write.
+        async with async_session() as session:
+            event = await get_event_by_slug(session, slug)
+            if event is None:
+                return None
+            detail = await build_event_detail(session, event)
+            results = await compute_results(session, event, venues=self._venues.get(slug))
+        if results is not None and slug in self._subscribers:
+            self._venues.setdefault(slug, results.venue_recommendations)
+        return trusted_adapter.dump_json({"event": detail, "results": results}).decode()
+
+
+def _create_backend() -> PubSubBackend:
+    if settings.STREAM_BACKEND_URL.startswith("postgresql"):
+        return PostgresNotifyBackend(settings.STREAM_BACKEND_URL)
+    return InMemoryBackend()
+
+
+broker = EventStreamBroker(_create_backend())
@@ -0,0 +1,84 @@
+"""
+Location name and id resolution shared by join, bulk import and
+POST /locations/resolve.
+
+A name matches a seeded area exactly, ignoring case. "Area, City" (how the
+location combobox displays a choice) matches that area within that city.
+Lookups are served from the location snapshot when one is attached, without
+a query; otherwise every call costs one query, however many names or ids it
+resolves.
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.location import Location
+from app.services import location_snapshot
+
+LOCATION_COLUMNS = (Location.id, Location.city, Location.area_name, Location.lat, Location.lng)
+
+
+def _candidates(name: str) -> list[tuple[str, Optional[str]]]:
+    """(area, city) readings of a name: the whole name, then "Area, City"."""
+    key = name.strip().lower()
+    readings: list[tuple[str, Optional[str]]] = [(key, None)]
+    area, comma, city = key.rpartition(",")
+    if comma and area.strip() and city.strip():
+        readings.append((area.strip(), city.strip()))
+    return readings
+
+
+def _row_dict(row) -> dict:
+    return {"id": row[0], "city": row[1], "area_name": row[2], "lat": row[3], "lng": row[4]}
+
+
+async def resolve_names(session: AsyncSession, names: Iterable[str]) -> dict[str, dict]:
+    """Location row (LocationResult fields) for every name that resolves, keyed by the name as given."""
+    names = set(names)
+    snapshot = location_snapshot.current()
+    resolved: dict[str, dict] = {}
+    if snapshot is not None:
+        for name in names:
+            for area, city in _candidates(name):
+                row = snapshot.find(area, city)
+                if row is not None:
+                    resolved[name] = row
+                    break
+        return resolved
+
+    readings = {name: _candidates(name) for name in names}
+    areas = {area for candidates in readings.values() for area, _ in candidates}
+    if not areas:
+        return resolved
+    result = await session.execute(
+        select(*LOCATION_COLUMNS)
+        .where(func.lower(Location.area_name).in_(areas))
+        .order_by(Location.id)
+    )
+    # (area, city) -> first row in id order, as the snapshot finds it
+    by_area: dict[tuple[str, Optional[str]], dict] = {}
+    for row in result.all():
+        area, city = row[2].lower(), row[1].lower()
+        by_area.setdefault((area, None), _row_dict(row))
+        by_area.setdefault((area, city), _row_dict(row))
+    for name, candidates in readings.items():
+        for candidate in candidates:
+            if candidate in by_area:
+                resolved[name] = by_area[candidate]
+                break
+    return resolved
+
+
+async def locations_by_id(session: AsyncSession, ids: Iterable[int]) -> dict[int, dict]:
+    """Location row for every known id."""
+    ids = set(ids)
+    if not ids:
+        return {}
+    snapshot = location_snapshot.current()
+    if snapshot is not None:
+        rows = (snapshot.get(location_id) for location_id in ids)
+        return {row["id"]: row for row in rows if row is not None}
+    result = await session.execute(select(*LOCATION_COLUMNS).where(Location.id.in_(ids)))
+    return {row[0]: _row_dict(row) for row in result.all()}
@@ -0,0 +1,256 @@
+"""
+Read-only binary snapshot of the location reference data.
+
+The snapshot holds every `Location` row plus the mock_geo_service alias
+table in one compact file. Multi-worker deployments (scripts/serve.py)
+compile it once and every worker memory-maps it via LOCATION_SNAPSHOT_PATH,
+so the pages are shared between processes and no worker queries the
+locations table or parses JSON. A single worker builds the same structure
+in memory after startup instead.
+
+Layout (little-endian, sections 8-byte aligned):
+
+    header     magic "MWLS", version, location count, alias count,
+               then (offset, length) of each section below
+    records    per location: id, lat, lng, city (offset, length),
+               area name (offset, length) into `strings`
+    starts     per location: u32 offset of its name in `names`
+    names      "\n" + lower-cased area names joined by "\n" + "\n"
+    strings    UTF-8 city and area names as stored
+    aliases    per alias: lat, lng
+    alias_keys "\n" + alias keys joined by "\n" + "\n"
+
+Substring search runs `find()` over `names` directly on the mapped bytes;
+a match position maps back to its row with a binary search over `starts`.
+"""
+import mmap
+import os
+import struct
+from bisect import bisect_right
+from typing import Iterator, Optional, Sequence, Union
+
+MAGIC = b"MWLS"
+VERSION = 1
+SECTIONS = ("records", "starts", "names", "strings", "aliases", "alias_keys")
+HEADER = struct.Struct("<4sHHII" + "II" * len(SECTIONS))
+LOCATION = struct.Struct("<iddIHIH")
+ALIAS = struct.Struct("<dd")
+OFFSET = struct.Struct("<I")
+
+
+class SnapshotError(Exception):
+    """Raised for a missing, foreign or outdated snapshot file."""
+
+
+def _pad(buffer: bytearray) -> None:
+    buffer.extend(b"\0" * (-len(buffer) % 8))
+
+
+def encode_snapshot(
+    locations: Sequence[tuple[int, str, str, float, float]],
+    aliases: dict[str, dict[str, float]],
+) -> bytes:
+    """Serialize (id, city, area_name, lat, lng) rows and the alias table."""
+    strings = bytearray()
+    records = bytearray()
+    starts = bytearray()
+    names = bytearray(b"\n")
+    for location_id, city, area_name, lat, lng in locations:
+        city_bytes, area_bytes = city.encode(), area_name.encode()
+        city_offset = len(strings)
+        strings += city_bytes
+        area_offset = len(strings)
+        strings += area_bytes
+        records += LOCATION.pack(location_id, lat, lng, city_offset, len(city_bytes), area_offset, len(area_bytes))
+        starts += OFFSET.pack(len(names))
+        names += area_name.lower().encode() + b"\n"
+
+    alias_records = bytearray()
+    alias_keys = bytearray(b"\n")
+    for key, coords in aliases.items():
+        alias_records += ALIAS.pack(coords["lat"], coords["lng"])
+        alias_keys += key.lower().encode() + b"\n"
+
+    body = bytearray()
+    positions = []
+    for section in (records, starts, names, strings, alias_records, alias_keys):
+        positions += [HEADER.size + len(body), len(section)]
+        body += section
+        _pad(body)
+    # The header size is a multiple of 8, so section offsets stay aligned
+    header = HEADER.pack(MAGIC, VERSION, 0, len(locations), len(aliases), *positions)
+    return header + bytes(body)
+
+
+class LocationSnapshot:
+    """Lookups over an encoded snapshot held in an mmap or a bytes object."""
+
+    def __init__(self, data: Union[mmap.mmap, bytes]) -> None:
+        if len(data) < HEADER.size:
+            raise SnapshotError("Snapshot is truncated")
+        magic, version, _, self.location_count, self.alias_count, *positions = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotError(f"Not a version {VERSION} location snapshot")
+        self._data = data
+        self._sections = {
+            name: (positions[2 * i], positions[2 * i] + positions[2 * i + 1])
+            for i, name in enumerate(SECTIONS)
+        }
+        start, end = self._sections["starts"]
+        self._starts = memoryview(data)[start:end].cast("I")
+
+    @classmethod
+    def open(cls, path: str) -> "LocationSnapshot":
+        """Memory-map a snapshot file read-only (pages shared across processes)."""
+        try:
+            with open(path, "rb") as f:
+                return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except (OSError, ValueError) as exc:
+            raise SnapshotError(f"Cannot map snapshot {path}: {exc}") from exc
+
+    def _string(self, offset: int, length: int) -> str:
+        base = self._sections["strings"][0] + offset
+        return bytes(self._data[base:base + length]).decode()
+
+    def _row(self, index: int) -> dict:
+        location_id, lat, lng, city_offset, city_length, area_offset, area_length = LOCATION.unpack_from(
+            self._data, self._sections["records"][0] + index * LOCATION.size
+        )
+        return {
+            "id": location_id,
+            "city": self._string(city_offset, city_length),
+            "area_name": self._string(area_offset, area_length),
+            "lat": lat,
+            "lng": lng,
+        }
+
+    def rows(self) -> Iterator[dict]:
+        """Every location, in id order."""
+        for index in range(self.location_count):
+            yield self._row(index)
+
+    def _row_at(self, names_offset: int) -> int:
+        # Index of the name that contains byte `names_offset` of `names`
+        return bisect_right(self._starts, names_offset) - 1
+
+    def search(self, q: str, city: Optional[str] = None, limit: int = 10, candidates: int = 30) -> list[dict]:
+        """
+        Same contract as /locations/search: case-insensitive substring match
+        on area name (optionally on city), the first `candidates` matches in
+        id order, starts-with matches ranked first, at most `limit` returned.
+        """
+        needle = q.lower().encode()
+        if not needle or b"\n" in needle:
+            return []
+        city_needle = city.lower() if city else None
+        names_start, names_end = self._sections["names"]
+        matches: list[tuple[bool, dict]] = []
+        position = names_start
+        while len(matches) < candidates:
+            position = self._data.find(needle, position, names_end)
+            if position < 0:
+                break
+            index = self._row_at(position - names_start)
+            starts_with = position - names_start == self._starts[index]
+            # Continue after this name so a row matches at most once
+            position = names_start + (self._starts[index + 1] if index + 1 < self.location_count else names_end)
+            row = self._row(index)
+            if city_needle is None or city_needle in row["city"].lower():
+                matches.append((not starts_with, row))
+        matches.sort(key=lambda match: match[0])
+        return [row for _, row in matches[:limit]]
+
+    def find(self, area_name: str, city: Optional[str] = None) -> Optional[dict]:
+        """First location whose area name (and city, if given) equals the argument, ignoring case."""
+        needle = b"\n" + area_name.lower().encode() + b"\n"
+        names_start, names_end = self._sections["names"]
+        position = self._data.find(needle, names_start, names_end)
+        while position >= 0:
+            row = self._row(self._row_at(position + 1 - names_start))
+            if city is None or row["city"].lower() == city.lower():
+                return row
+            position = self._data.find(needle, position + 1, names_end)
+        return None
+
+    def get(self, location_id: int) -> Optional[dict]:
+        """The location with this id (records are in id order: binary search)."""
+        records_start = self._sections["records"][0]
+        low, high = 0, self.location_count
+        while low < high:
+            middle = (low + high) // 2
+            (middle_id,) = struct.unpack_from("<i", self._data, records_start + middle * LOCATION.size)
+            if middle_id < location_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.location_count:
+            row = self._row(low)
+            if row["id"] == location_id:
+                return row
+        return None
+
+    def aliases(self) -> Iterator[tuple[str, float, float]]:
+        """Every (key, lat, lng) of the mock geocoding alias table."""
+        keys_start, keys_end = self._sections["alias_keys"]
+        keys = bytes(self._data[keys_start + 1:keys_end - 1]).decode().split("\n") if self.alias_count else []
+        records_start = self._sections["aliases"][0]
+        for i, key in enumerate(keys):
+            lat, lng = ALIAS.unpack_from(self._data, records_start + i * ALIAS.size)
+            yield key, lat, lng
+
+    def alias(self, key: str) -> Optional[tuple[float, float]]:
+        """Coordinates for an exact (case-insensitive) alias key."""
+        needle = b"\n" + key.lower().encode() + b"\n"
+        keys_start, keys_end = self._sections["alias_keys"]
+        position = self._data.find(needle, keys_start, keys_end)
+        if position < 0:
+            return None
+        index = self._data[keys_start:position + 1].count(b"\n") - 1
+        return ALIAS.unpack_from(self._data, self._sections["aliases"][0] + index * ALIAS.size)
+
+
+# The snapshot this process serves from, if any (see attach / load_in_memory)
+_current: Optional[LocationSnapshot] = None
+
+
+def current() -> Optional[LocationSnapshot]:
+    return _current
+
+
+def attach(path: str) -> LocationSnapshot:
+    """Serve lookups from the snapshot file at `path`."""
+    global _current
+    _current = LocationSnapshot.open(path)
+    return _current
+
+
+async def build_snapshot() -> bytes:
+    """Encode the current locations table and the mock geocoding aliases."""
+    from app.core.db import async_session
+    from app.models.location import Location
+    from app.services.mock_geo_service import BENGALURU_LOCATIONS
+    from sqlmodel import select
+
+    async with async_session() as session:
+        result = await session.execute(
+            select(Location.id, Location.city, Location.area_name, Location.lat, Location.lng).order_by(Location.id)
+        )
+        rows = [tuple(row) for row in result.all()]
+    return encode_snapshot(rows, BENGALURU_LOCATIONS)
+
+
+async def write_snapshot(path: str) -> int:
+    """Build the snapshot and atomically replace `path`; returns its size."""
+    data = await build_snapshot()
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+async def load_in_memory() -> LocationSnapshot:
+    """Single-process mode: build the snapshot straight into memory."""
+    global _current
+    _current = LocationSnapshot(await build_snapshot())
+    return _current
@@ -0,0 +1,105 @@
+"""
+Ranked meeting areas: seeded `Location` areas of the event's city scored
+against where the participants are, as an alternative to the unconstrained
+geometric median (which can land anywhere, lakes included).
+
+Each participant is placed on the seeded area they named, or the nearest
+one to their coordinates. The event's city is the most common city among
+those areas. Per city, the haversine distances from each of its areas to
+every seeded area are computed once and kept by column, so scoring all
+candidates adds one column per distinct participant area.
+
+The table is built from the attached location snapshot and rebuilt when a
+different snapshot is attached; until one exists no areas are ranked.
+"""
+from collections import Counter
+from typing import Iterable, Optional
+
+from app.models.participant import Participant
+from app.schemas.results import MeetingArea
+from app.services import location_snapshot
+from app.services.algorithm_service import distance_columns, haversine_km, rank_meeting_areas
+
+MEETING_AREA_LIMIT = 5
+
+
+class AreaTable:
+    """Seeded areas plus lazily built per-city distance columns."""
+
+    def __init__(self, rows: Iterable[dict]) -> None:
+        self.rows = list(rows)
+        self._by_name: dict[str, int] = {}
+        for index, row in enumerate(self.rows):
+            self._by_name.setdefault(row["area_name"].lower(), index)
+        # city -> (area indexes in that city, columns over those candidates)
+        self._cities: dict[str, tuple[list[int], list]] = {}
+
+    def area_for(self, location_name: str, lat: Optional[float], lng: Optional[float]) -> Optional[int]:
+        """Index of the named area, else of the area nearest to (lat, lng)."""
+        index = self._by_name.get(location_name.strip().lower())
+        if index is not None or lat is None or lng is None or not self.rows:
+            return index
+        return min(
+            range(len(self.rows)),
+            key=lambda i: haversine_km(lat, lng, self.rows[i]["lat"], self.rows[i]["lng"]),
+        )
+
+    def city(self, city: str) -> tuple[list[int], list]:
+        if city not in self._cities:
+            candidates = [i for i, row in enumerate(self.rows) if row["city"] == city]
+            self._cities[city] = (candidates, distance_columns(
+                [(self.rows[i]["lat"], self.rows[i]["lng"]) for i in candidates],
+                [(row["lat"], row["lng"]) for row in self.rows],
+            ))
+        return self._cities[city]
+
+
+_table: Optional[AreaTable] = None
+_table_snapshot: Optional[location_snapshot.LocationSnapshot] = None
+
+
+def area_table() -> Optional[AreaTable]:
+    """The table for the current snapshot, or None before one is attached."""
+    global _table, _table_snapshot
+    snapshot = location_snapshot.current()
+    if snapshot is None:
+        return None
+    if snapshot is not _table_snapshot:
+        _table, _table_snapshot = AreaTable(snapshot.rows()), snapshot
+    return _table
+
+
+def rank_areas(
+    participants: list[Participant],
+    objective: str = "total",
+    limit: int = MEETING_AREA_LIMIT,
+) -> list[MeetingArea]:
+    """Best seeded areas in the participants' city under `objective`."""
+    table = area_table()
+    if table is None:
+        return []
+    # Repeated free-text coordinates (e.g. the default centre) resolve once
+    nearest: dict[tuple, Optional[int]] = {}
+    counts: Counter = Counter()
+    for p in participants:
+        key = (p.location_name, p.lat, p.lng)
+        if key not in nearest:
+            nearest[key] = table.area_for(*key)
+        if nearest[key] is not None:
+            counts[nearest[key]] += 1
+    if not counts:
+        return []
+
+    cities: Counter = Counter()
+    for index, count in counts.items():
+        cities[table.rows[index]["city"]] += count
+    candidates, columns = table.city(cities.most_common(1)[0][0])
+
+    return [
+        MeetingArea(
+            **table.rows[candidates[c]],
+            total_km=round(total, 2),
+            max_km=round(worst, 2),
+        )
+        for c, total, worst in rank_meeting_areas(columns, counts, objective, limit)
+    ]
@@ -1,4 +1,6 @@
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional, Tuple
+
+from app.services import location_snapshot
 
 # Mock geocoding data for common Bengaluru locations
 BENGALURU_LOCATIONS = {
@@ -31,6 +33,16 @@ BENGALURU_LOCATIONS = {
 DEFAULT_LOCATION = {"lat": 12.9716, "lng": 77.5946}
 
 
+def _aliases() -> Iterator[Tuple[str, float, float]]:
+    """(key, lat, lng) rows, from the shared location snapshot when attached."""
+    snapshot = location_snapshot.current()
+    if snapshot is not None:
+        yield from snapshot.aliases()
+        return
+    for key, coords in BENGALURU_LOCATIONS.items():
+        yield key, coords["lat"], coords["lng"]
+
+
 def geocode_location(location_name: str) -> Dict[str, float]:
     """
     Mock geocoding service for Bengaluru locations.
@@ -46,14 +58,20 @@ def geocode_location(location_name: str) -> Dict[str, float]:
     """
     normalized_name = location_name.lower().strip()
     
+    snapshot = location_snapshot.current()
+    
     # Try exact match
-    if normalized_name in BENGALURU_LOCATIONS:
+    if snapshot is not None:
+        coords = snapshot.alias(normalized_name)
+        if coords is not None:
+            return {"lat": coords[0], "lng": coords[1]}
+    elif normalized_name in BENGALURU_LOCATIONS:
         return BENGALURU_LOCATIONS[normalized_name]
     
     # Try partial match
-    for key, coords in BENGALURU_LOCATIONS.items():
+    for key, lat, lng in _aliases():
         if key in normalized_name or normalized_name in key:
-            return coords
+            return {"lat": lat, "lng": lng}
     
     # Fallback to central Bengaluru
     return DEFAULT_LOCATION
@@ -75,9 +93,9 @@ def get_neighborhood_name(lat: float, lng: float) -> str:
     min_distance = float('inf')
     closest_name = "Bengaluru Central"
     
-    for name, coords in BENGALURU_LOCATIONS.items():
+    for name, name_lat, name_lng in _aliases():
         # Simple distance calculation (Euclidean approximation)
-        distance = ((lat - coords["lat"]) ** 2 + (lng - coords["lng"]) ** 2) ** 0.5
+        distance = ((lat - name_lat) ** 2 + (lng - name_lng) ** 2) ** 0.5
         if distance < min_distance:
             min_distance = distance
             closest_name = name.title()
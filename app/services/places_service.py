@@ -3,11 +3,10 @@ Service for fetching venue recommendations from Google Places API.
 """
 import httpx
 from typing import List, Optional
+from app.core.config import settings
 from app.schemas.results import VenueRecommendation
 
 
-PLACES_NEARBY_URL = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
-
 # Google Places type → human-readable category
 PLACE_TYPE_LABELS: dict[str, str] = {
     "restaurant": "Restaurant",
@@ -78,7 +77,7 @@ async def fetch_venue_recommendations(
     }
 
     async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.get(PLACES_NEARBY_URL, params=params)
+        response = await client.get(settings.PLACES_API_URL, params=params)
         response.raise_for_status()
         data = response.json()
 
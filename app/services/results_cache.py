@@ -0,0 +1,82 @@
+"""
+Per-event cache of ResultsBase for what-if results.
+
+A what-if (`/results?exclude=...&require=...`) is computed from the cached
+base of its event: no Places call and no participant queries, only the
+delta steps in `results_from_base`. Bases are read from the primary.
+
+Every hit is first checked with one query: the number of the event's
+participant rows (declined included) and their latest updated_at. A join,
+a decline or an edit changes one of the two, and the base is reloaded.
+The check does not depend on the live-update broker, which also drops a
+slug's base when a change is announced (on every worker only with
+STREAM_BACKEND_URL, and not while its LISTEN connection is down).
+At most RESULTS_CACHE_SIZE events are kept (LRU).
+"""
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.db import async_session
+from app.models.event import Event
+from app.models.participant import Participant
+from app.services.event_service import ResultsBase, get_event_by_slug, load_results_base
+
+Fingerprint = tuple[int, Optional[datetime]]
+
+_bases: "OrderedDict[str, tuple[Fingerprint, ResultsBase]]" = OrderedDict()
+# Bumped by every invalidation: a base whose build started before an
+# invalidation may already be stale and is not stored.
+_version = 0
+
+
+def invalidate(slug: str) -> None:
+    global _version
+    _version += 1
+    _bases.pop(slug, None)
+
+
+def invalidate_all() -> None:
+    global _version
+    _version += 1
+    _bases.clear()
+
+
+async def _fingerprint(session: AsyncSession, slug: str) -> Fingerprint:
+    result = await session.execute(
+        select(func.count(Participant.id), func.max(Participant.updated_at))
+        .join(Event, Event.id == Participant.event_id)
+        .where(Event.slug == slug)
+    )
+    count, updated_at = result.one()
+    return count, updated_at
+
+
+async def get_base(slug: str) -> Optional[ResultsBase]:
+    """The cached base for `slug`, (re)loading it when missing or stale; None if there is no such event."""
+    version = _version
+    # Always read from the primary: a stale replica read would stay cached
+    async with async_session() as session:
+        # Taken before the base is loaded: a change in between makes the
+        # stored fingerprint older than the base, never newer
+        fingerprint = await _fingerprint(session, slug)
+        entry = _bases.get(slug)
+        if entry is not None and entry[0] == fingerprint:
+            _bases.move_to_end(slug)
+            return entry[1]
+
+        event = await get_event_by_slug(session, slug)
+        if event is None:
+            return None
+        base = await load_results_base(session, event)
+    if version == _version:
+        _bases[slug] = (fingerprint, base)
+        _bases.move_to_end(slug)
+        while len(_bases) > settings.RESULTS_CACHE_SIZE:
+            _bases.popitem(last=False)
+    return base
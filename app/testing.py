@@ -0,0 +1,36 @@
+"""
+pytest fixtures for keeping database round trips in check.
+
+Enable them from a conftest.py with `pytest_plugins = ["app.testing"]`.
+
+- `max_queries`: `with max_queries(3): client.get(...)` fails the test if
+  the block runs more than 3 statements (the failure lists them).
+- `enforce_query_budgets`: fails the test if any request made during it
+  broke its configured QUERY_BUDGET_* budget or looked like an N+1.
+
+Both rely on the hooks app.core.db installs on every engine, and the second
+on QueryBudgetMiddleware, which main.py always adds.
+"""
+from typing import Callable, Iterator
+
+import pytest
+
+from app.core import query_budget
+from app.core.query_budget import assert_max_queries
+
+
+@pytest.fixture
+def max_queries() -> Callable:
+    return assert_max_queries
+
+
+@pytest.fixture
+def enforce_query_budgets() -> Iterator[list[str]]:
+    violations: list[str] = []
+    query_budget._collectors.append(violations)
+    try:
+        yield violations
+    finally:
+        query_budget._collectors.remove(violations)
+    if violations:
+        pytest.fail("Query budget exceeded:\n" + "\n".join(violations))
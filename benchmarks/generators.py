@@ -0,0 +1,108 @@
+"""
+Synthetic events for the benchmark suite.
+
+Participants are placed at areas from scripts/locations_data.json (with a
+little jitter so no two share exact coordinates) and given availability
+slots in one of two shapes:
+
+- "grid": slots snapped to the 30-minute cells of a when2meet-style picker,
+  so many start and end times coincide;
+- "freeform": arbitrary start minutes and durations, so almost none do.
+
+Everything is seeded, so a given (n, m, pattern, seed) is reproducible.
+"""
+import json
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
+from app.models import Availability, Event, Location, Participant
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "locations_data.json")
+
+WINDOW_START = datetime(2026, 1, 17, 9, 0)
+WINDOW_HOURS = 12
+GRID_MINUTES = 30
+
+
+def load_locations() -> list[dict]:
+    with open(DATA_FILE) as f:
+        return json.load(f)
+
+
+@dataclass
+class SyntheticEvent:
+    event: Event
+    participants: list[Participant]
+    availabilities: list[Availability]
+
+
+def _grid_slots(rng: random.Random, m: int) -> list[tuple[datetime, datetime]]:
+    cells = WINDOW_HOURS * 60 // GRID_MINUTES
+    slots = []
+    for _ in range(m):
+        first = rng.randrange(cells)
+        length = rng.randint(1, 6)
+        start = WINDOW_START + timedelta(minutes=first * GRID_MINUTES)
+        slots.append((start, start + timedelta(minutes=min(length, cells - first) * GRID_MINUTES)))
+    return slots
+
+
+def _freeform_slots(rng: random.Random, m: int) -> list[tuple[datetime, datetime]]:
+    slots = []
+    for _ in range(m):
+        start = WINDOW_START + timedelta(minutes=rng.randrange(WINDOW_HOURS * 60 - 15))
+        slots.append((start, start + timedelta(minutes=rng.randint(15, 180))))
+    return slots
+
+
+PATTERNS = {"grid": _grid_slots, "freeform": _freeform_slots}
+
+
+def make_event(
+    n_participants: int,
+    slots_per_participant: int,
+    pattern: str = "grid",
+    cities: Optional[Sequence[str]] = None,
+    seed: int = 0,
+    locations: Optional[list[dict]] = None,
+) -> SyntheticEvent:
+    """
+    Build an unsaved event with `n_participants`, each with
+    `slots_per_participant` availability slots of the given `pattern`.
+    Participants are drawn from `cities` (default: every city in the data).
+    """
+    rng = random.Random(seed)
+    areas = [
+        row for row in (locations or load_locations())
+        if cities is None or row["city"] in cities
+    ]
+    make_slots = PATTERNS[pattern]
+
+    event = Event(
+        slug=f"bench{seed:03d}",
+        title=f"Benchmark {n_participants}x{slots_per_participant} {pattern}",
+        window_start=WINDOW_START,
+        window_end=WINDOW_START + timedelta(hours=WINDOW_HOURS),
+    )
+    participants, availabilities = [], []
+    for i in range(n_participants):
+        area = rng.choice(areas)
+        participant = Participant(
+            event_id=event.id,
+            name=f"Participant {i}",
+            location_name=area["area_name"],
+            is_host=i == 0,
+            lat=area["lat"] + rng.uniform(-0.01, 0.01),
+            lng=area["lng"] + rng.uniform(-0.01, 0.01),
+        )
+        participants.append(participant)
+        for start, end in make_slots(rng, slots_per_participant):
+            availabilities.append(Availability(participant_id=participant.id, start_time=start, end_time=end))
+    return SyntheticEvent(event, participants, availabilities)
+
+
+def make_locations(locations: Optional[list[dict]] = None) -> list[Location]:
+    return [Location(**row) for row in (locations or load_locations())]
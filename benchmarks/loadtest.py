@@ -0,0 +1,328 @@
+"""
+End-to-end async load test against a real uvicorn instance.
+
+By default this starts two local servers:
+- the Places stub (benchmarks/places_stub.py), so results requests take the
+  Places path without network calls;
+- the API (uvicorn main:app) on a throwaway SQLite file, or on
+  --database-url (e.g. a local Postgres), pointed at the stub.
+Pass --target to load an already running API instead.
+
+Setup creates --events events with --seed-joins participants each. The
+load phase then replays a weighted mix of create event, join, event detail,
+results and location search requests against those events.
+
+Modes:
+- closed loop (default): --concurrency clients, each sending its next
+  request as soon as the previous one completes;
+- open loop (--rate N): requests start at a fixed N per second whatever the
+  server's speed, and latency is measured from the scheduled start (no
+  coordinated omission). Requests that would exceed --max-in-flight are
+  counted as dropped.
+
+Reports throughput, errors and p50/p95/p99 latency per endpoint.
+
+Usage:
+    python benchmarks/loadtest.py --duration 30 --concurrency 32
+    python benchmarks/loadtest.py --rate 200 --duration 60 --workers 2 --output load.json
+    python benchmarks/loadtest.py --target http://localhost:8000 --rate 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.generators import load_locations
+
+# Relative weights of each request type in the load phase
+DEFAULT_MIX = {"create": 2, "join": 18, "detail": 45, "results": 30, "search": 5}
+SEARCH_TERMS = ["ko", "nagar", "indira", "white", "band", "sec", "anna", "salt"]
+WINDOW_START = datetime(2026, 1, 17, 18, 0)
+
+
+# --- local servers -------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(app: str, port: int, env: dict, workers: int = 1) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=ROOT,
+        env={**os.environ, **env},
+    )
+
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout} s")
+
+
+# --- workload ------------------------------------------------------------
+
+class Workload:
+    """Builds requests for the mix and records their latencies."""
+
+    def __init__(self, client: httpx.AsyncClient, mix: dict[str, int], seed: int) -> None:
+        self.client = client
+        self.kinds = list(mix)
+        self.weights = list(mix.values())
+        self.rng = random.Random(seed)
+        self.areas = [row["area_name"] for row in load_locations()]
+        self.slugs: list[str] = []
+        # Events that had participants before the load phase: results for an
+        # event nobody joined yet is a 400, so results reads only use these.
+        self.seeded_slugs: list[str] = []
+        self.latencies: dict[str, list[float]] = {kind: [] for kind in mix}
+        # kind -> {status code or exception name: count}
+        self.errors: dict[str, dict[str, int]] = {kind: {} for kind in mix}
+        self.dropped = 0
+        self.recording = False
+
+    def _join_body(self, i: int) -> dict:
+        start = WINDOW_START + timedelta(minutes=30 * self.rng.randrange(8))
+        return {
+            "name": f"Load {i}",
+            "location_name": self.rng.choice(self.areas),
+            "availabilities": [
+                {"start_time": start.isoformat(), "end_time": (start + timedelta(hours=2)).isoformat()}
+            ],
+        }
+
+    async def create(self) -> httpx.Response:
+        response = await self.client.post("/api/events/", json={
+            "title": "Load test",
+            "window_start": WINDOW_START.isoformat(),
+            "window_end": (WINDOW_START + timedelta(hours=6)).isoformat(),
+        })
+        if response.status_code == 201:
+            self.slugs.append(response.json()["slug"])
+        return response
+
+    async def join(self) -> httpx.Response:
+        slug = self.rng.choice(self.slugs)
+        return await self.client.post(f"/api/events/{slug}/join", json=self._join_body(self.rng.randrange(10**6)))
+
+    async def detail(self) -> httpx.Response:
+        return await self.client.get(f"/api/events/{self.rng.choice(self.slugs)}")
+
+    async def results(self) -> httpx.Response:
+        return await self.client.get(f"/api/events/{self.rng.choice(self.seeded_slugs)}/results")
+
+    async def search(self) -> httpx.Response:
+        return await self.client.get("/api/locations/search", params={"q": self.rng.choice(SEARCH_TERMS)})
+
+    async def run_one(self, kind: str, started: Optional[float] = None) -> None:
+        started = time.perf_counter() if started is None else started
+        try:
+            response = await getattr(self, kind)()
+            error = str(response.status_code) if response.status_code >= 400 else None
+        except httpx.HTTPError as exc:
+            error = type(exc).__name__
+        if self.recording:
+            self.latencies[kind].append((time.perf_counter() - started) * 1000)
+            if error is not None:
+                self.errors[kind][error] = self.errors[kind].get(error, 0) + 1
+
+    def next_kind(self) -> str:
+        return self.rng.choices(self.kinds, self.weights)[0]
+
+
+async def setup(workload: Workload, events: int, seed_joins: int) -> None:
+    for _ in range(events):
+        response = await workload.create()
+        response.raise_for_status()
+    await asyncio.gather(*(workload.join() for _ in range(events * seed_joins)))
+    workload.seeded_slugs = list(workload.slugs)
+
+
+async def closed_loop(workload: Workload, concurrency: int, until: float) -> None:
+    async def client_loop():
+        while time.perf_counter() < until:
+            await workload.run_one(workload.next_kind())
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+
+
+async def open_loop(workload: Workload, rate: float, until: float, max_in_flight: int) -> None:
+    interval = 1 / rate
+    in_flight: set[asyncio.Task] = set()
+    next_start = time.perf_counter()
+    while next_start < until:
+        delay = next_start - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            if workload.recording:
+                workload.dropped += 1
+        else:
+            task = asyncio.create_task(workload.run_one(workload.next_kind(), started=next_start))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        next_start += interval
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+
+# --- report --------------------------------------------------------------
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    # Nearest-rank percentile
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return round(ordered[index], 2)
+
+
+def build_report(workload: Workload, elapsed: float, args: argparse.Namespace) -> dict:
+    endpoints = {}
+    all_latencies: list[float] = []
+    for kind, samples in workload.latencies.items():
+        if not samples:
+            continue
+        ordered = sorted(samples)
+        all_latencies.extend(ordered)
+        endpoints[kind] = {
+            "requests": len(ordered),
+            "errors": sum(workload.errors[kind].values()),
+            "error_kinds": workload.errors[kind],
+            "rps": round(len(ordered) / elapsed, 1),
+            "p50_ms": _percentile(ordered, 50),
+            "p95_ms": _percentile(ordered, 95),
+            "p99_ms": _percentile(ordered, 99),
+        }
+    all_latencies.sort()
+    return {
+        "mode": f"open loop at {args.rate}/s" if args.rate else f"closed loop x{args.concurrency}",
+        "duration_s": round(elapsed, 1),
+        "workers": args.workers,
+        "database": "external" if args.target else (args.database_url or "sqlite"),
+        "total": {
+            "requests": len(all_latencies),
+            "errors": sum(sum(kinds.values()) for kinds in workload.errors.values()),
+            "dropped": workload.dropped,
+            "rps": round(len(all_latencies) / elapsed, 1),
+            "p50_ms": _percentile(all_latencies, 50) if all_latencies else None,
+            "p95_ms": _percentile(all_latencies, 95) if all_latencies else None,
+            "p99_ms": _percentile(all_latencies, 99) if all_latencies else None,
+        },
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"{report['mode']}, {report['duration_s']} s, {report['workers']} worker(s), db: {report['database']}")
+    print(f"{'endpoint':<10}{'requests':>10}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for kind, row in {**report["endpoints"], "total": report["total"]}.items():
+        print(
+            f"{kind:<10}{row['requests']:>10}{row['errors']:>8}{row['rps']:>9}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+        )
+    for kind, row in report["endpoints"].items():
+        if row["error_kinds"]:
+            print(f"{kind} errors: " + ", ".join(f"{name} x{n}" for name, n in row["error_kinds"].items()))
+    if report["total"]["dropped"]:
+        print(f"dropped (over --max-in-flight): {report['total']['dropped']}")
+
+
+async def run(args: argparse.Namespace, base_url: str, mix: dict[str, int] = DEFAULT_MIX) -> dict:
+    limits = httpx.Limits(max_connections=max(args.concurrency, args.max_in_flight))
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        workload = Workload(client, mix, args.seed)
+        await setup(workload, args.events, args.seed_joins)
+
+        async def phase(seconds: float) -> None:
+            until = time.perf_counter() + seconds
+            if args.rate:
+                await open_loop(workload, args.rate, until, args.max_in_flight)
+            else:
+                await closed_loop(workload, args.concurrency, until)
+
+        await phase(args.warmup)
+        workload.recording = True
+        started = time.perf_counter()
+        await phase(args.duration)
+        return build_report(workload, time.perf_counter() - started, args)
+
+
+def start_local(args: argparse.Namespace, servers: list[subprocess.Popen], env: Optional[dict] = None) -> str:
+    """Start the Places stub and the API (appended to `servers`); returns the API base URL."""
+    stub_port, api_port = _free_port(), _free_port()
+    servers.append(_start_server(
+        "benchmarks.places_stub:app", stub_port, {"PLACES_STUB_LATENCY_MS": str(args.places_latency_ms)}
+    ))
+    database_url = args.database_url or (
+        f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(prefix='midway-load-'), 'load.db')}"
+    )
+    servers.append(_start_server("main:app", api_port, {
+        "DATABASE_URL": database_url,
+        "DEBUG": "false",
+        "GOOGLE_PLACES_API_KEY": "stub",
+        # Every simulated client shares 127.0.0.1: measure capacity, not admission control
+        "RESULTS_RATE_LIMIT_ENABLED": "false",
+        "PLACES_API_URL": f"http://127.0.0.1:{stub_port}/maps/api/place/nearbysearch/json",
+        **(env or {}),
+    }, workers=args.workers))
+    base_url = f"http://127.0.0.1:{api_port}"
+    _wait_ready(f"http://127.0.0.1:{stub_port}/")
+    _wait_ready(f"{base_url}/health")
+    return base_url
+
+
+def main(args: argparse.Namespace) -> None:
+    servers: list[subprocess.Popen] = []
+    base_url = args.target
+    try:
+        if base_url is None:
+            base_url = start_local(args, servers)
+
+        report = asyncio.run(run(args, base_url))
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default=None, help="Base URL of a running API (skips starting servers)")
+    parser.add_argument("--database-url", default=None, help="Database for the local API (default: temp SQLite)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the local API")
+    parser.add_argument("--places-latency-ms", type=float, default=80.0, help="Places stub response delay")
+    parser.add_argument("--events", type=int, default=20, help="Events created during setup")
+    parser.add_argument("--seed-joins", type=int, default=10, help="Participants joined per event during setup")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds before the measurement")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clients in closed-loop mode")
+    parser.add_argument("--rate", type=float, default=None, help="Open-loop mode: requests started per second")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Open-loop cap on outstanding requests")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the report as JSON")
+    main(parser.parse_args())
@@ -0,0 +1,53 @@
+"""
+Local stand-in for the Google Places Nearby Search API, for load tests.
+
+Answers any GET with three canned restaurants after a fixed delay that
+mimics the real API's latency, so the results endpoint exercises its
+Places path without network calls or quota.
+
+Usage:
+    PLACES_STUB_LATENCY_MS=80 uvicorn benchmarks.places_stub:app --port 8090
+    # then run the API with
+    PLACES_API_URL=http://127.0.0.1:8090/maps/api/place/nearbysearch/json GOOGLE_PLACES_API_KEY=stub
+"""
+import asyncio
+import json
+import os
+
+LATENCY_SECONDS = float(os.environ.get("PLACES_STUB_LATENCY_MS", "80")) / 1000
+
+_BODY = json.dumps({
+    "status": "OK",
+    "results": [
+        {
+            "place_id": f"stub-{i}",
+            "name": name,
+            "types": ["restaurant", "food", "establishment"],
+            "vicinity": f"{i + 1} Stub Road",
+            "rating": rating,
+            "user_ratings_total": 1200 - i * 300,
+            "price_level": price,
+        }
+        for i, (name, rating, price) in enumerate([
+            ("Stub Brewpub", 4.5, 3),
+            ("Stub Cafe", 4.3, 2),
+            ("Stub Gastrobar", 4.1, 3),
+        ])
+    ],
+}).encode()
+
+
+async def app(scope, receive, send):
+    """Minimal ASGI app: every HTTP request gets the canned response."""
+    if scope["type"] == "lifespan":
+        while (await receive())["type"] != "lifespan.shutdown":
+            await send({"type": "lifespan.startup.complete"})
+        await send({"type": "lifespan.shutdown.complete"})
+        return
+    await asyncio.sleep(LATENCY_SECONDS)
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(_BODY)).encode())],
+    })
+    await send({"type": "http.response.body", "body": _BODY})
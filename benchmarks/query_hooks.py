@@ -0,0 +1,170 @@
+"""
+Overhead of the cursor hooks that count queries per request
+(app.core.query_budget) and time them into the `db` span (app.core.metrics).
+
+Each mode runs --statements `SELECT 1` round trips on one connection of its
+own SQLite engine, --rounds times, and keeps its fastest round:
+- bare: no hooks;
+- budget-idle: query budget hooks, no tracking block active (background work);
+- budget: query budget hooks inside a tracking block (a request);
+- budget+metrics: both hooks inside a request's tracking block and spans,
+  as with METRICS_ENABLED.
+
+`SELECT 1` is the cheapest statement there is, so the overhead measured
+here is an upper bound on its share of a real query. Reports microseconds
+per statement and the overhead over bare for each mode.
+
+An aiosqlite round trip is a few hundred microseconds with thread-hop
+jitter larger than the hooks themselves, so the hook functions are also
+called directly (`direct`: before + after per statement, same modes), which
+isolates their CPU cost.
+
+Usage:
+    python benchmarks/query_hooks.py
+    python benchmarks/query_hooks.py --statements 20000 --rounds 7 --output hooks.json
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ["DEBUG"] = "false"
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core import metrics, query_budget
+
+MODES = ("bare", "budget-idle", "budget", "budget+metrics")
+
+
+def engine_for(mode: str, path: str) -> AsyncEngine:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    if mode != "bare":
+        query_budget.instrument_engine(engine)
+    if mode == "budget+metrics":
+        metrics.instrument_engine(engine)
+    return engine
+
+
+async def time_mode(mode: str, path: str, statements: int) -> float:
+    """Seconds for `statements` round trips, one connection, hooks per `mode`."""
+    engine = engine_for(mode, path)
+    statement = text("SELECT 1")
+    spans_token = metrics._request_spans.set({}) if mode == "budget+metrics" else None
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(statement)  # connect and warm up outside the timing
+            with query_budget.track_queries() if mode in ("budget", "budget+metrics") else nullcontext():
+                gc.collect()
+                gc.disable()
+                try:
+                    t0 = time.perf_counter()
+                    for _ in range(statements):
+                        await conn.execute(statement)
+                    return time.perf_counter() - t0
+                finally:
+                    gc.enable()
+    finally:
+        if spans_token is not None:
+            metrics._request_spans.reset(spans_token)
+        await engine.dispose()
+
+
+class _Connection:
+    """Stands in for a SQLAlchemy Connection: the hooks only use `info`."""
+
+    def __init__(self) -> None:
+        self.info: dict = {}
+
+
+def time_hooks_directly(mode: str, statements: int) -> float:
+    """Seconds for `statements` before/after hook pairs, no database."""
+    hooks = []
+    if mode != "bare":
+        hooks.append((query_budget._before_cursor_execute, query_budget._after_cursor_execute))
+    if mode == "budget+metrics":
+        hooks.append((metrics._before_cursor_execute, metrics._after_cursor_execute))
+    conn, statement = _Connection(), "SELECT 1"
+    spans_token = metrics._request_spans.set({}) if mode == "budget+metrics" else None
+    try:
+        with query_budget.track_queries() if mode in ("budget", "budget+metrics") else nullcontext():
+            gc.collect()
+            gc.disable()
+            try:
+                t0 = time.perf_counter()
+                for _ in range(statements):
+                    for before, _after in hooks:
+                        before(conn, None, statement, (), None, False)
+                    for _before, after in hooks:
+                        after(conn, None, statement, (), None, False)
+                return time.perf_counter() - t0
+            finally:
+                gc.enable()
+    finally:
+        if spans_token is not None:
+            metrics._request_spans.reset(spans_token)
+
+
+def _report(best: dict[str, float], statements: int) -> dict:
+    bare_us = best["bare"] / statements * 1e6
+    report = {}
+    for mode, seconds in best.items():
+        per_statement_us = seconds / statements * 1e6
+        report[mode] = {
+            "us_per_statement": round(per_statement_us, 3),
+            "overhead_us": round(per_statement_us - bare_us, 3),
+        }
+        print(f"{mode:<16}{per_statement_us:>10.3f} us/statement{per_statement_us - bare_us:>+10.3f} us", file=sys.stderr)
+    return report
+
+
+async def main(args: argparse.Namespace) -> dict:
+    path = os.path.join(tempfile.mkdtemp(prefix="midway-hooks-"), "hooks.db")
+    best = {mode: float("inf") for mode in MODES}
+    # Modes are interleaved within each round, in a rotating order, so drift
+    # and position in the round hit them all alike
+    for round_number in range(1, args.rounds + 1):
+        print(f"round {round_number}/{args.rounds}", file=sys.stderr)
+        shift = round_number % len(MODES)
+        for mode in MODES[shift:] + MODES[:shift]:
+            best[mode] = min(best[mode], await time_mode(mode, path, args.statements))
+    print("through SQLite:", file=sys.stderr)
+    sqlite = _report(best, args.statements)
+
+    direct_statements = args.statements * 20
+    direct = {mode: float("inf") for mode in MODES}
+    for _ in range(args.rounds):
+        for mode in MODES:
+            direct[mode] = min(direct[mode], time_hooks_directly(mode, direct_statements))
+    print("hooks called directly:", file=sys.stderr)
+    return {
+        "statements": args.statements,
+        "rounds": args.rounds,
+        "sqlite": sqlite,
+        "direct": _report(direct, direct_statements),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--statements", type=int, default=5000, help="SELECT 1 round trips per mode and round")
+    parser.add_argument("--rounds", type=int, default=5, help="Passes over all modes; each mode keeps its fastest")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    output = json.dumps(asyncio.run(main(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
@@ -0,0 +1,348 @@
+"""
+Benchmark suite for the results algorithms and hot read paths.
+
+Cases (each at several scales):
+- find_overlap/<pattern>/<scale>        time sweep over generated slots
+- geometric_median/<scale>              Weiszfeld over participant coords
+- split_meeting_points/<scale>          k-medians split detection, all cities
+- location_search/<rows>                /locations/search handler on SQLite
+- results_pipeline/<scale>              compute_results on SQLite (no Places)
+- results_what_if/<scale>               one participant excluded, from a loaded base
+
+Scales are participants x slots each: small 10x2, medium 100x4, large 1000x8.
+Location search runs against the bundled areas repeated 1x/10x/100x.
+
+Every case reports median / p95 / min milliseconds. A scale whose time per
+call, projected linearly from the previous scale, would exceed --max-seconds
+is reported as skipped instead of run.
+
+The suite runs --rounds times over and every case keeps the round with its
+fastest run. The gate compares that minimum with a stored baseline
+minimum: scheduler and frequency noise only ever add time, so the fastest
+of many runs spread over the suite is far more stable than a median. A
+case is over the limit when it is slower than baseline * (1 + --threshold)
+AND by more than --noise-floor-ms, so sub-millisecond cases do not fail on
+a few microseconds of jitter; it is re-measured up to --confirm more times
+and the run exits 1 only if it stays over. Baselines are machine-specific: refresh
+benchmarks/baseline.json with --save-baseline on the machine that runs the
+comparison.
+
+Usage:
+    python benchmarks/run.py
+    python benchmarks/run.py --only find_overlap --output bench.json
+    python benchmarks/run.py --save-baseline
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# A throwaway SQLite database, and no live Places calls
+_DB_FILE = os.path.join(tempfile.mkdtemp(prefix="midway-bench-"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_FILE}"
+os.environ["GOOGLE_PLACES_API_KEY"] = ""
+os.environ["DEBUG"] = "false"
+
+from sqlalchemy import insert
+
+from app.core.db import async_session, init_db
+from app.models import Availability, Event, Location, Participant
+from app.routers.locations import search_locations
+from app.services.algorithm_service import calculate_geometric_median, find_overlap, split_meeting_points
+from app.services.event_service import compute_results, load_results_base, results_from_base
+from benchmarks.generators import PATTERNS, load_locations, make_event
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+SCALES = {"small": (10, 2), "medium": (100, 4), "large": (1000, 8)}
+LOCATION_COPIES = {"339": 1, "3390": 10, "33900": 100}
+SEARCH_QUERIES = ["ko", "nagar", "Indira", "west", "xyz"]
+
+
+def _summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered), 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        "min_ms": round(ordered[0], 4),
+        "runs": len(ordered),
+    }
+
+
+async def measure(fn, repeat: int, max_seconds: float) -> dict:
+    """
+    Time `fn` (sync or async) after one warm-up call; stop early past
+    max_seconds. As timeit does, the cyclic GC is off while a call is timed,
+    so a collection triggered by garbage from earlier cases is not charged
+    to whichever case happens to be running.
+    """
+    async def call():
+        result = fn()
+        if asyncio.iscoroutine(result):
+            await result
+
+    await call()
+    samples: list[float] = []
+    deadline = time.perf_counter() + max_seconds
+    while len(samples) < repeat and (len(samples) < 3 or time.perf_counter() < deadline):
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            await call()
+            samples.append((time.perf_counter() - t0) * 1000)
+        finally:
+            gc.enable()
+    return _summary(samples)
+
+
+@dataclass
+class Case:
+    name: str
+    size: int  # work units, for projecting this scale from the previous one
+    fn: Callable
+    setup: Optional[Callable[[], Awaitable[None]]] = None
+
+    @property
+    def family(self) -> str:
+        return self.name.rsplit("/", 1)[0]
+
+
+# --- case builders -------------------------------------------------------
+
+def overlap_cases() -> list[Case]:
+    cases = []
+    for pattern in PATTERNS:
+        for scale, (n, m) in SCALES.items():
+            availabilities = make_event(n, m, pattern=pattern).availabilities
+            cases.append(Case(f"find_overlap/{pattern}/{scale}", n * m, lambda a=availabilities: find_overlap(a)))
+    return cases
+
+
+def median_cases() -> list[Case]:
+    return [
+        Case(f"geometric_median/{scale}", n, lambda p=make_event(n, 0).participants: calculate_geometric_median(p))
+        for scale, (n, _) in SCALES.items()
+    ]
+
+
+def split_cases() -> list[Case]:
+    return [
+        Case(f"split_meeting_points/{scale}", n, lambda p=make_event(n, 0).participants: split_meeting_points(p))
+        for scale, (n, _) in SCALES.items()
+    ]
+
+
+async def _insert_locations(rows: list[dict], copies: int) -> None:
+    async with async_session() as session:
+        await session.execute(Location.__table__.delete())
+        await session.execute(insert(Location), [
+            {**row, "area_name": row["area_name"] if i == 0 else f"{row['area_name']} {i}"}
+            for i in range(copies)
+            for row in rows
+        ])
+        await session.commit()
+
+
+async def _search_all() -> None:
+    async with async_session() as session:
+        for q in SEARCH_QUERIES:
+            await search_locations(q=q, city=None, session=session)
+
+
+def search_cases(rows: list[dict]) -> list[Case]:
+    return [
+        Case(f"location_search/{label}", len(rows) * copies, _search_all,
+             setup=lambda copies=copies: _insert_locations(rows, copies))
+        for label, copies in LOCATION_COPIES.items()
+    ]
+
+
+async def _seed_event(n: int, m: int, seed: int) -> Event:
+    synthetic = make_event(n, m, pattern="grid", seed=seed)
+    async with async_session() as session:
+        session.add(synthetic.event)
+        await session.flush()
+        await session.execute(insert(Participant), [p.model_dump() for p in synthetic.participants])
+        await session.execute(insert(Availability), [a.model_dump() for a in synthetic.availabilities])
+        await session.commit()
+    return synthetic.event
+
+
+def pipeline_cases() -> list[Case]:
+    cases = []
+    for seed, (scale, (n, m)) in enumerate(SCALES.items()):
+        seeded: dict = {}
+
+        async def setup(n=n, m=m, seed=seed, seeded=seeded):
+            if "event" not in seeded:  # once, not every round
+                seeded["event"] = await _seed_event(n, m, seed)
+
+        async def run(seeded=seeded):
+            async with async_session() as session:
+                await compute_results(session, seeded["event"])
+
+        cases.append(Case(f"results_pipeline/{scale}", n * m, run, setup=setup))
+    return cases
+
+
+def what_if_cases() -> list[Case]:
+    cases = []
+    for seed, (scale, (n, m)) in enumerate(SCALES.items()):
+        loaded: dict = {}
+
+        async def setup(n=n, m=m, seed=seed + len(SCALES), loaded=loaded):
+            if "base" in loaded:
+                return
+            event = await _seed_event(n, m, seed)
+            async with async_session() as session:
+                loaded["base"] = await load_results_base(session, event)
+            loaded["exclude"] = {loaded["base"].participants[0].id}
+
+        def run(loaded=loaded):
+            results_from_base(loaded["base"], exclude=loaded["exclude"])
+
+        cases.append(Case(f"results_what_if/{scale}", n * m, run, setup=setup))
+    return cases
+
+
+# --- baseline ------------------------------------------------------------
+
+def compare(results: dict, baseline: dict, threshold: float, noise_floor_ms: float) -> list[dict]:
+    regressions = []
+    for name, stats in results.items():
+        before = baseline.get(name)
+        if before is None or "min_ms" not in stats:
+            continue
+        after = stats["min_ms"]
+        if after > before * (1 + threshold) and after - before > noise_floor_ms:
+            regressions.append({
+                "case": name,
+                "baseline_ms": before,
+                "min_ms": after,
+                "ratio": round(after / before, 2),
+            })
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> int:
+    await init_db()
+    results: dict[str, dict] = {}
+
+    # Last measured (size, seconds per call) per case family; a larger scale
+    # whose linear projection from it exceeds --max-seconds is skipped.
+    last_measured: dict[str, tuple[int, float]] = {}
+
+    rows = load_locations()
+    cases = overlap_cases() + median_cases() + split_cases() + search_cases(rows) + pipeline_cases() + what_if_cases()
+    if args.only:
+        cases = [case for case in cases if any(case.name.startswith(prefix) for prefix in args.only)]
+    # The whole suite runs --rounds times, so a case's rounds are spread
+    # over the run rather than back to back; each case keeps its best round.
+    for round_number in range(1, args.rounds + 1):
+        print(f"round {round_number}/{args.rounds}", file=sys.stderr)
+        for case in cases:
+            if "skipped" in results.get(case.name, {}):
+                continue
+            if round_number == 1 and case.family in last_measured:
+                size, seconds = last_measured[case.family]
+                projected = seconds * case.size / size
+                if projected > args.max_seconds:
+                    results[case.name] = {"skipped": f"projected {projected:.1f} s per call from the previous scale"}
+                    print(f"{case.name:<36}{'skipped':>15}", file=sys.stderr)
+                    continue
+            if case.setup is not None:
+                await case.setup()
+            stats = await measure(case.fn, args.repeat, args.max_seconds)
+            last_measured[case.family] = (case.size, stats["median_ms"] / 1000)
+            print(f"{case.name:<36}{stats['median_ms']:>12.3f} ms median{stats['min_ms']:>12.3f} ms min", file=sys.stderr)
+            best = results.get(case.name)
+            if best is None or stats["min_ms"] < best["min_ms"]:
+                results[case.name] = stats
+            results[case.name]["rounds"] = round_number
+
+    baseline: dict = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("min_ms", {})
+    regressions = compare(results, baseline, args.threshold, args.noise_floor_ms)
+    # A flagged case gets --confirm more rounds of its own before it fails
+    # the run: a regression repeats, a slow spell of a shared machine (which
+    # can last several seconds) does not, hence the pause before each.
+    by_name = {case.name: case for case in cases}
+    for _ in range(args.confirm if not args.save_baseline else 0):
+        if not regressions:
+            break
+        await asyncio.sleep(args.confirm_delay)
+        for regression in regressions:
+            case = by_name[regression["case"]]
+            if case.setup is not None:
+                await case.setup()
+            stats = await measure(case.fn, args.repeat, args.max_seconds)
+            print(f"{case.name:<36}{stats['median_ms']:>12.3f} ms median{stats['min_ms']:>12.3f} ms min (confirm)", file=sys.stderr)
+            if stats["min_ms"] < results[case.name]["min_ms"]:
+                results[case.name] = {**stats, "rounds": results[case.name]["rounds"] + 1}
+            else:
+                results[case.name]["rounds"] += 1
+        regressions = compare(results, baseline, args.threshold, args.noise_floor_ms)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "threshold": args.threshold,
+            "noise_floor_ms": args.noise_floor_ms,
+        },
+        "results": results,
+        "regressions": regressions,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            minimums = {name: stats["min_ms"] for name, stats in results.items() if "min_ms" in stats}
+            json.dump({"meta": report["meta"], "min_ms": minimums}, f, indent=2)
+            f.write("\n")
+
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['case']}: {regression['min_ms']} ms vs baseline "
+            f"{regression['baseline_ms']} ms ({regression['ratio']}x)",
+            file=sys.stderr,
+        )
+    return 1 if regressions and not args.save_baseline else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=30, help="Timed runs per case and round")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the whole suite; each case keeps its fastest")
+    parser.add_argument("--confirm", type=int, default=2, help="Extra rounds for a case before it is reported as a regression")
+    parser.add_argument("--confirm-delay", type=float, default=15.0, help="Seconds to wait before each confirming round")
+    parser.add_argument("--max-seconds", type=float, default=3.0, help="Time budget per case; also the skip limit for projected calls")
+    parser.add_argument("--only", nargs="*", default=None, help="Case name prefixes to run")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--noise-floor-ms", type=float, default=0.25, help="Slowdowns smaller than this never fail the gate")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run's minimums as the baseline")
+    parser.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+    sys.exit(asyncio.run(main(parser.parse_args())))
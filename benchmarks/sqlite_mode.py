@@ -0,0 +1,97 @@
+"""
+Compare join and results throughput on SQLite with the tuned mode
+(SQLITE_TUNED: WAL, pragmas, one writer connection plus query-only
+readers) against SQLAlchemy's defaults.
+
+Each mode x scenario runs against a fresh SQLite file with a local API and
+Places stub (see loadtest.py), as a closed loop of --concurrency clients:
+- join: only joins (a burst of writes);
+- results: only results reads;
+- mixed: joins and results half and half, so reads run against writes.
+
+Reports requests per second, errors and p50/p99 latency for each run and
+the tuned/default throughput ratio per scenario.
+
+Usage:
+    python benchmarks/sqlite_mode.py --duration 10 --concurrency 32
+    python benchmarks/sqlite_mode.py --workers 2 --output sqlite_mode.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.loadtest import run, start_local
+
+MODES = {"default": {"SQLITE_TUNED": "false"}, "tuned": {"SQLITE_TUNED": "true"}}
+SCENARIOS = {
+    "join": {"join": 1},
+    "results": {"results": 1},
+    "mixed": {"join": 1, "results": 1},
+}
+
+
+def run_case(args: argparse.Namespace, env: dict, mix: dict[str, int]) -> dict:
+    servers: list[subprocess.Popen] = []
+    try:
+        base_url = start_local(args, servers, env)
+        report = asyncio.run(run(args, base_url, mix))
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+    total = report["total"]
+    return {
+        "rps": total["rps"],
+        "errors": total["errors"],
+        "p50_ms": total["p50_ms"],
+        "p99_ms": total["p99_ms"],
+        "endpoints": {kind: row["rps"] for kind, row in report["endpoints"].items()},
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    # Fields loadtest.run/start_local read that this script does not expose
+    args.target, args.database_url, args.rate, args.max_in_flight = None, None, None, args.concurrency
+
+    results: dict[str, dict[str, dict]] = {}
+    for scenario in args.scenarios:
+        results[scenario] = {}
+        for mode, env in MODES.items():
+            row = results[scenario][mode] = run_case(args, env, SCENARIOS[scenario])
+            print(
+                f"{scenario:<8}{mode:<9}{row['rps']:>9} rps{row['errors']:>7} errors"
+                f"{row['p50_ms']:>10} p50 ms{row['p99_ms']:>10} p99 ms",
+                flush=True,
+            )
+        default_rps = results[scenario]["default"]["rps"]
+        if default_rps:
+            ratio = round(results[scenario]["tuned"]["rps"] / default_rps, 2)
+            results[scenario]["tuned_vs_default"] = ratio
+            print(f"{scenario:<8}tuned/default throughput: {ratio}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"workers": args.workers, "concurrency": args.concurrency, "scenarios": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the local API")
+    parser.add_argument("--places-latency-ms", type=float, default=0.0, help="Places stub response delay")
+    parser.add_argument("--events", type=int, default=20, help="Events created during setup")
+    parser.add_argument("--seed-joins", type=int, default=10, help="Participants joined per event during setup")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per run")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each measurement")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the results as JSON")
+    main(parser.parse_args())
@@ -25,6 +25,7 @@ export default function EventPage({ params }: { params: { slug: string } }) {
     const router = useRouter();
     const [name, setName] = useState('');
     const [location, setLocation] = useState('');
+    const [locationId, setLocationId] = useState<number | undefined>();
     const [availabilities, setAvailabilities] = useState<Availability[]>([]);
     const [hasJoined, setHasJoined] = useState(false);
     const [hasDeclined, setHasDeclined] = useState(false);
@@ -73,6 +74,7 @@ export default function EventPage({ params }: { params: { slug: string } }) {
         const participantData: ParticipantCreate = {
             name,
             location_name: location,
+            location_id: locationId,
             is_host: false,
             availabilities,
         };
@@ -240,7 +242,10 @@ export default function EventPage({ params }: { params: { slug: string } }) {
                                     </label>
                                     <LocationCombobox
                                         value={location}
-                                        onChange={setLocation}
+                                        onChange={(value, id) => {
+                                            setLocation(value);
+                                            setLocationId(id);
+                                        }}
                                         required
                                     />
                                 </div>
@@ -1,6 +1,7 @@
 'use client';
 
-import { useQuery } from '@tanstack/react-query';
+import { useEffect } from 'react';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
 import { useRouter } from 'next/navigation';
 import { format } from 'date-fns';
 import { parseAsUTC } from '@/lib/date-utils';
@@ -25,10 +26,21 @@ import {
     CardTitle,
 } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
-import { getResults, getEvent } from '@/lib/api';
+import { getResults, getEvent, subscribeToEvent } from '@/lib/api';
 
 export default function ResultsPage({ params }: { params: { slug: string } }) {
     const router = useRouter();
+    const queryClient = useQueryClient();
+
+    // Keep results live: the server pushes a recomputed snapshot on every join/decline
+    useEffect(() => {
+        return subscribeToEvent(params.slug, (update) => {
+            queryClient.setQueryData(['event', params.slug], update.event);
+            if (update.results) {
+                queryClient.setQueryData(['results', params.slug], update.results);
+            }
+        });
+    }, [params.slug, queryClient]);
 
     const { data: results, isLoading: resultsLoading } = useQuery({
         queryKey: ['results', params.slug],
@@ -2,11 +2,12 @@
 
 import { useState, useRef, useEffect, useCallback } from 'react';
 import { MapPin, Loader2, ChevronDown } from 'lucide-react';
-import { searchLocations, LocationResult } from '@/lib/api';
+import { searchLocations, resolveLocations, LocationResult } from '@/lib/api';
 
 interface LocationComboboxProps {
     value: string;
-    onChange: (value: string) => void;
+    // locationId is the chosen Location's id, sent as location_id on join
+    onChange: (value: string, locationId?: number) => void;
     required?: boolean;
 }
 
@@ -74,11 +75,23 @@ export function LocationCombobox({ value, onChange, required }: LocationCombobox
     const selectLocation = useCallback((loc: LocationResult) => {
         const displayValue = `${loc.area_name}, ${loc.city}`;
         setInputValue(displayValue);
-        onChange(displayValue);
+        onChange(displayValue, loc.id);
         setIsOpen(false);
         setResults([]);
     }, [onChange]);
 
+    // A name typed out in full without picking it from the list still
+    // counts as a choice if it resolves to a known area
+    const resolveTyped = useCallback(() => {
+        const typed = inputValue.trim();
+        if (typed.length < 2 || typed === value) return;
+        resolveLocations([typed])
+            .then(([match]) => {
+                if (match?.location) selectLocation(match.location);
+            })
+            .catch(() => {});
+    }, [inputValue, value, selectLocation]);
+
     const handleKeyDown = (e: React.KeyboardEvent<HTMLInputElement>) => {
         if (!isOpen) return;
 
@@ -123,6 +136,7 @@ export function LocationCombobox({ value, onChange, required }: LocationCombobox
                         onChange('');
                     }}
                     onKeyDown={handleKeyDown}
+                    onBlur={resolveTyped}
                     onFocus={() => {
                         if (results.length > 0) setIsOpen(true);
                     }}
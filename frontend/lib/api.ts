@@ -7,6 +7,7 @@ import type {
     DeclineCreate,
     Participant,
     Results,
+    EventUpdate,
 } from '@/types';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
@@ -18,6 +19,20 @@ const apiClient = axios.create({
     },
 });
 
+// Read-your-writes: right after a join/decline, read that event from the
+// primary database in case the backend's read replica is lagging.
+const READ_PRIMARY_WINDOW_MS = 5000;
+const recentWrites = new Map<string, number>();
+
+const markWritten = (slug: string) => {
+    recentWrites.set(slug, Date.now() + READ_PRIMARY_WINDOW_MS);
+};
+
+const readHeaders = (slug: string): Record<string, string> | undefined =>
+    (recentWrites.get(slug) ?? 0) > Date.now()
+        ? { 'X-Read-Consistency': 'primary' }
+        : undefined;
+
 // Event APIs
 export const createEvent = async (data: EventCreate): Promise<Event> => {
     const response = await apiClient.post<Event>('/api/events/', data);
@@ -25,7 +40,9 @@ export const createEvent = async (data: EventCreate): Promise<Event> => {
 };
 
 export const getEvent = async (slug: string): Promise<EventDetail> => {
-    const response = await apiClient.get<EventDetail>(`/api/events/${slug}`);
+    const response = await apiClient.get<EventDetail>(`/api/events/${slug}`, {
+        headers: readHeaders(slug),
+    });
     return response.data;
 };
 
@@ -38,6 +55,7 @@ export const joinEvent = async (
         `/api/events/${slug}/join`,
         data
     );
+    markWritten(slug);
     return response.data;
 };
 
@@ -49,15 +67,31 @@ export const declineEvent = async (
         `/api/events/${slug}/decline`,
         data
     );
+    markWritten(slug);
     return response.data;
 };
 
 // Results APIs
 export const getResults = async (slug: string): Promise<Results> => {
-    const response = await apiClient.get<Results>(`/api/events/${slug}/results`);
+    const response = await apiClient.get<Results>(`/api/events/${slug}/results`, {
+        headers: readHeaders(slug),
+    });
     return response.data;
 };
 
+// Live updates: pushes fresh event detail + results after every join/decline.
+// Returns an unsubscribe function.
+export const subscribeToEvent = (
+    slug: string,
+    onUpdate: (update: EventUpdate) => void
+): (() => void) => {
+    const source = new EventSource(`${API_BASE_URL}/api/events/${slug}/stream`);
+    source.addEventListener('update', (e) => {
+        onUpdate(JSON.parse((e as MessageEvent).data) as EventUpdate);
+    });
+    return () => source.close();
+};
+
 // Location search
 export interface LocationResult {
     id: number;
@@ -77,4 +111,15 @@ export const searchLocations = async (
     return response.data;
 };
 
+export interface LocationResolution {
+    name: string;
+    location: LocationResult | null;
+}
+
+// Resolve several names in one call (exact area name or "Area, City")
+export const resolveLocations = async (names: string[]): Promise<LocationResolution[]> => {
+    const response = await apiClient.post<LocationResolution[]>('/api/locations/resolve', { names });
+    return response.data;
+};
+
 export default apiClient;
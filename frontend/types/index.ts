@@ -15,8 +15,15 @@ export interface EventCreate {
     window_end: string;
 }
 
+export interface ParticipantSummary {
+    joined: number;
+    declined: number;
+}
+
 export interface EventDetail extends Event {
     participants: ParticipantBasic[];
+    summary: ParticipantSummary;
+    next_cursor: string | null; // set when ?limit= returned one page
 }
 
 // Participant types
@@ -39,11 +46,25 @@ export interface Availability {
     end_time: string;
 }
 
+export type RecurrenceDay =
+    | 'mon' | 'tue' | 'wed' | 'thu' | 'fri' | 'sat' | 'sun'
+    | 'weekdays' | 'weekends' | 'daily';
+
+// Weekly recurring slot, e.g. weekdays 18:00-22:00 within the event window
+export interface Recurrence {
+    days: RecurrenceDay[];
+    start_time: string; // "HH:MM"
+    end_time: string;
+    end_day_offset?: number;
+}
+
 export interface ParticipantCreate {
     name: string;
     location_name: string;
+    location_id?: number; // chosen location; skips name resolution on join
     is_host?: boolean;
     availabilities: Availability[];
+    recurrences?: Recurrence[];
 }
 
 export interface DeclineCreate {
@@ -63,6 +84,24 @@ export interface SuggestedLocation {
     neighborhood: string;
 }
 
+export interface MeetingArea {
+    id: number;
+    city: string;
+    area_name: string;
+    lat: number;
+    lng: number;
+    total_km: number;
+    max_km: number;
+}
+
+export interface MeetingCluster {
+    lat: number;
+    lng: number;
+    neighborhood: string;
+    participant_ids: string[];
+    total_km: number;
+}
+
 export interface VenueRecommendation {
     name: string;
     type: string;
@@ -79,4 +118,11 @@ export interface Results {
     suggested_location: SuggestedLocation | null;
     venue_recommendations: VenueRecommendation[];
     total_participants: number;
+    meeting_areas: MeetingArea[];
+    meeting_clusters: MeetingCluster[];
+}
+
+export interface EventUpdate {
+    event: EventDetail;
+    results: Results | null;
 }
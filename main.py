@@ -1,52 +1,60 @@
-import json
-import os
+import time
+
+IMPORT_START = time.perf_counter()
+
+import asyncio
+import logging
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
-from sqlmodel import select
 
 from app.core.config import settings
-from app.core.db import init_db, async_session
-from app.models.location import Location
-from app.routers import events, locations
+from app.core.db import BUSY_DATABASE_ERRORS, database_busy_handler, engine, read_engine
+from app.core.metrics import MetricsMiddleware, instrument_engine, render_metrics
+from app.core.profiler import ProfilerMiddleware
+from app.core.query_budget import QueryBudgetMiddleware
+from app.core import rate_limit
+from app.core.startup import attach_location_snapshot, log_since_start, phase, prepare_database
+from app.routers import debug, events, locations
+from app.services import location_snapshot
+from app.services.event_stream import broker
 
+IMPORT_MS = (time.perf_counter() - IMPORT_START) * 1000
 
-async def auto_seed_locations():
-    """
-    Populate the locations table from the bundled JSON if it is empty.
-    Runs once on startup — safe to call on every deploy.
-    """
-    data_file = os.path.join(os.path.dirname(__file__), "scripts", "locations_data.json")
-    if not os.path.exists(data_file):
-        return
-
-    async with async_session() as session:
-        result = await session.execute(select(Location).limit(1))
-        if result.scalar_one_or_none() is not None:
-            return  # Already seeded
+logger = logging.getLogger(__name__)
 
-        with open(data_file) as f:
-            data = json.load(f)
 
-        for row in data:
-            session.add(Location(
-                city=row["city"],
-                area_name=row["area_name"],
-                lat=row["lat"],
-                lng=row["lng"],
-            ))
-        await session.commit()
-        print(f"[startup] Seeded {len(data)} locations.")
+async def deferred_startup(snapshot_needed: bool):
+    """
+    Startup work that can finish while requests are already being served.
+    Phases are independent: one failing is logged and the rest still run.
+    """
+    phases = [("stream broker", broker.start), ("rate limit backend", rate_limit.backend.start)]
+    if snapshot_needed:
+        phases.append(("location snapshot build", location_snapshot.load_in_memory))
+    for name, start in phases:
+        try:
+            with phase(name):
+                await start()
+        except Exception:
+            logger.exception("Deferred startup phase %r failed", name)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan events for the application."""
-    await init_db()
-    await auto_seed_locations()
+    print(f"[startup] imports: {IMPORT_MS:.1f} ms")
+    await prepare_database()
+    snapshot_attached = attach_location_snapshot()
+    deferred = asyncio.create_task(deferred_startup(snapshot_needed=not snapshot_attached))
+    log_since_start("accepting requests")
     yield
-    # Shutdown: Clean up resources if needed
+    # Shutdown: let deferred work finish, then clean up
+    await deferred
+    await broker.stop()
+    await rate_limit.backend.stop()
 
 
 app = FastAPI(
@@ -56,6 +64,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Write contention (a busy SQLite writer) answers 503 + Retry-After, not 500
+for busy_error in BUSY_DATABASE_ERRORS:
+    app.add_exception_handler(busy_error, database_busy_handler)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -65,20 +77,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request timing: Server-Timing header per response, histograms on /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+    instrument_engine(read_engine)  # no-op when it is the primary
+
+# Log routes that go over their SQL query budget (see QUERY_BUDGET_* settings)
+app.add_middleware(QueryBudgetMiddleware)
+
+# Sampling profiler: inert until armed (PROFILER_ENABLED or /api/debug/profile/arm)
+app.add_middleware(ProfilerMiddleware)
+
 # Register routers
 app.include_router(events.router, prefix="/api")
 app.include_router(locations.router, prefix="/api")
+# Admin-only (X-Admin-Token); every call is refused while ADMIN_TOKEN is unset
+app.include_router(debug.router, prefix="/api")
+
+
+_health_served = False
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
+    global _health_served
+    if not _health_served:
+        _health_served = True
+        log_since_start("first /health response")
     return {
         "status": "healthy",
         "service": settings.PROJECT_NAME
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus-format request and span metrics for this worker."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
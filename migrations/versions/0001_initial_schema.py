@@ -0,0 +1,78 @@
+"""Initial schema, as previously produced by SQLModel.metadata.create_all
+
+Databases created before migrations were introduced already match this
+revision; `init_db` stamps them at 0001 instead of re-running it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "events",
+        sa.Column("id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("slug", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(length=200), nullable=False),
+        sa.Column("window_start", sa.DateTime(), nullable=False),
+        sa.Column("window_end", sa.DateTime(), nullable=False),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_event_slug", "events", ["slug"])
+    op.create_index("ix_events_slug", "events", ["slug"], unique=True)
+
+    op.create_table(
+        "locations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("city", sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+        sa.Column("area_name", sqlmodel.sql.sqltypes.AutoString(length=200), nullable=False),
+        sa.Column("lat", sa.Float(), nullable=False),
+        sa.Column("lng", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_locations_area_name", "locations", ["area_name"])
+    op.create_index("ix_locations_city", "locations", ["city"])
+
+    op.create_table(
+        "participants",
+        sa.Column("id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("event_id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("name", sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+        sa.Column("is_host", sa.Boolean(), nullable=False),
+        sa.Column("declined", sa.Boolean(), nullable=False),
+        sa.Column("location_name", sqlmodel.sql.sqltypes.AutoString(length=200), nullable=False),
+        sa.Column("lat", sa.Float(), nullable=True),
+        sa.Column("lng", sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_participants_event_id", "participants", ["event_id"])
+
+    op.create_table(
+        "availabilities",
+        sa.Column("id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("participant_id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["participant_id"], ["participants.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_availabilities_participant_id", "availabilities", ["participant_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("availabilities")
+    op.drop_table("participants")
+    op.drop_table("locations")
+    op.drop_table("events")
@@ -0,0 +1,67 @@
+"""Tune indexes for the get_event, get_results and search_locations queries
+
+- Drop the redundant non-unique `ix_event_slug`; the unique `ix_events_slug`
+  already serves every slug lookup.
+- Replace the single-column foreign-key indexes with composites that match
+  how the rows are actually read:
+    participants (event_id, declined)
+    availabilities (participant_id, start_time) INCLUDE (end_time) on Postgres
+- On Postgres, add a pg_trgm GIN index so `area_name ILIKE '%q%'` in
+  search_locations (and the exact ILIKE in join_event) can use an index.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    op.drop_index("ix_event_slug", table_name="events", if_exists=True)
+
+    op.create_index(
+        "ix_participants_event_id_declined",
+        "participants",
+        ["event_id", "declined"],
+    )
+    op.drop_index("ix_participants_event_id", table_name="participants", if_exists=True)
+
+    op.create_index(
+        "ix_availabilities_participant_id_start_time",
+        "availabilities",
+        ["participant_id", "start_time"],
+        postgresql_include=["end_time"],
+    )
+    op.drop_index("ix_availabilities_participant_id", table_name="availabilities", if_exists=True)
+
+    if _is_postgres():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_locations_area_name_trgm",
+            "locations",
+            ["area_name"],
+            postgresql_using="gin",
+            postgresql_ops={"area_name": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        op.drop_index("ix_locations_area_name_trgm", table_name="locations", if_exists=True)
+
+    op.create_index("ix_availabilities_participant_id", "availabilities", ["participant_id"])
+    op.drop_index("ix_availabilities_participant_id_start_time", table_name="availabilities")
+
+    op.create_index("ix_participants_event_id", "participants", ["event_id"])
+    op.drop_index("ix_participants_event_id_declined", table_name="participants")
+
+    op.create_index("ix_event_slug", "events", ["slug"])
@@ -0,0 +1,31 @@
+"""Add app_meta for the boot stamp
+
+Startup compares one row here ("boot_stamp": schema head + location seed
+version) against the code. When they match it skips Alembic and the
+seeding check entirely.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "app_meta",
+        sa.Column("key", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column("value", sqlmodel.sql.sqltypes.AutoString(length=200), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("app_meta")
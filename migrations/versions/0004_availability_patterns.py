@@ -0,0 +1,40 @@
+"""Add availability_patterns for recurring availability
+
+One row per weekly pattern (start days as a bit mask, start time of day,
+duration). Patterns are expanded over the event window when results are
+computed, so a week of evenings is one row instead of five availabilities.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "availability_patterns",
+        sa.Column("id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("participant_id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("weekdays", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.Time(), nullable=False),
+        sa.Column("duration_minutes", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["participant_id"], ["participants.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_availability_patterns_participant_id",
+        "availability_patterns",
+        ["participant_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("availability_patterns")
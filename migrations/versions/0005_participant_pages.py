@@ -0,0 +1,24 @@
+"""Index participants by (event_id, id) for keyset pages
+
+GET /events/{slug}?limit=&cursor= (and the streamed detail) reads an
+event's participants in id order after a cursor; this index turns each
+page into a range scan instead of sorting the whole event.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_participants_event_id_id", "participants", ["event_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_participants_event_id_id", table_name="participants")
@@ -0,0 +1,26 @@
+"""Add participants.updated_at
+
+Set when a participant row is written and on every update. With the row
+count it fingerprints an event's participants, so the what-if results
+cache can tell a stale base from a current one with one query. Rows from
+before this revision keep NULL, which max() ignores.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("participants", sa.Column("updated_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("participants", "updated_at")
@@ -0,0 +1,158 @@
+"""
+Micro-benchmark: serialization time per response for the event detail,
+results and location search endpoints.
+
+Compares the previous path (validated models built from ORM objects ->
+FastAPI response_model re-validation -> stdlib JSON) with the fast path the
+handlers use now (plain dicts from column tuples -> pre-built
+TypeAdapter.dump_json). No database is needed; rows are built in memory, so
+the cheaper column-tuple load itself is not included in the numbers.
+
+Usage:
+    python scripts/bench_serialization.py
+    python scripts/bench_serialization.py --participants 500 --repeat 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import json_response
+from app.models.event import Event
+from app.models.location import Location
+from app.models.participant import Participant
+from app.routers.events import _results_adapter
+from app.schemas.event import EventDetailResponse, ParticipantBasic, ParticipantSummary
+from app.schemas.results import ResultsResponse, SuggestedLocation, SuggestedTime
+from app.services.event_service import event_detail_dict, static_venue_recommendations
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "locations_data.json")
+
+
+def make_rows(n_participants: int):
+    with open(DATA_FILE) as f:
+        locations = [Location(id=i + 1, **row) for i, row in enumerate(json.load(f))]
+    start = datetime(2026, 1, 17, 18, 0)
+    event = Event(slug="bench001", title="Company offsite", window_start=start, window_end=start + timedelta(hours=6))
+    participants = [
+        Participant(
+            id=uuid4(), event_id=event.id, name=f"Participant {i}",
+            location_name=locations[i % len(locations)].area_name,
+            is_host=i == 0, declined=i % 10 == 9,
+            lat=locations[i % len(locations)].lat, lng=locations[i % len(locations)].lng,
+        )
+        for i in range(n_participants)
+    ]
+    results = ResultsResponse(
+        event_title=event.title,
+        suggested_time=SuggestedTime(start=start, end=start + timedelta(hours=2), participant_count=n_participants),
+        suggested_location=SuggestedLocation(lat=12.97, lng=77.59, neighborhood="Indiranagar"),
+        venue_recommendations=static_venue_recommendations(),
+        total_participants=n_participants,
+    )
+    return event, participants, results, locations[:10]
+
+
+# --- previous code paths -------------------------------------------------
+
+def legacy_event_detail(event, participants) -> EventDetailResponse:
+    return EventDetailResponse(
+        id=event.id, slug=event.slug, title=event.title,
+        window_start=event.window_start, window_end=event.window_end,
+        status=event.status, created_at=event.created_at,
+        participants=[
+            ParticipantBasic(id=p.id, name=p.name, location_name=p.location_name,
+                             is_host=p.is_host, declined=p.declined)
+            for p in participants
+        ],
+        summary=ParticipantSummary(
+            joined=sum(not p.declined for p in participants),
+            declined=sum(p.declined for p in participants),
+        ),
+    )
+
+
+def legacy_search(locations) -> list[dict]:
+    return [
+        {"id": loc.id, "city": loc.city, "area_name": loc.area_name, "lat": loc.lat, "lng": loc.lng}
+        for loc in locations
+    ]
+
+
+async def legacy_render(field, content) -> bytes:
+    """What FastAPI does with a non-Response return value and a response_model."""
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+# --- timing --------------------------------------------------------------
+
+async def time_it(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        body = await fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return {"median_ms": round(statistics.median(samples), 4), "bytes": len(body)}
+
+
+async def main(args: argparse.Namespace) -> None:
+    event, participants, results, locations = make_rows(args.participants)
+    # What the column selects return
+    participant_rows = [(p.id, p.name, p.location_name, p.is_host, p.declined) for p in participants]
+    location_rows = [(loc.id, loc.city, loc.area_name, loc.lat, loc.lng) for loc in locations]
+    location_keys = ("id", "city", "area_name", "lat", "lng")
+    detail_field = create_response_field(name="detail", type_=EventDetailResponse)
+    results_field = create_response_field(name="results", type_=ResultsResponse)
+    search_field = create_response_field(name="search", type_=List[dict])
+
+    cases = {
+        "event_detail": (
+            lambda: legacy_render(detail_field, legacy_event_detail(event, participants)),
+            lambda: _async(json_response(event_detail_dict(event, participant_rows)).body),
+        ),
+        "results": (
+            lambda: legacy_render(results_field, results),
+            lambda: _async(json_response(results, _results_adapter).body),
+        ),
+        "search_locations": (
+            lambda: legacy_render(search_field, legacy_search(locations)),
+            lambda: _async(json_response([dict(zip(location_keys, row)) for row in location_rows]).body),
+        ),
+    }
+
+    report = {"participants": args.participants, "repeat": args.repeat, "endpoints": {}}
+    print(f"{'endpoint':<20}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name, (before, after) in cases.items():
+        b = await time_it(before, args.repeat)
+        a = await time_it(after, args.repeat)
+        report["endpoints"][name] = {"before": b, "after": a}
+        print(f"{name:<20}{b['median_ms']:>12}{a['median_ms']:>12}{b['median_ms'] / a['median_ms']:>9.1f}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+async def _async(value):
+    return value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--output", default=None, help="Write timings as JSON")
+    asyncio.run(main(parser.parse_args()))
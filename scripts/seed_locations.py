@@ -14,19 +14,17 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlmodel import SQLModel, delete, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import delete
 
-from app.core.db import engine, async_session
+from app.core.db import engine, async_session, init_db
 from app.models.location import Location
 
 DATA_FILE = os.path.join(os.path.dirname(__file__), "locations_data.json")
 
 
 async def seed():
-    # Ensure table exists
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+    # Ensure the schema is at the latest migration
+    await init_db()
 
     with open(DATA_FILE, "r") as f:
         data = json.load(f)
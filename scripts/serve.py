@@ -0,0 +1,104 @@
+"""
+Multi-worker launcher sharing one read-only location snapshot.
+
+Before any worker starts, this process migrates and seeds the database if
+the boot stamp is stale, then compiles the locations table and the mock
+geocoding aliases into a binary snapshot file. Workers are started with
+LOCATION_SNAPSHOT_PATH pointing at it and memory-map it at startup, so the
+reference data lives once in the page cache instead of once per worker and
+no worker queries the locations table for search, joins or bulk imports.
+
+Live-stream fan-out and /results rate-limit buckets are per process unless
+STREAM_BACKEND_URL and RATE_LIMIT_BACKEND_URL point at Postgres. With more
+than one worker and either of them empty, the launcher refuses to start
+(pass --allow-per-worker-state to start anyway, with a warning). Without
+--workers it starts one worker per CPU when both are set, otherwise one.
+
+Usage:
+    python scripts/serve.py
+    python scripts/serve.py --workers 4
+    python scripts/serve.py --workers 2 --port 8001 --snapshot /run/midway/locations.snap
+    python scripts/serve.py --workers 4 --allow-per-worker-state
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.startup import phase, prepare_database
+from app.services.location_snapshot import write_snapshot
+
+
+# Setting -> what goes wrong with several workers while it is empty
+SHARED_STATE_SETTINGS = {
+    "STREAM_BACKEND_URL": "live results streams only see joins handled by their own worker",
+    "RATE_LIMIT_BACKEND_URL": "each worker keeps its own /results buckets, so limits scale with --workers",
+}
+
+
+def per_worker_state() -> list[str]:
+    return [
+        f"{name} is not set: {consequence}"
+        for name, consequence in SHARED_STATE_SETTINGS.items()
+        if not getattr(settings, name)
+    ]
+
+
+async def build(path: str) -> None:
+    await prepare_database()
+    with phase("location snapshot write"):
+        size = await write_snapshot(path)
+    print(f"[startup] location snapshot {path}: {size} bytes")
+    # Workers open their own pools; drop this process's connections
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes (default: one per CPU with shared backends configured, otherwise 1)",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--snapshot",
+        default=os.path.join(tempfile.gettempdir(), "midway-locations.snap"),
+        help="Where to write the location snapshot the workers map",
+    )
+    parser.add_argument(
+        "--allow-per-worker-state",
+        action="store_true",
+        help="Start several workers even though streams or rate limits are not shared between them",
+    )
+    args = parser.parse_args()
+    if args.workers is None:
+        args.workers = 1 if per_worker_state() else os.cpu_count() or 1
+
+    problems = per_worker_state() if args.workers > 1 else []
+    if problems and not args.allow_per_worker_state:
+        parser.error(
+            f"--workers {args.workers} needs shared backends:\n  " + "\n  ".join(problems)
+            + "\nSet them (see SETUP.md, Step 7), use --workers 1, or pass --allow-per-worker-state."
+        )
+    for problem in problems:
+        print(f"WARNING: {problem}", file=sys.stderr)
+
+    asyncio.run(build(args.snapshot))
+    os.environ["LOCATION_SNAPSHOT_PATH"] = args.snapshot
+    os.chdir(ROOT)
+    uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import os
+import tempfile
+import time
+
+# Settings are read at import: point the app at a throwaway SQLite file
+# before anything from app/ or main is imported.
+_db_dir = tempfile.mkdtemp(prefix="midway-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["DEBUG"] = "false"
+os.environ["GOOGLE_PLACES_API_KEY"] = ""
+os.environ["RESULTS_RATE_LIMIT_ENABLED"] = "false"
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytest_plugins = ["app.testing"]
+
+
+@pytest.fixture(scope="session")
+def client():
+    import main
+    from app.services import location_snapshot
+
+    with TestClient(main.app) as test_client:
+        # The in-memory location snapshot is built right after startup
+        deadline = time.monotonic() + 10
+        while location_snapshot.current() is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        yield test_client
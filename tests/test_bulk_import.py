@@ -0,0 +1,86 @@
+"""Bulk participant import: per-row errors in the stream, a bad CSV header up front."""
+import json
+
+import pytest
+
+
+def create_event(client, title="Bulk"):
+    return client.post("/api/events/", json={
+        "title": title, "window_start": "2026-01-17T18:00:00", "window_end": "2026-01-17T23:00:00",
+    }).json()["slug"]
+
+
+def upload(client, slug, body, content_type):
+    return client.post(
+        f"/api/events/{slug}/participants:bulk", content=body, headers={"content-type": content_type},
+    )
+
+
+def status_lines(response):
+    """Row statuses by row number (errors stream before their batch's oks), and the summary."""
+    assert response.status_code == 200
+    *rows, summary = [json.loads(line) for line in response.text.splitlines()]
+    return {row["row"]: row for row in rows}, summary["summary"]
+
+
+def test_csv_rows_are_imported_and_bad_rows_reported(client):
+    slug = create_event(client)
+    body = (
+        "name,location_name,start_time,end_time\n"
+        "Alice,Whitefield,2026-01-17T19:00:00,2026-01-17T21:00:00\n"
+        "Bob,Indiranagar,not-a-date,2026-01-17T21:00:00\n"
+        ",Koramangala,2026-01-17T19:00:00,2026-01-17T21:00:00\n"
+        "Chen,HSR Layout,2026-01-17T20:00:00,2026-01-17T22:00:00\n"
+    )
+    rows, summary = status_lines(upload(client, slug, body, "text/csv"))
+
+    assert {number: row["status"] for number, row in rows.items()} == {1: "ok", 2: "error", 3: "error", 4: "ok"}
+    assert "availabilities.0.start_time" in rows[2]["error"]
+    assert rows[3]["error"].startswith("name:")
+    assert summary == {"imported": 2, "failed": 2}
+
+    participants = client.get(f"/api/events/{slug}").json()["participants"]
+    assert sorted(p["name"] for p in participants) == ["Alice", "Chen"]
+
+
+def test_invalid_ndjson_rows_are_reported(client):
+    slug = create_event(client)
+    body = "\n".join([
+        json.dumps({"name": "Alice", "location_name": "Whitefield", "availabilities": [
+            {"start_time": "2026-01-17T19:00:00", "end_time": "2026-01-17T21:00:00"},
+        ]}),
+        '{"name": "Bob", "location_name": ',
+        '["not", "an", "object"]',
+    ]) + "\n"
+    rows, summary = status_lines(upload(client, slug, body, "application/x-ndjson"))
+
+    assert rows[1]["status"] == "ok"
+    assert rows[2]["status"] == "error" and rows[2]["error"].startswith("invalid JSON")
+    assert rows[3] == {"row": 3, "status": "error", "error": "row must be a JSON object"}
+    assert summary == {"imported": 1, "failed": 2}
+
+
+@pytest.mark.parametrize("body", [
+    "person,area\nAlice,Whitefield\n",
+    "name,start_time,end_time\nAlice,2026-01-17T19:00:00,2026-01-17T21:00:00\n",
+    "",
+    "\n\n",
+])
+def test_csv_with_wrong_header_is_400(client, body):
+    slug = create_event(client)
+    response = upload(client, slug, body, "text/csv")
+    assert response.status_code == 400
+    assert client.get(f"/api/events/{slug}").json()["participants"] == []
+
+
+def test_header_after_blank_lines_is_accepted(client):
+    slug = create_event(client)
+    body = "\r\n\r\nname,location_name,availabilities\r\nAlice,Whitefield,2026-01-17T19:00/2026-01-17T21:00\r\n"
+    rows, summary = status_lines(upload(client, slug, body, "text/csv"))
+    assert rows[1]["status"] == "ok"
+    assert summary == {"imported": 1, "failed": 0}
+
+
+def test_unknown_content_type_is_415(client):
+    slug = create_event(client)
+    assert upload(client, slug, "name\n", "text/plain").status_code == 415
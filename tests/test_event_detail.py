@@ -0,0 +1,91 @@
+"""Event detail: participant summary, cursor pages and the streamed document."""
+import json
+
+import pytest
+
+from app.core.config import settings
+
+SLOT = {"start_time": "2026-01-17T19:00:00", "end_time": "2026-01-17T21:00:00"}
+JOINED = ["Alice", "Bob", "Chen", "Dana"]
+DECLINED = ["Erin", "Femi"]
+
+
+@pytest.fixture
+def slug(client):
+    slug = client.post("/api/events/", json={
+        "title": "Detail", "window_start": "2026-01-17T18:00:00", "window_end": "2026-01-17T23:00:00",
+    }).json()["slug"]
+    for name in JOINED:
+        response = client.post(f"/api/events/{slug}/join", json={
+            "name": name, "location_name": "Whitefield", "availabilities": [SLOT],
+        })
+        assert response.status_code == 201
+    for name in DECLINED:
+        assert client.post(f"/api/events/{slug}/decline", json={"name": name}).status_code == 201
+    return slug
+
+
+def detail(client, slug, **params):
+    response = client.get(f"/api/events/{slug}", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def pages(client, slug, limit, **params):
+    cursor, seen = None, []
+    while True:
+        page = detail(client, slug, limit=limit, **({"cursor": cursor} if cursor else {}), **params)
+        seen.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+def test_full_detail_has_summary_and_no_cursor(client, slug):
+    body = detail(client, slug)
+    assert sorted(p["name"] for p in body["participants"]) == sorted(JOINED + DECLINED)
+    assert body["summary"] == {"joined": 4, "declined": 2}
+    assert body["next_cursor"] is None
+
+
+@pytest.mark.parametrize("limit", [1, 2, 4, 6, 7])
+def test_pages_cover_every_participant_once_in_id_order(client, slug, limit):
+    walked = pages(client, slug, limit)
+
+    assert len(walked) == max(1, -(-6 // limit))  # no empty trailing page
+    ids = [p["id"] for page in walked for p in page["participants"]]
+    assert ids == sorted(ids)
+    assert sorted(ids) == sorted(p["id"] for p in detail(client, slug)["participants"])
+    assert all(len(page["participants"]) <= limit for page in walked)
+    assert all(page["summary"] == {"joined": 4, "declined": 2} for page in walked)
+    assert walked[-1]["next_cursor"] is None
+    for page, following in zip(walked, walked[1:]):
+        assert page["next_cursor"] == page["participants"][-1]["id"]
+        assert following["participants"][0]["id"] > page["next_cursor"]
+
+
+def test_limit_is_bounded(client, slug):
+    assert client.get(f"/api/events/{slug}", params={"limit": 0}).status_code == 422
+    response = client.get(f"/api/events/{slug}", params={"limit": settings.PARTICIPANTS_PAGE_MAX + 1})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("batch_size", [1, 4, 500])
+def test_stream_matches_the_buffered_document(client, slug, monkeypatch, batch_size):
+    # Small batches make the server-side cursor fetch several times, and
+    # cut a page in the middle of a batch
+    monkeypatch.setattr(settings, "EVENT_STREAM_BATCH_SIZE", batch_size)
+
+    streamed = client.get(f"/api/events/{slug}", params={"stream": "true"})
+    assert streamed.status_code == 200
+    buffered = detail(client, slug)
+    assert {**json.loads(streamed.text), "participants": None} == {**buffered, "participants": None}
+    assert sorted(json.loads(streamed.text)["participants"], key=lambda p: p["id"]) == sorted(
+        buffered["participants"], key=lambda p: p["id"]
+    )
+
+    assert pages(client, slug, 4, stream="true") == pages(client, slug, 4)
+
+
+def test_stream_of_an_unknown_event_is_404(client):
+    assert client.get("/api/events/no-such-event", params={"stream": "true"}).status_code == 404
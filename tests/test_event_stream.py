@@ -0,0 +1,210 @@
+"""
+Live results over /stream: the first update on subscribe, a push after
+every join and decline, and the LISTEN connection coming back after a drop.
+
+TestClient buffers a whole response body, so streams are read at the ASGI
+level inside the TestClient's own event loop (its portal).
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import main
+from app.core.config import settings
+from app.services import places_service
+from app.services.event_service import static_venue_recommendations
+from app.services.event_stream import PostgresNotifyBackend, broker
+
+SLOT = {"start_time": "2026-01-17T19:00:00", "end_time": "2026-01-17T21:00:00"}
+
+
+class StreamReader:
+    """One /stream connection; `update()` returns the next pushed payload."""
+
+    def __init__(self, slug: str) -> None:
+        self.path = f"/api/events/{slug}/stream"
+        self.status = None
+        self._chunks: asyncio.Queue = asyncio.Queue()
+        self._buffer = ""
+        self._closed = asyncio.Event()
+
+    async def _receive(self) -> dict:
+        await self._closed.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message: dict) -> None:
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message["type"] == "http.response.body":
+            await self._chunks.put(message.get("body", b"").decode())
+
+    async def __aenter__(self) -> "StreamReader":
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": self.path, "raw_path": self.path.encode(), "query_string": b"",
+            "root_path": "", "headers": [(b"host", b"testserver")],
+            "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+        }
+        self._task = asyncio.create_task(main.app(scope, self._receive, self._send))
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._closed.set()
+        await asyncio.wait_for(self._task, timeout=5)
+
+    async def update(self) -> dict:
+        while True:
+            message, separator, rest = self._buffer.partition("\n\n")
+            if separator:
+                self._buffer = rest
+                lines = dict(line.split(": ", 1) for line in message.splitlines() if ": " in line)
+                if lines.get("event") == "update":
+                    return json.loads(lines["data"])
+                continue
+            self._buffer += await asyncio.wait_for(self._chunks.get(), timeout=5)
+
+
+def test_unknown_slug_is_404(client):
+    assert client.get("/api/events/no-such-event/stream").status_code == 404
+
+
+def test_updates_on_subscribe_join_and_decline(client):
+    slug = client.post("/api/events/", json={
+        "title": "Live", "window_start": "2026-01-17T18:00:00", "window_end": "2026-01-17T23:00:00",
+    }).json()["slug"]
+
+    async def scenario():
+        api = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://testserver")
+        async with api, StreamReader(slug) as stream:
+            first = await stream.update()
+            assert stream.status == 200
+            assert first["event"]["slug"] == slug
+            assert first["results"] is None
+
+            response = await api.post(f"/api/events/{slug}/join", json={
+                "name": "Alice", "location_name": "Whitefield", "availabilities": [SLOT],
+            })
+            assert response.status_code == 201
+            joined = await stream.update()
+            assert [p["name"] for p in joined["event"]["participants"]] == ["Alice"]
+            assert joined["results"]["total_participants"] == 1
+
+            response = await api.post(f"/api/events/{slug}/decline", json={"name": "Bob"})
+            assert response.status_code == 201
+            declined = await stream.update()
+            assert {p["name"]: p["declined"] for p in declined["event"]["participants"]} == {
+                "Alice": False, "Bob": True,
+            }
+            assert declined["results"]["total_participants"] == 1
+        # Closing the last connection drops the slug's subscriber set
+        assert slug not in broker._subscribers
+
+    client.portal.call(scenario)
+
+
+def test_places_is_asked_once_per_subscribed_slug(client, monkeypatch):
+    calls = []
+
+    async def fetch_venue_recommendations(**kwargs):
+        calls.append(kwargs)
+        return static_venue_recommendations()[:1]
+
+    monkeypatch.setattr(settings, "GOOGLE_PLACES_API_KEY", "test-key")
+    monkeypatch.setattr(places_service, "fetch_venue_recommendations", fetch_venue_recommendations)
+    slug = client.post("/api/events/", json={
+        "title": "Venues", "window_start": "2026-01-17T18:00:00", "window_end": "2026-01-17T23:00:00",
+    }).json()["slug"]
+
+    async def scenario():
+        api = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://testserver")
+        async with api, StreamReader(slug) as stream:
+            await stream.update()
+            pushes = []
+            for name, area in (("Alice", "Whitefield"), ("Bob", "Indiranagar"), ("Chen", "Koramangala")):
+                response = await api.post(f"/api/events/{slug}/join", json={
+                    "name": name, "location_name": area, "availabilities": [SLOT],
+                })
+                assert response.status_code == 201
+                pushes.append(await stream.update())
+        assert [push["results"]["total_participants"] for push in pushes] == [1, 2, 3]
+        assert len({json.dumps(push["results"]["venue_recommendations"]) for push in pushes}) == 1
+
+    client.portal.call(scenario)
+    assert len(calls) == 1
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.listeners: dict = {}
+        self.on_terminate: list = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback) -> None:
+        self.listeners[channel] = callback
+
+    def add_termination_listener(self, callback) -> None:
+        self.on_terminate.append(callback)
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def drop(self) -> None:
+        for callback in self.on_terminate:
+            callback(self)
+
+
+class FakePool:
+    async def close(self) -> None:
+        pass
+
+
+def test_listen_connection_is_reestablished(monkeypatch):
+    asyncpg = pytest.importorskip("asyncpg")
+    connections: list[FakeConnection] = []
+    attempts = 0
+
+    async def connect(dsn):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 2:  # the first reconnect attempt fails
+            raise OSError("connection refused")
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    async def create_pool(*args, **kwargs):
+        return FakePool()
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+    monkeypatch.setattr(asyncpg, "create_pool", create_pool)
+    monkeypatch.setattr(PostgresNotifyBackend, "RECONNECT_MIN_SECONDS", 0.01)
+
+    async def scenario():
+        heard, resyncs = [], []
+
+        async def handler(slug):
+            heard.append(slug)
+
+        async def resync():
+            resyncs.append(len(connections))
+
+        backend = PostgresNotifyBackend("postgresql+asyncpg://db/midway")
+        await backend.start(handler, resync)
+        connections[0].drop()
+        for _ in range(200):
+            if resyncs:
+                break
+            await asyncio.sleep(0.01)
+        assert attempts == 3
+        assert resyncs == [2]
+
+        listener = connections[1].listeners[PostgresNotifyBackend.CHANNEL]
+        listener(connections[1], 1, PostgresNotifyBackend.CHANNEL, "some-slug")
+        await asyncio.sleep(0)
+        assert heard == ["some-slug"]
+
+        await backend.stop()
+        assert connections[1].closed
+
+    asyncio.run(scenario())
@@ -0,0 +1,47 @@
+"""Resolving location names in bulk, from the snapshot and from the database."""
+import pytest
+
+from app.services import location_snapshot
+
+
+@pytest.fixture(params=["snapshot", "database"])
+def source(request, monkeypatch):
+    if request.param == "database":
+        monkeypatch.setattr(location_snapshot, "_current", None)
+    return request.param
+
+
+def resolve(client, names):
+    response = client.post("/api/locations/resolve", json={"names": names})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_resolve_keeps_request_order(client, source):
+    names = ["Whitefield", "Nowhere Nagar", "Indiranagar, Bengaluru", "Whitefield"]
+    resolved = resolve(client, names)
+
+    assert [entry["name"] for entry in resolved] == names
+    whitefield, unknown, indiranagar, again = (entry["location"] for entry in resolved)
+    assert (whitefield["area_name"], whitefield["city"]) == ("Whitefield", "Bengaluru")
+    assert unknown is None
+    assert (indiranagar["area_name"], indiranagar["city"]) == ("Indiranagar", "Bengaluru")
+    assert again == whitefield
+
+
+def test_area_city_resolves_like_the_plain_area(client, source):
+    plain, with_city = resolve(client, ["Indiranagar", "Indiranagar, Bengaluru"])
+    assert plain["location"] == with_city["location"]
+    assert set(plain["location"]) == {"id", "city", "area_name", "lat", "lng"}
+
+
+def test_unknown_names_resolve_to_none(client, source):
+    assert resolve(client, ["Atlantis", "Whitefield, Atlantis"]) == [
+        {"name": "Atlantis", "location": None},
+        {"name": "Whitefield, Atlantis", "location": None},
+    ]
+
+
+@pytest.mark.parametrize("names", [[], [f"Area {i}" for i in range(101)]])
+def test_name_count_is_bounded(client, names):
+    assert client.post("/api/locations/resolve", json={"names": names}).status_code == 422
@@ -0,0 +1,53 @@
+"""`meeting_clusters` in results: one meeting point per part of a split group."""
+SLOT = {"start_time": "2026-01-17T19:00:00", "end_time": "2026-01-17T21:00:00"}
+
+MUMBAI = ["Andheri", "Bandra", "Powai"]
+BENGALURU = ["Koramangala", "HSR Layout", "Jayanagar"]
+
+
+def event_with(client, areas):
+    slug = client.post("/api/events/", json={
+        "title": "Split", "window_start": "2026-01-17T18:00:00", "window_end": "2026-01-17T23:00:00",
+    }).json()["slug"]
+    ids = {}
+    for i, area in enumerate(areas):
+        response = client.post(f"/api/events/{slug}/join", json={
+            "name": f"{area} {i}", "location_name": area, "availabilities": [SLOT],
+        })
+        assert response.status_code == 201
+        ids[response.json()["id"]] = area
+    return slug, ids
+
+
+def test_two_cities_get_a_point_each(client):
+    slug, ids = event_with(client, MUMBAI + BENGALURU + ["Koramangala"])
+    clusters = client.get(f"/api/events/{slug}/results").json()["meeting_clusters"]
+
+    assert len(clusters) == 2
+    bengaluru, mumbai = clusters  # largest first
+    assert {ids[i] for i in bengaluru["participant_ids"]} == set(BENGALURU)
+    assert {ids[i] for i in mumbai["participant_ids"]} == set(MUMBAI)
+    assert sorted(bengaluru["participant_ids"] + mumbai["participant_ids"]) == sorted(ids)
+    assert bengaluru["neighborhood"] in BENGALURU and mumbai["neighborhood"] in MUMBAI
+    assert 12.8 < bengaluru["lat"] < 13.0 and 19.0 < mumbai["lat"] < 19.2
+    assert all(0 < cluster["total_km"] < 30 for cluster in clusters)
+
+
+def test_one_city_has_no_clusters(client):
+    slug, _ = event_with(client, BENGALURU)
+    assert client.get(f"/api/events/{slug}/results").json()["meeting_clusters"] == []
+
+
+def test_what_if_reclusters(client):
+    slug, ids = event_with(client, MUMBAI[:2] + BENGALURU)
+    by_area = {area: participant_id for participant_id, area in ids.items()}
+    assert len(client.get(f"/api/events/{slug}/results").json()["meeting_clusters"]) == 2
+
+    # Without Bandra, Andheri is alone in Mumbai: no point of its own
+    alone = client.get(f"/api/events/{slug}/results", params={"exclude": by_area["Bandra"]}).json()
+    assert alone["meeting_clusters"] == []
+
+    # Without Jayanagar both cities still have two people
+    split = client.get(f"/api/events/{slug}/results", params={"exclude": by_area["Jayanagar"]}).json()
+    assert sorted(len(cluster["participant_ids"]) for cluster in split["meeting_clusters"]) == [2, 2]
+    assert by_area["Jayanagar"] not in {i for cluster in split["meeting_clusters"] for i in cluster["participant_ids"]}
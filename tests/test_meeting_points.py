@@ -0,0 +1,125 @@
+"""Weiszfeld medians, k-medians and split meeting points on small known layouts."""
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.algorithm_service import (
+    calculate_geometric_median,
+    haversine_km,
+    k_medians,
+    split_meeting_points,
+    weiszfeld,
+)
+
+# Two neighbourhoods ~25 km apart: around Whitefield and around Kengeri
+EAST = [(12.9698, 77.7499), (12.9750, 77.7400), (12.9650, 77.7550)]
+WEST = [(12.9081, 77.4855), (12.9150, 77.4900), (12.9000, 77.4800)]
+
+
+def people(coords):
+    return [SimpleNamespace(name=f"p{i}", lat=lat, lng=lng) for i, (lat, lng) in enumerate(coords)]
+
+
+def total_distance(points, center, weights=None):
+    weights = weights or [1.0] * len(points)
+    return sum(w * math.dist(point, center) for point, w in zip(points, weights))
+
+
+def test_single_point_is_its_own_median():
+    assert weiszfeld([(12.97, 77.59)]) == (12.97, 77.59)
+
+
+def test_identical_points():
+    assert weiszfeld([(12.97, 77.59)] * 4) == pytest.approx((12.97, 77.59))
+
+
+def test_converges_to_the_minimum():
+    points = [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (3.0, 4.0)]
+    median = weiszfeld(points)
+    best = total_distance(points, median)
+    for d_lat, d_lng in ((1e-4, 0), (-1e-4, 0), (0, 1e-4), (0, -1e-4)):
+        assert best <= total_distance(points, (median[0] + d_lat, median[1] + d_lng))
+
+
+def test_symmetric_points_meet_in_the_middle():
+    assert weiszfeld([(0.0, 0.0), (2.0, 0.0), (0.0, 2.0), (2.0, 2.0)]) == pytest.approx((1.0, 1.0), abs=1e-6)
+
+
+def test_obtuse_vertex_is_the_median():
+    # The angle at (0.5, 0.1) is over 120 degrees, so the median is that vertex
+    assert weiszfeld([(0.0, 0.0), (1.0, 0.0), (0.5, 0.1)]) == pytest.approx((0.5, 0.1), abs=1e-5)
+
+
+def test_dominant_weight_pulls_the_median_onto_its_point():
+    points = [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)]
+    assert weiszfeld(points, weights=[3.0, 1.0, 1.0]) == pytest.approx((0.0, 0.0), abs=1e-5)
+
+
+def test_warm_start_reaches_the_same_median():
+    points = [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (3.0, 4.0)]
+    assert weiszfeld(points, start=(3.0, 4.0)) == pytest.approx(weiszfeld(points), abs=1e-5)
+
+
+def test_geometric_median_skips_missing_coordinates():
+    assert calculate_geometric_median([SimpleNamespace(lat=None, lng=None)]) is None
+    median = calculate_geometric_median(people(EAST) + [SimpleNamespace(lat=None, lng=77.0)])
+    assert (median["lat"], median["lng"]) == pytest.approx(weiszfeld(EAST))
+
+
+def test_haversine_km():
+    assert haversine_km(12.0, 77.0, 13.0, 77.0) == pytest.approx(111.2, abs=0.1)
+    assert haversine_km(12.97, 77.59, 12.97, 77.59) == 0.0
+
+
+def test_k_medians_separates_two_groups():
+    points = EAST + WEST
+    centers, assignment = k_medians(points, [1.0] * len(points), 2)
+    assert len(set(assignment[:3])) == len(set(assignment[3:])) == 1
+    assert assignment[0] != assignment[3]
+    assert centers[assignment[0]] == pytest.approx(weiszfeld(EAST), abs=1e-4)
+    assert centers[assignment[3]] == pytest.approx(weiszfeld(WEST), abs=1e-4)
+
+
+def test_k_medians_from_previous_centres():
+    points = EAST + WEST
+    cold, assignment = k_medians(points, [1.0] * len(points), 2)
+    warm, warm_assignment = k_medians(points, [1.0] * len(points), 2, start=cold)
+    assert warm_assignment == assignment
+    assert [x for center in warm for x in center] == pytest.approx([x for center in cold for x in center], abs=1e-4)
+
+
+def test_split_group_gets_one_point_per_part():
+    group = people(EAST + WEST + [WEST[0]])
+    solved: dict = {}
+    clusters = split_meeting_points(group, solved=solved)
+
+    assert [len(cluster["members"]) for cluster in clusters] == [4, 3]  # largest first
+    assert {p.lat for p in clusters[0]["members"]} == {lat for lat, _ in WEST}
+    assert {p.lat for p in clusters[1]["members"]} == {lat for lat, _ in EAST}
+    for cluster in clusters:
+        expected = sum(haversine_km(p.lat, p.lng, cluster["lat"], cluster["lng"]) for p in cluster["members"])
+        assert cluster["total_km"] == pytest.approx(expected)
+    assert set(solved) == {1, 2, 3}
+
+
+@pytest.mark.parametrize("coords", [
+    [EAST[0]],  # single point
+    [EAST[0]] * 5,  # identical points
+    EAST,  # one tight group
+    EAST + [WEST[0]],  # an outlier alone is not a cluster
+])
+def test_no_split(coords):
+    assert split_meeting_points(people(coords)) == []
+
+
+def test_what_if_split_from_warm_start_matches_a_cold_solve():
+    # Three points per part after the exclusion, so each median is unique
+    group = people(EAST + [(12.9720, 77.7580)] + WEST)
+    solved: dict = {}
+    split_meeting_points(group, solved=solved)
+    warm = split_meeting_points(group[1:], warm_start=solved)  # one participant excluded
+    cold = split_meeting_points(group[1:])
+    assert [len(c["members"]) for c in warm] == [len(c["members"]) for c in cold] == [3, 3]
+    for w, c in zip(sorted(warm, key=lambda c: c["lat"]), sorted(cold, key=lambda c: c["lat"])):
+        assert (w["lat"], w["lng"]) == pytest.approx((c["lat"], c["lng"]), abs=1e-4)
@@ -0,0 +1,56 @@
+"""OverlapSweep.best_window against a minute-by-minute scan on random cases."""
+import random
+from datetime import datetime, timedelta
+
+from app.services.algorithm_service import OverlapSweep
+
+BASE = datetime(2026, 1, 1)
+MINUTE = timedelta(minutes=1)
+
+
+def scan(slots, exclude, require):
+    """(start, end, count) of the longest, earliest run at the best count; None if there is none."""
+    present = {}
+    for key, intervals in slots.items():
+        if key in exclude:
+            continue
+        for start, end in intervals:
+            for minute in range(start, end):
+                present.setdefault(minute, set()).add(key)
+    counts = {minute: len(keys) for minute, keys in present.items() if require <= keys}
+    if not counts:
+        return None
+    top = max(counts.values())
+    runs = []
+    for minute in sorted(m for m, count in counts.items() if count == top):
+        if runs and runs[-1][1] == minute:
+            runs[-1][1] = minute + 1
+        else:
+            runs.append([minute, minute + 1])
+    start, end = max(runs, key=lambda run: run[1] - run[0])
+    return start, end, top
+
+
+def test_best_window_matches_scan():
+    rng = random.Random(41)
+    for _ in range(3000):
+        people = rng.randint(1, 6)
+        slots = {}
+        for person in range(people):
+            slots[person] = []
+            for _ in range(rng.randint(1, 3)):
+                start = rng.randint(0, 30)
+                slots[person].append((start, start + rng.randint(0, 10)))
+        exclude = set(rng.sample(range(people), rng.randint(0, min(2, people))))
+        left = [person for person in range(people) if person not in exclude]
+        require = set(rng.sample(left, min(len(left), rng.randint(0, 1))))
+
+        sweep = OverlapSweep({
+            person: [(BASE + start * MINUTE, BASE + end * MINUTE) for start, end in intervals]
+            for person, intervals in slots.items()
+        })
+        window = sweep.best_window(exclude, require)
+        got = None if window is None else (
+            (window["start"] - BASE) // MINUTE, (window["end"] - BASE) // MINUTE, window["count"]
+        )
+        assert got == scan(slots, exclude, require), (slots, exclude, require)
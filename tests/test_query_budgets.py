@@ -0,0 +1,135 @@
+"""
+Statements per request for the main endpoints; a new round trip fails here.
+
+create 1, join 3 (4 without a location snapshot), decline 2, detail 2
+(3 for a page), results 4, location search and resolve 0.
+"""
+import asyncio
+import tempfile
+
+import pytest
+
+from app.core.config import settings
+from app.services import location_snapshot
+
+SLOT = {"start_time": "2026-01-17T19:00:00", "end_time": "2026-01-17T21:00:00"}
+
+
+@pytest.fixture
+def event_slug(client):
+    response = client.post("/api/events/", json={
+        "title": "Budget",
+        "window_start": "2026-01-17T18:00:00",
+        "window_end": "2026-01-17T23:00:00",
+    })
+    assert response.status_code == 201
+    slug = response.json()["slug"]
+    for name, area in (("Alice", "Whitefield"), ("Bob", "Indiranagar")):
+        response = client.post(f"/api/events/{slug}/join", json={
+            "name": name, "location_name": area, "availabilities": [SLOT],
+        })
+        assert response.status_code == 201
+    return slug
+
+
+def test_create_event(client, max_queries):
+    with max_queries(1):
+        response = client.post("/api/events/", json={
+            "title": "Budget",
+            "window_start": "2026-01-17T18:00:00",
+            "window_end": "2026-01-17T23:00:00",
+        })
+    assert response.status_code == 201
+
+
+def test_join(client, event_slug, max_queries):
+    with max_queries(3):
+        response = client.post(f"/api/events/{event_slug}/join", json={
+            "name": "Carol", "location_name": "Koramangala", "availabilities": [SLOT],
+        })
+    assert response.status_code == 201
+
+
+def test_join_without_snapshot(client, event_slug, max_queries, monkeypatch):
+    # Before the snapshot is built the location name costs one lookup
+    monkeypatch.setattr(location_snapshot, "_current", None)
+    with max_queries(4):
+        response = client.post(f"/api/events/{event_slug}/join", json={
+            "name": "Erin", "location_name": "Koramangala", "availabilities": [SLOT],
+        })
+    assert response.status_code == 201
+    assert response.json()["lat"] == pytest.approx(12.9352)
+
+
+def test_decline(client, event_slug, max_queries):
+    with max_queries(2):
+        response = client.post(f"/api/events/{event_slug}/decline", json={"name": "Dave"})
+    assert response.status_code == 201
+
+
+def test_event_detail(client, event_slug, max_queries):
+    with max_queries(2):
+        response = client.get(f"/api/events/{event_slug}")
+    assert response.status_code == 200
+    assert len(response.json()["participants"]) == 2
+
+
+def test_event_detail_page(client, event_slug, max_queries):
+    with max_queries(3):
+        response = client.get(f"/api/events/{event_slug}", params={"limit": 1})
+    assert response.status_code == 200
+    assert response.json()["next_cursor"] is not None
+
+
+def test_results(client, event_slug, max_queries):
+    with max_queries(4):
+        response = client.get(f"/api/events/{event_slug}/results")
+    assert response.status_code == 200
+    assert response.json()["suggested_time"]["participant_count"] == 2
+
+
+def test_location_search_and_resolve(client, max_queries):
+    # Served from the location snapshot
+    with max_queries(0):
+        assert client.get("/api/locations/search", params={"q": "kora"}).status_code == 200
+        assert client.post("/api/locations/resolve", json={"names": ["Koramangala"]}).status_code == 200
+
+
+def test_requests_stay_within_configured_budgets(client, event_slug, enforce_query_budgets):
+    client.get(f"/api/events/{event_slug}")
+    client.get(f"/api/events/{event_slug}/results")
+
+
+def test_statements_are_counted_once_across_writer_and_readers(monkeypatch):
+    # A tuned SQLite file: writer engine plus a reader pool on the same file
+    from sqlalchemy import text
+
+    from app.core import db, metrics, query_budget
+    from app.core.query_budget import track_queries
+
+    monkeypatch.setattr(settings, "SQLITE_TUNED", True)
+    url = f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='midway-budget-')}/budget.db"
+    writer, reader = db._create_engine(url), db._create_engine(url, read_only=True)
+    for engine in (writer, reader, writer):  # instrumenting again is a no-op
+        query_budget.instrument_engine(engine)
+        metrics.instrument_engine(engine)
+
+    async def scenario():
+        spans: dict = {}
+        token = metrics._request_spans.set(spans)
+        try:
+            with track_queries() as stats:
+                async with writer.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+                async with reader.connect() as conn:
+                    await conn.execute(text("SELECT 2"))
+        finally:
+            metrics._request_spans.reset(token)
+            await writer.dispose()
+            await reader.dispose()
+        return stats, spans
+
+    stats, spans = asyncio.run(scenario())
+    assert stats.count == 2
+    assert stats.statements == {"SELECT 1": 1, "SELECT 2": 1}
+    assert spans["db"][1] == 2
@@ -0,0 +1,25 @@
+"""Which address /results rate limits key on, with and without trusted proxies."""
+import pytest
+from starlette.requests import Request
+
+from app.core import rate_limit
+from app.core.config import settings
+
+
+def request(forwarded=None, peer="10.0.0.5"):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded is not None else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 4321)})
+
+
+@pytest.mark.parametrize("hops, forwarded, expected", [
+    (0, "203.0.113.7", "10.0.0.5"),  # no proxy: the header is ignored
+    (1, "203.0.113.7", "203.0.113.7"),
+    (1, "1.2.3.4, 203.0.113.7", "203.0.113.7"),  # forged leftmost entry
+    (2, "1.2.3.4, 203.0.113.7, 10.1.1.1", "203.0.113.7"),
+    (2, "203.0.113.7", "10.0.0.5"),  # shorter chain than configured
+    (1, None, "10.0.0.5"),
+    (1, "", "10.0.0.5"),
+])
+def test_client_address(monkeypatch, hops, forwarded, expected):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXY_HOPS", hops)
+    assert rate_limit.client_address(request(forwarded)) == expected
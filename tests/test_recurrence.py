@@ -0,0 +1,106 @@
+"""Weekly recurrence input and its expansion over an event window."""
+from datetime import datetime, time
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.participant import RecurrenceInput
+from app.services.algorithm_service import expand_pattern, find_overlap
+
+MONDAY = datetime(2026, 1, 19)
+
+
+def at(day: int, hour: int, minute: int = 0) -> datetime:
+    """`day` days after Monday 2026-01-19, at hour:minute."""
+    return MONDAY.replace(day=19 + day, hour=hour, minute=minute)
+
+
+@pytest.mark.parametrize("days, mask", [
+    (["mon"], 0b0000001),
+    (["sun"], 0b1000000),
+    (["weekdays"], 0b0011111),
+    (["weekends"], 0b1100000),
+    (["daily"], 0b1111111),
+    (["weekends", "mon"], 0b1100001),
+    (["weekdays", "tue"], 0b0011111),
+])
+def test_day_aliases(days, mask):
+    recurrence = RecurrenceInput(days=days, start_time="18:00", end_time="22:00")
+    assert recurrence.weekdays == mask
+
+
+def test_weekdays_over_a_week():
+    weekdays = RecurrenceInput(days=["weekdays"], start_time="18:00", end_time="22:00")
+    slots = list(expand_pattern(weekdays.weekdays, time(18), weekdays.duration_minutes, at(0, 0), at(7, 0)))
+    assert slots == [(at(day, 18), at(day, 22)) for day in range(5)]
+
+
+def test_clipped_to_window_edges():
+    # Window from Monday 20:00 to Wednesday 19:00, daily 18:00-22:00
+    slots = list(expand_pattern(0b1111111, time(18), 240, at(0, 20), at(2, 19)))
+    assert slots == [(at(0, 20), at(0, 22)), (at(1, 18), at(1, 22)), (at(2, 18), at(2, 19))]
+
+
+def test_occurrences_touching_the_window_are_left_out():
+    # Ends exactly at the window start / starts exactly at the window end
+    assert list(expand_pattern(0b0000001, time(18), 240, at(0, 22), at(1, 0))) == []
+    assert list(expand_pattern(0b0000010, time(18), 240, at(0, 0), at(1, 18))) == []
+
+
+def test_overnight_slot():
+    recurrence = RecurrenceInput(days=["fri"], start_time="22:00", end_time="02:00")
+    assert recurrence.duration_minutes == 240
+    slots = list(expand_pattern(recurrence.weekdays, time(22), 240, at(0, 0), at(7, 0)))
+    assert slots == [(at(4, 22), at(5, 2))]
+
+
+def test_overnight_slot_from_before_the_window():
+    # Sunday 22:00 - Monday 02:00 reaches into a window opening Monday 00:00
+    slots = list(expand_pattern(0b1000000, time(22), 240, at(0, 0), at(1, 0)))
+    assert slots == [(at(0, 0), at(0, 2))]
+    slots = list(expand_pattern(0b1000000, time(22), 240, at(-1, 23), at(1, 0)))
+    assert slots == [(at(-1, 23), at(0, 2))]
+
+
+def test_multi_day_slot():
+    recurrence = RecurrenceInput(days=["sat"], start_time="10:00", end_time="10:00", end_day_offset=1)
+    assert recurrence.duration_minutes == 24 * 60
+
+
+def test_end_before_start_is_rejected():
+    with pytest.raises(ValidationError):
+        RecurrenceInput(days=["mon"], start_time="18:00", end_time="17:00", end_day_offset=0)
+
+
+def test_utc_offset_is_rejected():
+    with pytest.raises(ValidationError):
+        RecurrenceInput(days=["mon"], start_time="18:00+05:30", end_time="22:00")
+
+
+def test_join_with_utc_offset_is_422(client):
+    slug = client.post("/api/events/", json={
+        "title": "Offsets", "window_start": "2026-01-19T00:00:00", "window_end": "2026-01-26T00:00:00",
+    }).json()["slug"]
+    response = client.post(f"/api/events/{slug}/join", json={
+        "name": "Asha", "location_name": "Whitefield",
+        "recurrences": [{"days": ["mon"], "start_time": "18:00+05:30", "end_time": "22:00"}],
+    })
+    assert response.status_code == 422
+
+
+def test_find_overlap_mixes_slots_and_patterns():
+    class Slot:
+        def __init__(self, participant_id, start_time, end_time):
+            self.participant_id, self.start_time, self.end_time = participant_id, start_time, end_time
+
+    class Pattern:
+        def __init__(self, participant_id, weekdays, start_time, duration_minutes):
+            self.participant_id, self.weekdays = participant_id, weekdays
+            self.start_time, self.duration_minutes = start_time, duration_minutes
+
+    best = find_overlap(
+        [Slot("a", at(2, 19), at(2, 23))],
+        [Pattern("b", 0b0011111, time(18), 180)],
+        window=(at(0, 0), at(7, 0)),
+    )
+    assert (best["start"], best["end"]) == (at(2, 19), at(2, 21))
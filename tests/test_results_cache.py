@@ -0,0 +1,64 @@
+"""What-if results stay fresh when an invalidation never reaches this worker."""
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.db import async_session
+from app.models.participant import Participant
+from app.services import results_cache
+
+SLOT = {"start_time": "2026-01-17T19:00:00", "end_time": "2026-01-17T21:00:00"}
+
+
+def join(client, slug, name, area="Whitefield"):
+    response = client.post(f"/api/events/{slug}/join", json={
+        "name": name, "location_name": area, "availabilities": [SLOT],
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def create_event(client, title):
+    return client.post("/api/events/", json={
+        "title": title,
+        "window_start": "2026-01-17T18:00:00",
+        "window_end": "2026-01-17T23:00:00",
+    }).json()["slug"]
+
+
+def test_join_missed_by_broker_is_seen(client, monkeypatch):
+    # Even with a cross-worker backend configured: its listener may be down
+    monkeypatch.setattr(settings, "STREAM_BACKEND_URL", "postgresql://unreachable/midway")
+    slug = create_event(client, "Cache")
+    join(client, slug, "Alice")
+    join(client, slug, "Bob")
+
+    what_if = f"/api/events/{slug}/results?exclude=Alice"
+    assert client.get(what_if).json()["total_participants"] == 1
+
+    # As if Carol joined through another worker whose notification was lost
+    with monkeypatch.context() as patch:
+        patch.setattr(results_cache, "invalidate", lambda slug: None)
+        join(client, slug, "Carol")
+
+    assert client.get(what_if).json()["total_participants"] == 2
+
+
+def test_edited_participant_is_seen(client):
+    slug = create_event(client, "Edit")
+    join(client, slug, "Alice")
+    bob = join(client, slug, "Bob", area="Indiranagar")
+
+    what_if = f"/api/events/{slug}/results?exclude=Alice"
+    before = client.get(what_if).json()["suggested_location"]
+
+    # An edit with the same row count, made behind the broker's back
+    async def move_bob():
+        async with async_session() as session:
+            await session.execute(
+                update(Participant).where(Participant.id == bob).values(lat=before["lat"] + 0.05)
+            )
+            await session.commit()
+
+    client.portal.call(move_bob)
+    after = client.get(what_if).json()["suggested_location"]
+    assert after["lat"] > before["lat"]
@@ -0,0 +1,87 @@
+"""Tuned SQLite mode: opt-in, one writer connection, and 503 on write contention."""
+import asyncio
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+import main
+from app.core import db
+from app.core.config import settings
+
+
+def test_tuned_mode_is_opt_in():
+    assert settings.model_fields["SQLITE_TUNED"].default is False
+
+
+def tuned_engine(monkeypatch, **options):
+    monkeypatch.setattr(settings, "SQLITE_TUNED", True)
+    for name, value in options.items():
+        monkeypatch.setattr(settings, name, value)
+    path = os.path.join(tempfile.mkdtemp(prefix="midway-tuned-"), "tuned.db")
+    return db._create_engine(f"sqlite+aiosqlite:///{path}")
+
+
+def test_tuned_writer_applies_pragmas(monkeypatch):
+    engine = tuned_engine(monkeypatch)
+
+    async def pragmas():
+        async with engine.connect() as conn:
+            journal = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+        await engine.dispose()
+        return journal, synchronous
+
+    assert asyncio.run(pragmas()) == ("wal", 1)  # 1 = NORMAL
+
+
+def test_busy_writer_times_out(monkeypatch):
+    engine = tuned_engine(monkeypatch, SQLITE_WRITE_WAIT_SECONDS=0.1)
+
+    async def second_writer():
+        try:
+            async with engine.connect():
+                async with engine.connect():
+                    pass
+        finally:
+            await engine.dispose()
+
+    with pytest.raises(PoolTimeoutError):
+        asyncio.run(second_writer())
+
+
+@pytest.mark.parametrize("error", [
+    PoolTimeoutError("QueuePool limit of size 1 overflow 0 reached"),
+    OperationalError("INSERT ...", {}, Exception("database is locked")),
+])
+def test_busy_database_is_503(client, error):
+    async def busy_session():
+        raise error
+        yield
+
+    main.app.dependency_overrides[db.get_session] = busy_session
+    try:
+        response = client.post("/api/events/", json={
+            "title": "Busy", "window_start": "2026-01-17T18:00:00", "window_end": "2026-01-17T23:00:00",
+        })
+    finally:
+        main.app.dependency_overrides.clear()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_other_operational_errors_stay_500(client):
+    async def broken_session():
+        raise OperationalError("SELECT ...", {}, Exception("no such table: events"))
+        yield
+
+    main.app.dependency_overrides[db.get_session] = broken_session
+    try:
+        with pytest.raises(OperationalError):
+            client.post("/api/events/", json={
+                "title": "Broken", "window_start": "2026-01-17T18:00:00", "window_end": "2026-01-17T23:00:00",
+            })
+    finally:
+        main.app.dependency_overrides.clear()